@@ -0,0 +1,173 @@
+""" Benchmarks das análises sobre tabelas sintéticas (ver `synthetic.py`),
+    em diferentes escalas. Os tempos são comparados aos de `baseline.json`,
+    e o processo termina com erro caso algum fique mais lento que o
+    permitido. Exemplos:
+
+        PYTHONPATH=src python bench/bench.py
+        PYTHONPATH=src python bench/bench.py --scales 10000 1000000 10000000
+        PYTHONPATH=src python bench/bench.py --update
+
+    Com `--update`, os tempos medidos substituem os de `baseline.json`.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+import pandas as pd
+import inflation
+import profiling
+import runner
+import synthetic
+from summary_statistics import chi2, cramer_v, cramer_v_from_columns
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Escalas padrão, em quantidade de linhas de `appearances`
+SCALES = [10_000, 100_000]
+
+# Razão máxima entre o tempo medido e o de referência
+TOLERANCE = 1.5
+
+# Diferenças absolutas menores que essa, em segundos, são consideradas ruído
+NOISE = 0.005
+
+# Quantidade máxima de chamadas de `inflation_adj` por medição
+SCALAR_CALLS = 10_000
+
+
+def benchmarks(tables: dict) -> dict:
+    """ Monta as funções a serem medidas sobre um conjunto de tabelas.
+
+        :param tables: dicionário com as tabelas geradas por
+        `synthetic.generate`
+        :return: dicionário com o nome e a função (sem argumentos) de cada
+        benchmark
+    """
+    cases = {}
+    for name in runner.HYPOTHESES:
+        module = importlib.import_module(name)
+        inputs = {t: tables[t] if c is None else tables[t][c] for t, c in module.TABLES.items()}
+        cases[f"{name}.compute"] = lambda module=module, inputs=inputs: module.compute(inputs)
+
+    valuations = tables["player_valuations"]
+    values = valuations["market_value_in_eur"].to_numpy()
+    periods = valuations["date"]
+    scalar_periods = list(pd.DatetimeIndex(periods[:SCALAR_CALLS]).to_pydatetime())
+    cases["inflation_adj"] = lambda: [inflation.inflation_adj(v, p) for v, p in zip(values, scalar_periods)]
+    cases["inflation_adj_many"] = lambda: inflation.inflation_adj_many(values, periods)
+
+    appearances = tables["appearances"]
+    table = pd.crosstab(appearances["player_id"], appearances["competition_id"])
+    cases["chi2"] = lambda: chi2(table)
+    cases["cramer_v"] = lambda: cramer_v(table)
+    cases["cramer_v_from_columns"] = lambda: cramer_v_from_columns(appearances["player_id"], appearances["competition_id"])
+    return cases
+
+
+def measure(function, repeat: int) -> float:
+    """ Mede o menor tempo, em segundos, de `repeat` execuções de uma função.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(scales: list, repeat: int = 3, seed: int = 0) -> dict:
+    """ Executa os benchmarks em cada escala, imprimindo os tempos medidos.
+
+        :param scales: quantidades de linhas de `appearances`
+        :param repeat: quantidade de execuções de cada benchmark
+        :param seed: semente das tabelas sintéticas
+        :return: dicionário com os tempos de cada benchmark, por escala
+    """
+    inflation.load_index()
+
+    results = {}
+    for scale in scales:
+        tables = synthetic.generate(scale, seed)
+        results[str(scale)] = {}
+        for name, function in benchmarks(tables).items():
+            seconds = measure(function, repeat)
+            profiling.reset()
+            results[str(scale)][name] = round(seconds, 6)
+            print(f"{scale:>10} {name:<36}{seconds:>10.4f}")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """ Compara os tempos medidos aos de referência.
+
+        :param results: tempos retornados por `run`
+        :param baseline: tempos de referência, no mesmo formato
+        :param tolerance: razão máxima entre o tempo medido e o de referência
+        :return: lista de tuplas (escala, benchmark, referência, medido) com os
+        benchmarks mais lentos que o permitido
+    """
+    regressions = []
+    for scale, times in results.items():
+        for name, seconds in times.items():
+            reference = baseline.get(scale, {}).get(name)
+            if reference is None:
+                continue
+            if seconds > reference * tolerance and seconds - reference > NOISE:
+                regressions.append((scale, name, reference, seconds))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """ Ponto de entrada da linha de comando.
+
+        :param argv: argumentos da linha de comando; por padrão, os do processo
+        :return: código de saída: 1 se houver regressões, 0 caso contrário
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks das análises sobre tabelas sintéticas.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="linhas de appearances em cada escala")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções de cada benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="semente das tabelas sintéticas")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="razão máxima em relação à referência")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="arquivo JSON com os tempos de referência")
+    parser.add_argument("--update", action="store_true", help="salva os tempos medidos como referência")
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.repeat, args.seed)
+
+    if args.update:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        baseline.setdefault("times", {}).update(results)
+        baseline["environment"] = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine()
+        }
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Sem tempos de referência em '{args.baseline}'; use --update para criá-los")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["times"]
+
+    regressions = compare(results, baseline, args.tolerance)
+    for scale, name, reference, seconds in regressions:
+        print(f"Regressão em {name} ({scale}): {reference:.4f}s -> {seconds:.4f}s")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+""" Módulo responsável por carregar as tabelas do dataset do Kaggle, com os
+    tipos das colunas declarados e um cache colunar local """
+
+import pandas as pd
+import hashlib
+import os
+
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# Diretórios onde os CSVs do Kaggle são procurados, em ordem de prioridade
+DATA_DIRS = [
+    os.path.join(ROOT_DIR, "data", "football"),
+    os.path.join(ROOT_DIR, "data")
+]
+
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache")
+
+# Colunas de datas, convertidas uma única vez ao ler o CSV
+DATE = "datetime64[ns]"
+
+# Tipos das colunas usadas pelas análises. Apenas as colunas declaradas são
+# lidas dos CSVs; textos com poucos valores distintos viram categorias, IDs
+# usam inteiros de 32 bits (nulos: "Int32") e estatísticas que entram em
+# contas usam float64, como quando o pandas encontra valores nulos
+SCHEMAS = {
+    "appearances": {
+        "game_id": "int32",
+        "player_id": "int32",
+        "date": DATE,
+        "player_name": "object",
+        "competition_id": "category",
+        "yellow_cards": "float64",
+        "red_cards": "float64",
+        "goals": "float64",
+        "assists": "float64",
+        "minutes_played": "float64"
+    },
+    "club_games": {
+        "game_id": "int32",
+        "club_id": "int32",
+        "own_goals": "float32",
+        "opponent_goals": "float32",
+        "hosting": "category",
+        "is_win": "Int8"
+    },
+    "game_events": {
+        "game_id": "int32",
+        "date": DATE,
+        "type": "category",
+        "player_id": "Int32",
+        "description": "category"
+    },
+    "game_lineups": {
+        "game_id": "int32",
+        "player_id": "int32",
+        "type": "category",
+        "position": "category"
+    },
+    "games": {
+        "game_id": "int32",
+        "competition_id": "category",
+        "season": "int16",
+        "date": DATE,
+        "home_club_id": "Int32",
+        "away_club_id": "Int32",
+        "home_club_goals": "float32",
+        "away_club_goals": "float32",
+        "competition_type": "category"
+    },
+    "player_valuations": {
+        "player_id": "int32",
+        "date": DATE,
+        "market_value_in_eur": "float64"
+    },
+    "players": {
+        "player_id": "int32",
+        "name": "object",
+        "country_of_citizenship": "category",
+        "date_of_birth": DATE,
+        "sub_position": "category",
+        "position": "category",
+        "market_value_in_eur": "float64"
+    },
+    "transfers": {
+        "player_id": "int32",
+        "transfer_date": DATE,
+        "from_club_id": "Int32",
+        "to_club_id": "Int32",
+        "from_club_name": "object",
+        "to_club_name": "object",
+        "transfer_fee": "float64",
+        "market_value_in_eur": "float64",
+        "player_name": "object"
+    }
+}
+
+
+# Tabelas grandes, que as análises conseguem processar em blocos de linhas
+CHUNKED_TABLES = ["appearances"]
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow
+        return True
+    except ImportError:
+        return False
+
+
+# O formato Feather (Arrow) permite ler apenas algumas colunas e mapear o
+# arquivo em memória; sem o pyarrow, o cache usa o pickle do pandas
+CACHE_FORMAT = "feather" if _has_pyarrow() else "pkl"
+
+
+def source_path(table: str) -> str:
+    """ Encontra o CSV de uma tabela nos diretórios de `DATA_DIRS`.
+
+        :param table: nome da tabela, sem a extensão (ex.: `"players"`)
+        :return: caminho do arquivo CSV
+    """
+    if table not in SCHEMAS:
+        raise ValueError(f"Tabela desconhecida: '{table}'")
+
+    for directory in DATA_DIRS:
+        path = os.path.join(directory, f"{table}.csv")
+        if os.path.exists(path):
+            return path
+
+    raise FileNotFoundError(f"Arquivo '{table}.csv' não encontrado em {DATA_DIRS}")
+
+
+def cache_path(table: str) -> str:
+    """ Calcula o caminho do cache de uma tabela. O nome do arquivo inclui um
+        hash do esquema, para que alterações em `SCHEMAS` invalidem o cache.
+
+        :param table: nome da tabela
+        :return: caminho do arquivo de cache
+    """
+    digest = hashlib.sha1(repr(SCHEMAS[table]).encode()).hexdigest()[:8]
+    return os.path.join(CACHE_DIR, f"{table}.{digest}.{CACHE_FORMAT}")
+
+
+def read_csv(table: str, columns: list = None, **kwargs) -> pd.DataFrame:
+    """ Lê o CSV de uma tabela com os tipos declarados em `SCHEMAS`, sem
+        passar pelo cache.
+
+        :param table: nome da tabela
+        :param columns: colunas a serem lidas; por padrão, todas as do esquema
+        :param kwargs: demais argumentos repassados ao `pd.read_csv` (ex.:
+        `chunksize`)
+        :return: DataFrame com a tabela, ou um iterador de DataFrames, caso
+        `chunksize` seja informado
+    """
+    schema = SCHEMAS[table]
+    columns = list(schema) if columns is None else columns
+    dtypes = {c: schema[c] for c in columns if schema[c] != DATE}
+    dates = [c for c in columns if schema[c] == DATE]
+
+    # `parse_dates` com formato explícito evita a inferência linha a linha
+    return pd.read_csv(
+        source_path(table),
+        usecols=columns,
+        dtype=dtypes,
+        parse_dates=dates,
+        date_format="ISO8601",
+        **kwargs
+    )
+
+
+def load(table: str, columns: list = None, cache: bool = True) -> pd.DataFrame:
+    """ Carrega uma tabela do dataset. Na primeira leitura, todas as colunas
+        do esquema são salvas em um cache colunar em `CACHE_DIR`, que é
+        descartado sempre que o CSV de origem for mais recente que ele.
+
+        :param table: nome da tabela, sem a extensão (ex.: `"players"`)
+        :param columns: colunas a serem carregadas; por padrão, todas as do
+        esquema
+        :param cache: se `False`, lê diretamente o CSV
+        :return: DataFrame com a tabela
+    """
+    schema = SCHEMAS.get(table)
+    if schema is None:
+        raise ValueError(f"Tabela desconhecida: '{table}'")
+
+    if columns is not None:
+        unknown = [c for c in columns if c not in schema]
+        if unknown:
+            raise ValueError(f"Colunas não declaradas para a tabela '{table}': {unknown}")
+
+    if not cache:
+        return read_csv(table, columns)
+
+    source = source_path(table)
+    path = cache_path(table)
+
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+        if CACHE_FORMAT == "feather":
+            # O cache é gravado sem compressão, de modo que o arquivo é mapeado
+            # em memória e lido sem descompressão nem buffers intermediários;
+            # a conversão para DataFrame, porém, copia os dados. O
+            # compartilhamento entre processos vem do fork (ver `runner`)
+            from pyarrow import feather
+            return feather.read_feather(path, columns=columns, memory_map=True)
+        df = pd.read_pickle(path)
+        return df if columns is None else df[columns]
+
+    df = read_csv(table)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    # Escreve em um arquivo temporário e o renomeia, para que uma escrita
+    # interrompida ou simultânea nunca deixe um cache incompleto, mais novo
+    # que o CSV, no lugar do arquivo final
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        if CACHE_FORMAT == "feather":
+            df.to_feather(temporary, compression="uncompressed")
+        else:
+            df.to_pickle(temporary)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+    return df if columns is None else df[columns]
+
+
+def load_tables(tables: dict, chunksize: int = None) -> dict:
+    """ Carrega várias tabelas do dataset de uma só vez.
+
+        :param tables: dicionário com o nome de cada tabela e as colunas a
+        serem carregadas (`None` para todas as do esquema)
+        :param chunksize: se informado, as tabelas de `CHUNKED_TABLES` são
+        lidas diretamente do CSV, em blocos com essa quantidade de linhas
+        :return: dicionário com o DataFrame de cada tabela ou, para as tabelas
+        lidas em blocos, um iterador de DataFrames
+    """
+    loaded = {}
+    for table, columns in tables.items():
+        if chunksize and table in CHUNKED_TABLES:
+            loaded[table] = read_csv(table, columns, chunksize=chunksize)
+        else:
+            loaded[table] = load(table, columns)
+    return loaded
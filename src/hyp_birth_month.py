@@ -3,38 +3,111 @@ Módulo responsável por responder a hipótese:
 "Pessoas que nascem na primeira metade do ano tem mais chance de se tornarem jogadores profissionais?"
 """
 
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FixedFormatter, FixedLocator, PercentFormatter
+import data_loader
+from profiling import stage
 
 
-sns.set_theme(style="ticks", palette="pastel")
+# Tabelas e colunas usadas pela análise
+TABLES = {"players": ["player_id", "date_of_birth"]}
 
-players = pd.read_csv('data/football/players.csv')
-players["date_of_birth"] = pd.to_datetime(players["date_of_birth"])
 
-# Cria uma nova coluna na tabela com o mês do aniversário de cada jogador
-players["month_of_birth"] = players["date_of_birth"].map(lambda d: d.month)
+def month_counts(dates: pd.Series, by=None):
+    """ Conta as datas (ex.: de nascimento) de cada mês do ano, em uma única
+        passagem vetorizada, opcionalmente separadas por grupo. Datas nulas
+        são ignoradas.
 
-# Cria uma tabela com a quantidade de aniversariantes por mês
-month_frequency = players.groupby(["month_of_birth"]).size().reset_index(name="count")
+        :param dates: Series de datas, já convertidas ou como texto no
+        formato ISO 8601 (ex.: `"2000-12-16"`)
+        :param by: Series ou array, de mesmo tamanho que `dates`, com o grupo
+        de cada data (ex.: nacionalidade, posição ou `cohort(dates)`); grupos
+        nulos são ignorados
+        :return: sem `by`, Series com a quantidade de datas de cada mês (1 a
+        12, inclusive os meses sem datas); com `by`, DataFrame com uma linha
+        por grupo, em ordem, e uma coluna por mês
+    """
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="ISO8601")
 
-# Adiciona uma coluna com a proporção de aniversariantes por mês
-quantity_players = month_frequency["count"].sum()
-month_frequency["frequency"] = month_frequency["count"] / quantity_players * 100
+    months = dates.dt.month.to_numpy(dtype="float64", na_value=np.nan)
+    valid = ~np.isnan(months)
+    months = months[valid].astype(np.int64) - 1
 
-# Calcula o desvio padrão da distribuição da quantidade de jugadores por mês
-dp = month_frequency["count"].std()
-print(f"Desvio padrão de aniversariantes por mês: {dp}")
+    if by is None:
+        counts = np.bincount(months, minlength=12)
+        return pd.Series(counts, index=pd.RangeIndex(1, 13, name="month_of_birth"), name="count")
 
-meses = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", 
-         "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
+    groups, labels = pd.factorize(np.asarray(by)[valid], sort=True)
+    has_group = groups >= 0
+    cells = groups[has_group] * 12 + months[has_group]
+    counts = np.bincount(cells, minlength=12 * len(labels)).reshape(len(labels), 12)
+    return pd.DataFrame(counts, index=labels, columns=pd.RangeIndex(1, 13, name="month_of_birth"))
 
-ax = sns.barplot(month_frequency, x="month_of_birth", y="frequency")
-ax.xaxis.set_label_text("Mês de nascimento")
-ax.yaxis.set_label_text("Percentual de jogadores")
-ax.xaxis.set_major_locator(FixedLocator(range(len(meses))))
-ax.xaxis.set_major_formatter(FixedFormatter(meses))
-ax.yaxis.set_major_formatter(PercentFormatter())
-plt.show()
+
+def cohort(dates: pd.Series, years: int = 10) -> pd.Series:
+    """ Agrupa as datas em coortes pelo ano (ex.: a década de nascimento),
+        para uso como `by` em `month_counts`.
+
+        :param dates: Series de datas
+        :param years: quantidade de anos de cada coorte
+        :return: Series com o primeiro ano da coorte de cada data (nulo para
+        datas nulas)
+    """
+    year = dates.dt.year
+    return (year // years * years).astype("Int64")
+
+
+def compute(tables: dict) -> pd.DataFrame:
+    """ Calcula a quantidade e o percentual de jogadores nascidos em cada mês.
+
+        :param tables: dicionário com as tabelas de `TABLES`
+        :return: DataFrame com as colunas `month_of_birth`, `count` e
+        `frequency` (em porcentagem)
+    """
+    players = tables["players"]
+
+    with stage("hyp_birth_month.aggregate", rows_in=len(players)) as s:
+        # Cria uma tabela com a quantidade de aniversariantes por mês
+        month_frequency = month_counts(players["date_of_birth"]).reset_index()
+
+        # Adiciona uma coluna com a proporção de aniversariantes por mês
+        quantity_players = month_frequency["count"].sum()
+        month_frequency["frequency"] = month_frequency["count"] / quantity_players * 100
+        s.rows_out = len(month_frequency)
+
+    return month_frequency
+
+
+def present(month_frequency: pd.DataFrame, plot: bool = True):
+    """ Exibe o resultado da análise.
+
+        :param month_frequency: DataFrame retornado por `compute`
+        :param plot: se `False`, apenas imprime os resultados, sem gráficos
+    """
+    # Calcula o desvio padrão da distribuição da quantidade de jugadores por mês
+    dp = month_frequency["count"].std()
+    print(f"Desvio padrão de aniversariantes por mês: {dp}")
+
+    if not plot:
+        return
+
+    with stage("hyp_birth_month.plot", rows_in=len(month_frequency)):
+        sns.set_theme(style="ticks", palette="pastel")
+        meses = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun",
+                 "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
+
+        ax = sns.barplot(month_frequency, x="month_of_birth", y="frequency")
+        ax.xaxis.set_label_text("Mês de nascimento")
+        ax.yaxis.set_label_text("Percentual de jogadores")
+        ax.xaxis.set_major_locator(FixedLocator(range(len(meses))))
+        ax.xaxis.set_major_formatter(FixedFormatter(meses))
+        ax.yaxis.set_major_formatter(PercentFormatter())
+        plt.show()
+
+
+if __name__ == "__main__":
+    present(compute(data_loader.load_tables(TABLES)))
@@ -4,122 +4,158 @@ Módulo responsável por responder a hipótese:
 """
 
 import pandas as pd
-from datetime import datetime
 import locale
 import seaborn as sns
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
 import numpy as np
+from player_index import player_index, ages_at
+import data_loader
+from profiling import stage
 
 
-
-def find_age(current_date, id: int) -> float:
+def find_age(current_date, id: int, players: pd.DataFrame) -> float:
     """ Encontra a idade de um jogador de ID `id` no momento `current_date`, a
         partir das informações do jogador contidas no arquivo `players.csv`.
 
         :param current_date: data com base na qual a idade será calculada
         :param id: ID do jogador
+        :param players: índice dos jogadores, criado por `player_index`
         :return: a idade do jogador no momento informado, em anos
     """
-    p = players.loc[players["player_id"] == id].iloc[0]
-    if type(p["date_of_birth"]) != str:
+    age = ages_at(players, [id], [current_date])[0]
+    if np.isnan(age):
         return None
+    return age
+
+
+def find_buybacks(transfers: pd.DataFrame, players: pd.DataFrame) -> pd.DataFrame:
+    """ Encontra os buybacks registrados na tabela de transferências. Para a
+        hipótese atual, consideramos como buyback a sequência dos eventos de
+        venda e compra, nessa ordem, de um mesmo jogador por parte de um mesmo
+        time. Transferências sem valor reportado são desconsideradas.
+
+        :param transfers: DataFrame com as transferências (`transfers.csv`),
+        com a coluna `transfer_date` já convertida para datetime64
+        :param players: índice dos jogadores, criado por `player_index`
+        :return: DataFrame com um buyback por linha e as colunas `player_id`,
+        `club_id`, `fee_sold`, `age_sold`, `fee_bought`, `age_bought`,
+        `balance` e `interval`
+    """
+    # Filtra o dataset, removendo transferências sem valor reportado, e ordena
+    transfers = transfers.loc[transfers["transfer_fee"] > 0]
+    transfers = transfers.sort_values(["player_id", "transfer_date"])
+
+    # Posição de cada transferência na sequência do jogador e idade do jogador
+    # em cada uma delas, calculada de uma só vez
+    transfers = transfers.assign(
+        order=transfers.groupby("player_id").cumcount().to_numpy(),
+        age=ages_at(players, transfers["player_id"], transfers["transfer_date"])
+    )
+
+    sold = transfers[["player_id", "from_club_id", "transfer_fee", "age", "order"]] \
+        .rename(columns={"from_club_id": "club_id", "transfer_fee": "fee_sold", "age": "age_sold", "order": "order_sold"})
+    bought = transfers[["player_id", "to_club_id", "transfer_fee", "age", "order"]] \
+        .rename(columns={"to_club_id": "club_id", "transfer_fee": "fee_bought", "age": "age_bought", "order": "order_bought"})
+
+    # Cada venda forma um buyback com todas as compras posteriores do mesmo
+    # jogador pelo time que o vendeu
+    buybacks = pd.merge(sold, bought, on=["player_id", "club_id"])
+    buybacks = buybacks.loc[buybacks["order_sold"] < buybacks["order_bought"]] \
+        .sort_values(["player_id", "order_bought", "order_sold"]) \
+        .drop(columns=["order_sold", "order_bought"]) \
+        .reset_index(drop=True)
+
+    buybacks["balance"] = buybacks["fee_sold"] - buybacks["fee_bought"]
+    buybacks["interval"] = buybacks["age_bought"] - buybacks["age_sold"]
+    return buybacks
+
+
+# Tabelas e colunas usadas pela análise
+TABLES = {
+    "players": ["player_id", "date_of_birth"],
+    "transfers": ["player_id", "transfer_date", "from_club_id", "to_club_id", "transfer_fee"]
+}
+
+
+def compute(tables: dict) -> pd.DataFrame:
+    """ Encontra os buybacks do dataset.
+
+        :param tables: dicionário com as tabelas de `TABLES`
+        :return: DataFrame retornado por `find_buybacks`, com a coluna
+        adicional `sqrt_balance` (raiz quadrada do saldo, com o seu sinal)
+    """
+    with stage("hyp_buybacks.clean", rows_in=len(tables["players"])) as s:
+        players = player_index(tables["players"])
+        s.rows_out = len(players)
 
-    birth = datetime.strptime(p["date_of_birth"], "%Y-%m-%d %H:%M:%S").date()
-    return (current_date.date() - birth).days / 365
-
-
-# Configurações
-sns.set_theme(style="ticks", palette="pastel")
-locale.setlocale(locale.LC_ALL, "")
-
-players = pd.read_csv("data/players.csv")
-transfers = pd.read_csv("data/transfers.csv")
-transfers["transfer_date"] = pd.to_datetime(transfers["transfer_date"])
-
-# Filtra o dataset, removendo transferências sem valor reportado, e ordena
-transfers = transfers.loc[transfers["transfer_fee"] > 0]
-transfers = transfers.sort_values(["player_id", "transfer_date"])
-
-# Para a hipótese atual, consideramos como buyback a sequência dos eventos de
-# venda e compra, nessa ordem, de um mesmo jogador por parte de um mesmo time
-buybacks_list = []
-current_player_id = -1
-possible_buybacks = []
-for _, row in transfers.iterrows():
-    id = row["player_id"]
-
-    # Se o ID do jogador mudou, desconsidera os buybacks pendentes
-    if (current_player_id != id):
-        possible_buybacks = []
-    current_player_id = id
-
-    # Aqui verificamos se o jogador foi anteriormente vendido pelo time que
-    # está comprando-o na transferência atual
-    for bb in possible_buybacks:
-        if bb["club_id"] != row["to_club_id"]: continue
-
-        # Adiciona o buyback para ser analisado posteriormente
-        bb["fee_bought"] = row["transfer_fee"]
-        bb["age_bought"] = find_age(row["transfer_date"], id)
-        buybacks_list.append(bb)
-
-    age_sold = find_age(row["transfer_date"], id)
-
-    # Supomos que o jogador será comprado pelo time posteriormente e já
-    # preenchemos as informações do buyback com o que temos
-    bb = {
-        "player_id": id,
-        "club_id": row["from_club_id"],
-        "fee_sold": row["transfer_fee"],
-        "age_sold": age_sold
-    }
-    possible_buybacks.append(bb)
-
-buybacks = pd.DataFrame(buybacks_list)
-buybacks["balance"] = buybacks["fee_sold"] - buybacks["fee_bought"]
-buybacks['sqrt_balance'] = np.sign(buybacks['balance']) * np.sqrt(np.abs(buybacks['balance']))
-buybacks["interval"] = buybacks["age_bought"] - buybacks["age_sold"]
-
-# ------------------------------------------------------------------------------
-
-print(f"n: {len(buybacks)}")
-print(f"saldo (mediana): {locale.currency(buybacks['balance'].median(), grouping=True)}")
-print(f"saldo (desvio padrão): {locale.currency(buybacks['balance'].std(), grouping=True)}")
-print(f"intervalo (média): {round(buybacks['interval'].mean(), 1)}")
-print(f"idade de venda (média): {round(buybacks['age_sold'].mean(), 1)}")
-print(f"idade de compra (média): {round(buybacks['age_bought'].mean(), 1)}")
-
-buybacks['interval_group'] = pd.cut(
-    buybacks['interval'], 
-    bins=range(0, 14, 2),  
-    right=False 
-)
-
-# Agrupar por interval_group e contar
-result = buybacks.groupby('interval_group')["player_id"].count()
-result.to_csv("buybacks.csv")
-
-buybacks["balance"] /=1_000_000
-buybacks['interval_group'] = pd.cut(
-    buybacks['balance'], 
-    bins=[-100, -25, -5, -2, 0, 2, 5, 25, 100],  
-    right=False 
-)
-print(buybacks.head())
-print(len(buybacks["player_id"]))
-result = buybacks.groupby('interval_group')["player_id"].count()
-result.to_csv("buybacks2.csv")
-
-ax = sns.boxplot(y=(buybacks["balance"]))
-ax.yaxis.set_label_text("Saldo (em milhões de euros)")
-plt.show()
-
-ax = sns.boxplot(y=buybacks["sqrt_balance"])
-ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, pos: f"{np.sign(x) * int(x**2) / 1_000_000}"))
-ax.yaxis.set_label_text("Saldo (em milhões de euros)")
-plt.show()
-
-ax = sns.boxplot(y=buybacks["interval"])
-ax.yaxis.set_label_text("Intervalo venda-compra (em anos)")
-plt.show()
+    with stage("hyp_buybacks.merge", rows_in=len(tables["transfers"])) as s:
+        buybacks = find_buybacks(tables["transfers"], players)
+        buybacks['sqrt_balance'] = np.sign(buybacks['balance']) * np.sqrt(np.abs(buybacks['balance']))
+        s.rows_out = len(buybacks)
+
+    return buybacks
+
+
+def present(buybacks: pd.DataFrame, plot: bool = True):
+    """ Exibe o resultado da análise e salva as contagens por intervalo em
+        `buybacks.csv` e `buybacks2.csv`.
+
+        :param buybacks: DataFrame retornado por `compute`
+        :param plot: se `False`, apenas imprime e salva os resultados, sem
+        gráficos
+    """
+    # Configurações
+    sns.set_theme(style="ticks", palette="pastel")
+    locale.setlocale(locale.LC_ALL, "")
+
+    buybacks = buybacks.copy()
+
+    print(f"n: {len(buybacks)}")
+    print(f"saldo (mediana): {locale.currency(buybacks['balance'].median(), grouping=True)}")
+    print(f"saldo (desvio padrão): {locale.currency(buybacks['balance'].std(), grouping=True)}")
+    print(f"intervalo (média): {round(buybacks['interval'].mean(), 1)}")
+    print(f"idade de venda (média): {round(buybacks['age_sold'].mean(), 1)}")
+    print(f"idade de compra (média): {round(buybacks['age_bought'].mean(), 1)}")
+
+    buybacks['interval_group'] = pd.cut(
+        buybacks['interval'], 
+        bins=range(0, 14, 2),  
+        right=False 
+    )
+
+    # Agrupar por interval_group e contar
+    result = buybacks.groupby('interval_group', observed=False)["player_id"].count()
+    result.to_csv("buybacks.csv")
+
+    buybacks["balance"] /=1_000_000
+    buybacks['interval_group'] = pd.cut(
+        buybacks['balance'], 
+        bins=[-100, -25, -5, -2, 0, 2, 5, 25, 100],  
+        right=False 
+    )
+    print(buybacks.head())
+    print(len(buybacks["player_id"]))
+    result = buybacks.groupby('interval_group', observed=False)["player_id"].count()
+    result.to_csv("buybacks2.csv")
+
+    if not plot:
+        return
+
+    with stage("hyp_buybacks.plot", rows_in=len(buybacks)):
+        ax = sns.boxplot(y=(buybacks["balance"]))
+        ax.yaxis.set_label_text("Saldo (em milhões de euros)")
+        plt.show()
+
+        ax = sns.boxplot(y=buybacks["sqrt_balance"])
+        ax.yaxis.set_major_formatter(mtick.FuncFormatter(lambda x, pos: f"{np.sign(x) * int(x**2) / 1_000_000}"))
+        ax.yaxis.set_label_text("Saldo (em milhões de euros)")
+        plt.show()
+
+        ax = sns.boxplot(y=buybacks["interval"])
+        ax.yaxis.set_label_text("Intervalo venda-compra (em anos)")
+        plt.show()
+
+
+if __name__ == "__main__":
+    present(compute(data_loader.load_tables(TABLES)))
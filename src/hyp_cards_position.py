@@ -3,59 +3,136 @@ Módulo responsável por responder a hipótese:
 "A posição dos jogadores em campo influencia na quantidade de cartões que estes recebem?"
 """
 
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import seaborn.objects as so
 import matplotlib.pyplot as plt
 import textwrap
+import data_loader
+import joins
+from profiling import stage
+from summary_statistics import association_test
 
 
-sns.set_theme(style="ticks", palette="pastel")
-
-game_events = pd.read_csv("data/football/game_events.csv")
-game_lineups = pd.read_csv("data/football/game_lineups.csv")
-
-# Filtra apenas os eventos de cartões
-game_events = game_events.loc[game_events["type"] == "Cards"]
-
-game_events["card_type"] = game_events["description"] \
-    .map(lambda e: "yellow" if "yellow" in e.lower() else "red")
-
-merged = pd.merge(
-    game_events,
-    game_lineups,
-    how="inner",
-    on=["game_id", "player_id"]
-).groupby(["card_type", "position"]).size().reset_index(name="count")
-
-# Calcula a quantidade total de jogadores por posição
-calc_total = lambda r: ((merged["position"] == r["position"]) * merged["count"]).sum()
-merged["total_count"] = merged.apply(calc_total, axis=1)
-merged["rel_count"] = merged.apply(lambda r: r["count"] / r["total_count"], axis=1)
-
-# Filtra posições com quantidade insuficiente de dados
-merged = merged.loc[merged["total_count"] > 150]
-print(f"n = {merged['count'].sum()}")
-
-# Gráfico de barras - quantidade de cartões recebidos por posição em campo
-ax = sns.barplot(
-    merged.loc[merged["card_type"] == "yellow"],
-    x="position",
-    y="count",
-)
-# Quebra o texto no eixo X em múltiplas linhas
-labels = [textwrap.fill(label.get_text(), 12) for label in ax.get_xticklabels()]
-ax.set_xticklabels(labels)
-ax.xaxis.set_label_text("Posição em campo")
-ax.yaxis.set_label_text("Número de jogadores")
-plt.show()
-
-merged["card_type"] = merged["card_type"].map(lambda e: "Vermelho" if e == "red" else "Amarelo")
-
-# Gráfico de barras empilhadas - proporção de cartões vermelhos/amarelos por
-# posição em campo
-ax = so.Plot(merged, x="position", y="rel_count", color="card_type") \
-    .add(so.Bar(), so.Stack()) \
-    .scale(color={ "Amarelo": "orange", "Vermelho": "red" }) \
-    .label(x="Posição em campo", y="Percentual do tipo de cartão", color="Tipo de cartão")
-ax.show()
+# Tabelas e colunas usadas pela análise
+TABLES = {
+    "game_events": ["game_id", "type", "player_id", "description"],
+    "game_lineups": ["game_id", "player_id", "position"]
+}
+
+# Tipos de cartões, na ordem das categorias de `card_type`
+CARD_TYPES = ["red", "yellow"]
+
+
+def classify_cards(description: pd.Series) -> pd.Series:
+    """ Classifica os cartões pela descrição do evento: `"yellow"` se ela
+        contém "yellow" (sem diferenciar maiúsculas), e `"red"` caso contrário.
+        Eventos sem descrição ficam sem tipo (nulos) e não são contados. Em
+        colunas categóricas, apenas as categorias são comparadas.
+
+        :param description: coluna `description` dos eventos de cartões
+        :return: Series categórica com as categorias `"red"` e `"yellow"`
+    """
+    if isinstance(description.dtype, pd.CategoricalDtype):
+        yellow = description.cat.categories.str.contains("yellow", case=False)
+        codes = description.cat.codes.to_numpy()
+        card_codes = np.where(codes >= 0, yellow[np.maximum(codes, 0)], -1)
+    else:
+        is_yellow = description.str.contains("yellow", case=False, na=False).to_numpy()
+        card_codes = np.where(description.isna().to_numpy(), -1, is_yellow)
+
+    card_type = pd.Categorical.from_codes(card_codes.astype("int8"), categories=CARD_TYPES)
+    return pd.Series(card_type, index=description.index, name="card_type")
+
+
+def compute(tables: dict) -> pd.DataFrame:
+    """ Conta os cartões amarelos e vermelhos recebidos pelos jogadores de
+        cada posição em campo.
+
+        :param tables: dicionário com as tabelas de `TABLES`
+        :return: DataFrame com as colunas `card_type` (categórica, `"yellow"`
+        ou `"red"`), `position`, `count`, `total_count` (cartões da posição) e
+        `rel_count` (proporção do tipo de cartão na posição), apenas para as
+        posições com mais de 150 cartões
+    """
+    game_events = tables["game_events"]
+    game_lineups = tables["game_lineups"]
+
+    with stage("hyp_cards_position.clean", rows_in=len(game_events)) as s:
+        # Filtra apenas os eventos de cartões
+        game_events = game_events.loc[game_events["type"] == "Cards", ["game_id", "player_id", "description"]]
+        game_events = game_events.assign(card_type=classify_cards(game_events["description"]))
+        s.rows_out = len(game_events)
+
+    with stage("hyp_cards_position.merge", rows_in=len(game_events) + len(game_lineups)) as s:
+        # As escalações são antes filtradas para os jogadores que receberam cartões
+        merged = joins.merge(
+            game_events,
+            game_lineups[["game_id", "player_id", "position"]],
+            how="inner",
+            on=["game_id", "player_id"]
+        )
+        s.rows_out = len(merged)
+
+    with stage("hyp_cards_position.aggregate", rows_in=len(merged)) as s:
+        merged = merged.groupby(["card_type", "position"], observed=True).size().reset_index(name="count")
+
+        # Calcula a quantidade total de cartões por posição
+        merged["total_count"] = merged.groupby("position", observed=True)["count"].transform("sum")
+        merged["rel_count"] = merged["count"] / merged["total_count"]
+
+        # Filtra posições com quantidade insuficiente de dados
+        merged = merged.loc[merged["total_count"] > 150]
+        s.rows_out = len(merged)
+
+    return merged
+
+
+def present(merged: pd.DataFrame, plot: bool = True):
+    """ Exibe o resultado da análise.
+
+        :param merged: DataFrame retornado por `compute`
+        :param plot: se `False`, apenas imprime os resultados, sem gráficos
+    """
+    print(f"n = {merged['count'].sum()}")
+
+    # Associação entre a posição e o tipo de cartão, com a sua significância por permutação
+    table = merged.pivot(index="position", columns="card_type", values="count").fillna(0)
+    if table.shape[0] >= 2 and table.shape[1] >= 2:
+        test = association_test(table, seed=0)
+        print(f"V de Cramer das variáveis 'position' e 'card_type': {test['cramer_v']:.2f} "
+              f"(p-valor: {test['p_value']:.4f}, IC 95%: [{test['ci_low']:.2f}, {test['ci_high']:.2f}])")
+
+    if not plot:
+        return
+
+    with stage("hyp_cards_position.plot", rows_in=len(merged)):
+        sns.set_theme(style="ticks", palette="pastel")
+
+        # Gráfico de barras - quantidade de cartões recebidos por posição em campo
+        ax = sns.barplot(
+            merged.loc[merged["card_type"] == "yellow"],
+            x="position",
+            y="count",
+        )
+        # Quebra o texto no eixo X em múltiplas linhas
+        labels = [textwrap.fill(label.get_text(), 12) for label in ax.get_xticklabels()]
+        ax.set_xticklabels(labels)
+        ax.xaxis.set_label_text("Posição em campo")
+        ax.yaxis.set_label_text("Número de jogadores")
+        plt.show()
+
+        merged = merged.assign(card_type=merged["card_type"].map(lambda e: "Vermelho" if e == "red" else "Amarelo"))
+
+        # Gráfico de barras empilhadas - proporção de cartões vermelhos/amarelos por
+        # posição em campo
+        ax = so.Plot(merged, x="position", y="rel_count", color="card_type") \
+            .add(so.Bar(), so.Stack()) \
+            .scale(color={ "Amarelo": "orange", "Vermelho": "red" }) \
+            .label(x="Posição em campo", y="Percentual do tipo de cartão", color="Tipo de cartão")
+        ax.show()
+
+
+if __name__ == "__main__":
+    present(compute(data_loader.load_tables(TABLES)))
@@ -18,6 +18,11 @@ import seaborn as sns
 import pandas as pd
 import numpy as np
 import inflation
+import data_loader
+from performance import score_sums, score_sums_chunked
+from valuations import valuation_index, value_at
+import joins
+from profiling import stage
 
 """
 Quais foram as compras de jogadores com melhores e 
@@ -25,94 +30,127 @@ piores custo-benefício registradas?
 """
 
 #Função para calcular custo-beneficio
-def calc_cost_benefit(group : pd.core.frame.DataFrame) -> float:
+def calc_cost_benefit(windows : pd.core.frame.DataFrame) -> pd.core.series.Series:
     """
-    Calcula o custo-benefício de um jogador baseado em desempenho e valor de mercado.
+    Calcula o custo-benefício de cada compra baseado em desempenho e valor de mercado.
     Considera estatísticas como gols, assistências, cartões, e a variação no valor de mercado ao longo do tempo.
     A fórmula utiliza pesos específicos para cada estatística, resultando em um valor numérico que reflete 
     se o jogador trouxe um bom retorno em relação ao investimento.
 
-        :param group: DataFrame contendo as estatísticas e o valor de mercado do jogador.
-        :return: Valor numérico que indica o custo-benefício do jogador.
+        :param windows: DataFrame com uma linha por transferência, contendo a soma das pontuações (score), o número
+        de partidas (games) e o valor de mercado do jogador na compra e na transferência seguinte.
+        :return: Série com o custo-benefício de cada transferência.
     """
-    delta_price = (group["market_value_in_eur_shift"].iloc[0] - group["market_value_in_eur"].iloc[0])
-    modificador = 10 ** (len(str(np.abs(int(delta_price))))-1)
+    delta_price = windows["market_value_in_eur_shift"] - windows["market_value_in_eur"]
+
+    #Modificador: 10 elevado ao número de dígitos da parte inteira de delta_price, menos um
+    digits = np.searchsorted(10.0 ** np.arange(1, 20), np.abs(np.trunc(delta_price)), side="right")
+    modificador = 10.0 ** digits
 
     #Fórmula para calcular desempenho do jogador, segundo sites esportivos (contem modificacao)
-    reduce = sum((-1)*group["yellow_cards"] + (-3)*group["red_cards"] + (8)*group["goals"] + (5)*group["assists"]) * modificador / group.shape[0]
-    return round((reduce + delta_price) / group["market_value_in_eur"].iloc[0], 4)
+    reduce = windows["score"] * modificador / windows["games"]
+    return ((reduce + delta_price) / windows["market_value_in_eur"]).round(4)
     
-#Função correção da data_diff
-def correct_data_shift(row : pd.core.series.Series) -> datetime.date:
+#Função que associa as partidas às transferências
+def assign_transfers(appearances : pd.core.frame.DataFrame, transfers : pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
     """
-    Corrige a data da transferência do jogador, considerando se é o mesmo jogador.
-    Se for o mesmo jogador, retorna a data da última transferência; caso contrário, retorna a data atual.
+    Remove as partidas sem estatísticas e associa cada uma delas à transferência do jogador em cujo período ela ocorreu.
 
-        :param row: Série contendo informações do jogador, incluindo se é o mesmo jogador e a data de transferência.
-        :return: Data corrigida da transferência ou a data atual.
+        :param appearances: DataFrame com as partidas (ou um bloco delas).
+        :param transfers: DataFrame com as transferências, contendo as colunas transfer_date e date_shift.
+        :return: DataFrame com uma linha por partida associada, contendo as colunas das duas tabelas.
+    """
+    appearances = appearances.dropna(axis=0, subset=["yellow_cards", "red_cards", "goals", "assists"])
+    #Apenas as partidas de jogadores com transferências podem ser associadas
+    appearances = joins.semi_join(appearances, transfers, 'player_id')
+    merged = joins.assign_windows(appearances, transfers, by='player_id', on='date', start='transfer_date', end='date_shift')
+    return merged.rename(columns={'player_name_x': 'player_name'})
+
+#Tabelas e colunas usadas pela análise
+TABLES = {
+    "appearances": ["player_id", "date", "player_name", "yellow_cards", "red_cards", "goals", "assists"],
+    "transfers": None,
+    "player_valuations": ["player_id", "date", "market_value_in_eur"]
+}
+
+#Arquivos lidos pela análise além das tabelas de TABLES
+INPUT_FILES = [inflation.HCPI_PATH]
+
+#Função que calcula o custo-benefício de todas as compras
+def compute(tables : dict) -> pd.core.frame.DataFrame:
     """
-    if not row["same_player"]:
-        return datetime.strptime("30/09/2024", "%d/%m/%Y").date()
-    return row["date_shift"].date()
-
-#Função correção da market_value_in_eur_shift
-def correct_market_value_in_eur_shift(row : pd.core.series.Series) -> float:
-    """ 
-    Corrige o valor de mercado de um jogador, levando em consideração a inflação e se é o mesmo jogador.
-    Se for um jogador diferente, retorna o valor de mercado atual. Se for o mesmo jogador, retorna o valor de mercado 
-    ajustado para o período anterior.
-
-        :param row: Série com informações sobre o jogador, incluindo o valor de mercado e a indicação se é o mesmo jogador.
-        :return: Valor de mercado corrigido com base na inflação ou o valor de mercado atual.
+    Calcula o custo-benefício de cada transferência registrada, considerando as partidas do jogador até a transferência
+    seguinte (ou até a data de referência dos dados).
+
+        :param tables: Dicionário com as tabelas de TABLES. A tabela appearances pode ser um DataFrame ou um iterável de
+        blocos de DataFrames (ex.: o retornado por pd.read_csv com chunksize).
+        :return: DataFrame com uma linha por transferência, com as colunas que a identificam e a coluna custo_beneficio,
+        ordenado do maior para o menor custo-benefício.
     """
-    if not row["same_player"]:
-        return row["current_market_value"]
-    return row["market_value_in_eur_shift"]
-
-#Abrindo as tabelas que serão utilizadas
-appearances = pd.read_csv('data/appearances.csv')
-transfers = pd.read_csv('data/transfers.csv')
-players = pd.read_csv('data/players.csv')
-
-#Limpando dados NaN das colunas que serão utilizadas
-appearances.dropna(axis=0, subset=["yellow_cards", "red_cards", "goals", "assists"], inplace=True) 
-transfers.dropna(axis=0, subset=["player_name", "transfer_date","market_value_in_eur", "from_club_id", "to_club_id"], inplace=True)
-players.dropna(axis=0, subset=["name", "market_value_in_eur"], inplace=True)
-
-#Criando coluna same_player
-transfers.sort_values(['player_id', 'transfer_date'], ascending=True, inplace=True)
-transfers["transfer_date"] = pd.to_datetime(transfers["transfer_date"], yearfirst=True)
-transfers = transfers[transfers["transfer_date"] <= pd.to_datetime("30/09/2024", format="%d/%m/%Y")]
-transfers["same_player"] = -transfers["player_id"].diff(-1) == 0
-
-#Criando coluna data_shift
-transfers['date_shift'] = transfers['transfer_date'].shift(-1)
-transfers["date_shift"] = transfers.apply(correct_data_shift, axis=1)
-
-#Criando coluna market_value_in_eur_shift
-transfers['market_value_in_eur'] = transfers.apply(lambda row: inflation.inflation_adj(row['market_value_in_eur'], row['transfer_date']), axis=1)
-transfers['market_value_in_eur_shift'] = transfers['market_value_in_eur'].shift(-1)
-players.rename(columns={'market_value_in_eur': 'current_market_value'}, inplace=True)
-transfers = pd.merge(players[["player_id", "current_market_value"]], transfers, on='player_id')
-transfers["market_value_in_eur_shift"] = transfers.apply(correct_market_value_in_eur_shift, axis=1)
-
-#Criando performance
-appearances.sort_values(['player_id', 'date'], ascending=True, inplace=True)
-appearances["date"] = pd.to_datetime(appearances["date"], yearfirst=True)
-
-#Unindo as tabelas
-merged = pd.merge(appearances, transfers, on='player_id')
-merged = merged[(merged['date'] >= merged['transfer_date']) & (merged['date'] <= merged['date_shift'])]
-merged.rename(columns={'player_name_x': 'player_name'}, inplace=True)
-
-#Agrupar por transferência
-cost_benefit = merged.groupby(['player_id', 'player_name', 'transfer_date', 'from_club_id', 'from_club_name', 'to_club_id', 'to_club_name']).apply(calc_cost_benefit).reset_index(name="custo_beneficio")
-cost_benefit.sort_values(by='custo_beneficio', ascending=False, inplace=True)
-
-print(cost_benefit)
-
-#Plotando o gráfico
-print(cost_benefit[["custo_beneficio"]].describe())
-sns.boxplot(data=cost_benefit,  y="custo_beneficio", color="red")
-plt.ylim(-5, 8)
-plt.show()
\ No newline at end of file
+    appearances = tables["appearances"]
+    transfers = tables["transfers"]
+
+    with stage("hyp_cost_benefit.clean", rows_in=len(transfers)) as s:
+        #Limpando dados NaN das colunas que serão utilizadas
+        transfers = transfers.dropna(axis=0, subset=["player_name", "transfer_date","market_value_in_eur", "from_club_id", "to_club_id"])
+
+        #Criando coluna same_player
+        transfers = transfers.sort_values(['player_id', 'transfer_date'], ascending=True)
+        cutoff = pd.to_datetime("30/09/2024", format="%d/%m/%Y")
+        transfers = transfers[transfers["transfer_date"] <= cutoff].copy()
+        transfers["same_player"] = -transfers["player_id"].diff(-1) == 0
+
+        #Criando coluna data_shift: data da próxima transferência do jogador ou, na última, a data atual
+        transfers['date_shift'] = transfers['transfer_date'].shift(-1).where(transfers["same_player"], cutoff)
+
+        #Criando coluna market_value_in_eur_shift
+        transfers['market_value_in_eur'] = inflation.inflation_adj_many(transfers['market_value_in_eur'], transfers['transfer_date'])
+        #Na última transferência de cada jogador, usa o valor de mercado em vigor na data de referência (corrigido pela inflação)
+        valuations = valuation_index(tables["player_valuations"], adjust=True)
+        current_market_value = value_at(valuations, transfers["player_id"], np.full(len(transfers), cutoff.to_datetime64()))
+        transfers['market_value_in_eur_shift'] = transfers['market_value_in_eur'].shift(-1).where(transfers["same_player"], current_market_value)
+        transfers = transfers.dropna(axis=0, subset=["market_value_in_eur_shift"])
+        s.rows_out = len(transfers)
+
+    #Unindo as tabelas (cada partida é associada apenas à transferência em cujo período ela ocorreu) e agrupando por transferência
+    keys = ['player_id', 'player_name', 'transfer_date', 'from_club_id', 'from_club_name', 'to_club_id', 'to_club_name']
+    prices = ["market_value_in_eur", "market_value_in_eur_shift"]
+    if isinstance(appearances, pd.DataFrame):
+        with stage("hyp_cost_benefit.merge", rows_in=len(appearances)) as s:
+            merged = assign_transfers(appearances, transfers)
+            s.rows_out = len(merged)
+
+        with stage("hyp_cost_benefit.aggregate", rows_in=len(merged)) as s:
+            windows = score_sums(merged, keys, first=prices)
+            s.rows_out = len(windows)
+    else:
+        #Em blocos, a junção e a agregação de cada bloco são medidas juntas
+        with stage("hyp_cost_benefit.aggregate") as s:
+            windows = score_sums_chunked(appearances, keys, first=prices, prepare=lambda chunk: assign_transfers(chunk, transfers))
+            s.rows_out = len(windows)
+
+    cost_benefit = calc_cost_benefit(windows).reset_index(name="custo_beneficio")
+    return cost_benefit.sort_values(by='custo_beneficio', ascending=False)
+
+#Função que exibe o resultado
+def present(cost_benefit : pd.core.frame.DataFrame, plot : bool = True):
+    """
+    Exibe o custo-benefício das transferências e o gráfico da sua distribuição.
+
+        :param cost_benefit: DataFrame retornado por compute.
+        :param plot: Se False, apenas imprime os resultados, sem gráficos.
+    """
+    print(cost_benefit)
+    print(cost_benefit[["custo_beneficio"]].describe())
+
+    if not plot:
+        return
+
+    #Plotando o gráfico
+    with stage("hyp_cost_benefit.plot", rows_in=len(cost_benefit)):
+        sns.boxplot(data=cost_benefit,  y="custo_beneficio", color="red")
+        plt.ylim(-5, 8)
+        plt.show()
+
+if __name__ == "__main__":
+    present(compute(data_loader.load_tables(TABLES)))
@@ -18,48 +18,17 @@ import seaborn as sns
 import pandas as pd
 import numpy as np
 import inflation
+import data_loader
+import joins
+from performance import performance as calc_performance, performance_from_sums, score_sums_chunked
+from valuations import time_weighted_mean
+from summary_statistics import binned_quantiles
+from profiling import stage
 
 """
 Jogadores com preço fora do comum tem o desempenho proporcional?
 """
 
-#Função correção da data_diff
-def correct_data_diff(row : pd.core.series.Series) -> int:
-    """ 
-    Corrige a diferença de datas entre registros de um jogador, ajustando para um limite de 365 dias se necessário.
-    Se o jogador mudou de clube (ou não é o mesmo jogador), a diferença entre as datas será calculada até o máximo de 365 dias.
-    Caso contrário, mantém a diferença original de datas.
-
-        :param row: Série contendo informações de data e se é o mesmo jogador.
-        :return: Diferença de dias entre as datas, ajustada ou original.
-    """
-    if not row["same_player"]:
-        return min((datetime.strptime("30/09/2024", "%d/%m/%Y").date() - row["date"].date()).days, 365)
-    return row["date_diff"].days
-
-#Função que calcula media ponderada do valor do jogador
-def calc_mean_price(group : pd.core.frame.DataFrame) -> float:
-    """ 
-    Calcula a média ponderada do valor de mercado de um jogador com base na duração de tempo em que ele manteve esse valor.
-    O cálculo utiliza a diferença de dias (date_diff) como peso para calcular a média ponderada do valor de mercado.
-
-        :param group: DataFrame contendo o valor de mercado e a diferença de datas para cada registro do jogador.
-        :return: Média ponderada do valor de mercado, arredondada para duas casas decimais.
-    """
-    return round(sum(group["market_value_in_eur"] * group["date_diff"]) / sum(group["date_diff"]), 2)
-
-#Função que calcula performance do jogador
-def calc_performance(group : pd.core.frame.DataFrame) -> float:
-    """ 
-    Calcula o desempenho de um jogador com base em suas estatísticas de jogo, como gols, assistências e cartões.
-    O desempenho é calculado com pesos específicos para cada estatística, resultando em um valor proporcional
-    ao número de jogos (group.shape[0]).
-
-        :param group: DataFrame com as estatísticas de desempenho (gols, assistências, cartões) do jogador.
-        :return: Valor numérico do desempenho, arredondado para quatro casas decimais.
-    """
-    return round(sum((-1)*group["yellow_cards"] + (-3)*group["red_cards"] + (8)*group["goals"] + (5)*group["assists"]) * 100 / group.shape[0], 4)
-
 #Função que calcula o limite superior
 def calc_upper_limit(col : pd.core.series.Series) -> float:
     """ 
@@ -67,65 +36,118 @@ def calc_upper_limit(col : pd.core.series.Series) -> float:
     O cálculo utiliza o primeiro (Q1) e o terceiro quartil (Q3) para determinar a distância interquartil (IQR).
     O limite superior é calculado como Q3 + 1,5 * IQR, destacando os valores que estão acima desse limite.
 
-        :param col: Série de valores numéricos (como preços) sobre os quais será calculado o limite.
+        :param col: Série de valores numéricos (como preços) sobre os quais será calculado o limite, ou um
+        summary_statistics.QuantileSketch com o resumo deles (ex.: combinado a partir de vários blocos ou processos).
         :return: Valor do limite superior, acima do qual os valores são considerados outliers.
     """
     q1 = col.quantile(0.25)
     q3 = col.quantile(0.75)
     return q3 + 1.5 * (q3 - q1)
 
-#Abrindo as tabelas que serão utilizadas
-appearances = pd.read_csv('data/appearances.csv')
-player_valuations = pd.read_csv('data/player_valuations.csv')
-
-#Limpando dados NaN das colunas que serão utilizadas
-appearances.dropna(axis=0, subset=["yellow_cards", "red_cards", "goals", "assists"], inplace=True) 
-player_valuations.dropna(axis=0, subset=["market_value_in_eur", "date"], inplace=True)
-
-#Criando mean_price
-#Ordenar os dados, converter data, corrigir valores, criar colunas same_player e date_diff, calcular a média ponderada
-player_valuations.sort_values(['player_id', 'date'], ascending=True, inplace=True)
-player_valuations["date"] = pd.to_datetime(player_valuations["date"], yearfirst=True)
-player_valuations['market_value_in_eur'] = player_valuations.apply(lambda row: inflation.inflation_adj(row['market_value_in_eur'], row['date']), axis=1)
-player_valuations["same_player"] = -player_valuations["player_id"].diff(-1) == 0
-player_valuations["date_diff"] = -player_valuations["date"].diff(-1)
-player_valuations["date_diff"] = player_valuations.apply(correct_data_diff, axis=1)
-mean_price = player_valuations.groupby("player_id").apply(calc_mean_price).reset_index(name="Preco_Medio")
-
-#Criando performance
-#Ordenar os dados, calcular performance do jogador
-appearances.sort_values('player_id', ascending=True, inplace=True)
-performance = appearances.groupby(["player_id", "player_name"]).apply(calc_performance).reset_index(name="Desempenho")
-
-#Unindo os dados
-merged = pd.merge(performance, mean_price, how="left", on="player_id").dropna(axis=0).sort_values("Preco_Medio", ascending=True)
-
-#Calculando limite superior
-merged["Log_Preco_Medio"] = np.log(merged["Preco_Medio"])
-upper_limit = np.log(calc_upper_limit(merged["Preco_Medio"]))
-
-df = pd.DataFrame({
-        "Log_Preco_Medio_do_jogador": [],
-        "Quartil_1": [],
-        "Media_do_desempenho_dos_jogadores_nesse_intervalo": [],
-        "Quartil_3": []
-        
+#Função que calcula o desempenho por faixa de preço
+def calc_bands(merged : pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+    """
+    Calcula os quartis do desempenho dos jogadores em faixas de uma unidade do logaritmo do preço médio, da sexta
+    faixa abaixo do limite superior (calculado por calc_upper_limit) à quarta faixa acima dele.
+
+        :param merged: DataFrame com as colunas Preco_Medio, Log_Preco_Medio e Desempenho, uma linha por jogador.
+        :return: DataFrame com o centro de cada faixa e o primeiro, o segundo e o terceiro quartis do desempenho.
+    """
+    upper_limit = np.log(calc_upper_limit(merged["Preco_Medio"]))
+
+    #Faixas de uma unidade, de upper_limit - 6 a upper_limit + 4, calculadas em uma única passagem
+    edges = upper_limit + np.arange(-6, 5)
+    bands = binned_quantiles(merged["Desempenho"], merged["Log_Preco_Medio"], edges)
+
+    return pd.DataFrame({
+        "Log_Preco_Medio_do_jogador": bands["center"],
+        "Quartil_1": bands[0.25],
+        "Media_do_desempenho_dos_jogadores_nesse_intervalo": bands[0.5],
+        "Quartil_3": bands[0.75]
     })
 
-for i in range(-6, 4):
-    inf = upper_limit + i
-    sup = upper_limit + i + 1
-    intervalo = merged[(merged["Log_Preco_Medio"] >= inf) & (merged["Log_Preco_Medio"] < sup)]
-    q1 = intervalo["Desempenho"].quantile(0.25)
-    q2 = intervalo["Desempenho"].quantile(0.5)
-    q3 = intervalo["Desempenho"].quantile(0.75)
-    df.loc[i+6] = [(sup+inf)/2, q1, q2, q3]
-    print(inf, sup, q1, q2, q3)
-
-df.to_csv("performance.csv")
-
-#Plotando os gráficos
-# print(merged.describe())
-# print("Correlação: ", np.corrcoef(merged["Desempenho"], merged["Preco_Medio"])[0,1])
-# sns.lineplot(data=df, x="Intervalo", y="Média", color="blue")
-# plt.show()
+#Tabelas e colunas usadas pela análise
+TABLES = {
+    "appearances": ["player_id", "player_name", "yellow_cards", "red_cards", "goals", "assists"],
+    "player_valuations": None
+}
+
+#Arquivos lidos pela análise além das tabelas de TABLES
+INPUT_FILES = [inflation.HCPI_PATH]
+
+#Função que calcula o preço médio e o desempenho de cada jogador
+def compute(tables : dict) -> tuple:
+    """
+    Calcula o preço médio (corrigido pela inflação e ponderado pelo tempo) e o desempenho de cada jogador, e os quartis
+    do desempenho em cada faixa de preço.
+
+        :param tables: Dicionário com as tabelas de TABLES. A tabela appearances pode ser um DataFrame ou um iterável de
+        blocos de DataFrames (ex.: o retornado por pd.read_csv com chunksize).
+        :return: Tupla com o DataFrame de jogadores (colunas player_id, player_name, Desempenho, Preco_Medio e
+        Log_Preco_Medio), ordenado pelo preço médio, e o DataFrame retornado por calc_bands.
+    """
+    appearances = tables["appearances"]
+    stats = ["yellow_cards", "red_cards", "goals", "assists"]
+
+    with stage("hyp_performance.clean", rows_in=len(tables["player_valuations"])) as s:
+        #Limpando dados NaN das colunas que serão utilizadas
+        player_valuations = tables["player_valuations"].dropna(axis=0, subset=["market_value_in_eur", "date"])
+
+        #Corrigir valores pela inflação
+        player_valuations = player_valuations.assign(
+            market_value_in_eur=inflation.inflation_adj_many(player_valuations['market_value_in_eur'], player_valuations['date'])
+        )
+        s.rows_out = len(player_valuations)
+
+    with stage("hyp_performance.aggregate", rows_in=len(player_valuations)) as s:
+        #Criando performance
+        #Calcular performance do jogador, em uma única agregação por jogador (ou por bloco de appearances, acumulando as somas)
+        if isinstance(appearances, pd.DataFrame):
+            s.rows_in += len(appearances)
+            appearances = appearances.dropna(axis=0, subset=stats)
+            performance = calc_performance(appearances, ["player_id", "player_name"]).reset_index(name="Desempenho")
+        else:
+            sums = score_sums_chunked(appearances, ["player_id", "player_name"], prepare=lambda chunk: chunk.dropna(axis=0, subset=stats))
+            performance = performance_from_sums(sums).reset_index(name="Desempenho")
+
+        #Criando mean_price
+        #Calcular a média ponderada pelo tempo em que cada valor foi mantido, apenas para os jogadores com desempenho
+        player_valuations = joins.semi_join(player_valuations, performance, "player_id")
+        mean_price = time_weighted_mean(player_valuations).reset_index(name="Preco_Medio")
+        s.rows_out = len(mean_price) + len(performance)
+
+    with stage("hyp_performance.merge", rows_in=len(performance) + len(mean_price)) as s:
+        #Unindo os dados (jogadores sem preço médio são descartados)
+        merged = joins.merge(performance, mean_price, on="player_id").dropna(axis=0).sort_values("Preco_Medio", ascending=True)
+        merged["Log_Preco_Medio"] = np.log(merged["Preco_Medio"])
+        s.rows_out = len(merged)
+
+    with stage("hyp_performance.bands", rows_in=len(merged)) as s:
+        bands = calc_bands(merged)
+        s.rows_out = len(bands)
+
+    return merged, bands
+
+#Função que exibe o resultado
+def present(result : tuple, plot : bool = True):
+    """
+    Exibe os quartis do desempenho em cada faixa de preço e os salva em performance.csv.
+
+        :param result: Tupla retornada por compute.
+        :param plot: Se False, apenas imprime e salva os resultados, sem gráficos.
+    """
+    merged, df = result
+    for _, row in df.iterrows():
+        center = row["Log_Preco_Medio_do_jogador"]
+        print(center - 0.5, center + 0.5, *row.iloc[1:])
+
+    df.to_csv("performance.csv")
+
+    #Plotando os gráficos
+    # print(merged.describe())
+    # print("Correlação: ", np.corrcoef(merged["Desempenho"], merged["Preco_Medio"])[0,1])
+    # sns.lineplot(data=df, x="Intervalo", y="Média", color="blue")
+    # plt.show()
+
+if __name__ == "__main__":
+    present(compute(data_loader.load_tables(TABLES)))
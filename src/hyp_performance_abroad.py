@@ -6,51 +6,85 @@ Módulo responsável por responder a hipótese:
 import pandas as pd
 import numpy as np
 import seaborn.objects as so
-from summary_statistics import cramer_v
+from summary_statistics import association_test, cramer_v_from_columns
+import data_loader
+from matches import game_outcomes
+from profiling import stage
 
 
-def label_result(r):
-    # Para evitar mais consultas que o necessário
-    home_goals = r["home_club_goals"]
-    away_goals = r["away_club_goals"]
+# Tabelas e colunas usadas pela análise
+TABLES = {"games": ["home_club_goals", "away_club_goals", "competition_type"]}
 
-    if home_goals > away_goals:
-        return "Derrota"
-    if home_goals == away_goals:
-        return "Empate"
-    if home_goals < away_goals:
-        return "Vitória"
 
+def compute(tables: dict) -> tuple:
+    """ Calcula a distribuição dos resultados dos times visitantes em
+        partidas dentro e fora do país, e a associação entre as duas
+        variáveis.
 
-club_games = pd.read_csv("data/football/club_games.csv")
-games = pd.read_csv("data/football/games.csv")
+        :param tables: dicionário com as tabelas de `TABLES`
+        :return: tupla com um DataFrame com as colunas `result`,
+        `is_international`, `count` e `freq` (proporção do resultado dentre
+        as partidas dentro/fora do país) e o V de Cramer das variáveis
+        `result` e `is_international`
+    """
+    games = tables["games"]
 
-# Cria coluna com o resultado da partida: vitória, empate ou derrota
-games["result"] = games.apply(label_result, axis=1)
-games["is_international"] = games["competition_type"] == "international_cup"
+    with stage("hyp_performance_abroad.clean", rows_in=len(games)) as s:
+        # Resultado da partida para o time visitante (vitória, empate ou derrota)
+        # e se ela foi disputada fora do país
+        result = game_outcomes(games, perspective="away")
+        is_international = games["competition_type"] == "international_cup"
+        s.rows_out = len(result)
 
-# Agrupa e conta a frequência de partidas dentro/fora do país para cada resultado
-games_freq = games.groupby(["result", "is_international"]).size().reset_index(name="count")
+    with stage("hyp_performance_abroad.aggregate", rows_in=len(result)) as s:
+        # Agrupa e conta a frequência de partidas dentro/fora do país para cada resultado
+        games_freq = pd.DataFrame({"result": result, "is_international": is_international}) \
+            .groupby(["result", "is_international"], observed=True).size().reset_index(name="count")
 
-total_international = games_freq.loc[games_freq["is_international"]]["count"].sum()
-total_home = games_freq.loc[~games_freq["is_international"]]["count"].sum()
+        total_international = games_freq.loc[games_freq["is_international"]]["count"].sum()
+        total_home = games_freq.loc[~games_freq["is_international"]]["count"].sum()
 
-# Divide em uma tabela de dupla entrada por 'is_international' e 'result'
-pivot = games_freq.pivot_table(index="result", columns="is_international", values="count")
+        games_freq["freq"] = np.where(games_freq["is_international"] == True, games_freq["count"] /
+                                            total_international, games_freq["count"] / total_home)
 
-games_freq["freq"] = np.where(games_freq["is_international"] == True, games_freq["count"] /
-                                    total_international, games_freq["count"] / total_home)
+        # Calcula o V de Cramer, que indica a associação entre as variáveis, a partir
+        # dos dados de cada partida
+        v = cramer_v_from_columns(result, is_international)
+        s.rows_out = len(games_freq)
 
-# Renomeia os valores da coluna 'is_international': True -> "Fora do país",
-# False -> "Dentro do país"
-label_fun = lambda e: "Fora do país" if e else "Dentro do país"
-games_freq["is_international"] = games_freq["is_international"].map(label_fun)
+    return games_freq, v
 
-# Calcula o V de Cramer, que indica a associação entre os eixos da tabela
-print(f"V de Cramer das variáveis 'is_international' e 'result': {round(cramer_v(pivot), 2)}")
 
-p: so.Plot = so.Plot(games_freq, x="is_international", y="freq", color="result") \
-    .add(so.Bar(), so.Stack()) \
-    .label(x="Localização", y="Percentual dos resultados", color="Resultado da partida")
+def present(result: tuple, plot: bool = True):
+    """ Exibe o resultado da análise.
 
-p.show()
+        :param result: tupla retornada por `compute`
+        :param plot: se `False`, apenas imprime os resultados, sem gráficos
+    """
+    games_freq, v = result
+    print(f"V de Cramer das variáveis 'is_international' e 'result': {round(v, 2)}")
+
+    # Significância da associação, por permutação, e intervalo de confiança do V de Cramer
+    table = games_freq.pivot(index="result", columns="is_international", values="count").fillna(0)
+    if table.shape[0] >= 2 and table.shape[1] >= 2:
+        test = association_test(table, seed=0)
+        print(f"p-valor: {test['p_value']:.4f}, IC 95% do V de Cramer: [{test['ci_low']:.2f}, {test['ci_high']:.2f}]")
+
+    if not plot:
+        return
+
+    # Renomeia os valores da coluna 'is_international': True -> "Fora do país",
+    # False -> "Dentro do país"
+    label_fun = lambda e: "Fora do país" if e else "Dentro do país"
+    games_freq = games_freq.assign(is_international=games_freq["is_international"].map(label_fun))
+
+    with stage("hyp_performance_abroad.plot", rows_in=len(games_freq)):
+        p: so.Plot = so.Plot(games_freq, x="is_international", y="freq", color="result") \
+            .add(so.Bar(), so.Stack()) \
+            .label(x="Localização", y="Percentual dos resultados", color="Resultado da partida")
+
+        p.show()
+
+
+if __name__ == "__main__":
+    present(compute(data_loader.load_tables(TABLES)))
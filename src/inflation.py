@@ -1,22 +1,109 @@
 """ Módulo responsável por corrigir valores em Euro para a inflação """
 
-import pandas as pd
+import numpy as np
 from datetime import datetime
+import hashlib
 import math
+import csv
+import os
 
 
 # Fonte: https://data.ecb.europa.eu/data/datasets/ICP/ICP.M.U2.N.000000.4.ANR
-df = pd.read_csv("data/hcpi/hcpi.csv")
-df["date"] = pd.to_datetime(df["date"], yearfirst=True)
-df["period"] = df["date"].map(lambda d: d.year * 12 + d.month)
+HCPI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", "hcpi", "hcpi.csv")
 
-MIN_DATE_ID = df["period"].min()
+# Tabela pré-computada com o índice acumulado, reconstruída apenas quando o CSV
+# de origem é modificado
+CACHE_PATH = os.path.splitext(HCPI_PATH)[0] + ".npz"
 
-cum_inflation = []
-index = 100
-for i, r in df.iterrows():
-    index *= 1 + r["inflation"] / 1200
-    cum_inflation.append(index)
+# Carregada sob demanda por `load_index`
+_index = None
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _build_index(path: str):
+    """ Lê o CSV do índice de preços e calcula o índice acumulado (base 100)
+        de cada mês.
+
+        :param path: caminho do arquivo CSV, com as colunas `date` e `inflation`
+        :return: tupla com o identificador (ano * 12 + mês) do primeiro
+        período da tabela e o array com o índice acumulado
+    """
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    first = datetime.strptime(rows[0]["date"], "%Y-%m-%d")
+    inflation = np.array([float(r["inflation"]) for r in rows])
+
+    # O primeiro elemento (100) é a base do índice e não corresponde a um mês
+    factors = np.concatenate(([100.], 1 + inflation / 1200))
+    return first.year * 12 + first.month, np.cumprod(factors)[1:]
+
+
+def load_index():
+    """ Carrega o índice acumulado da inflação, calculando-o na primeira
+        chamada. O resultado é salvo em `CACHE_PATH` junto com o `mtime` e o
+        hash do CSV de origem, e só é recalculado quando este for alterado.
+
+        :return: tupla com o identificador (ano * 12 + mês) do primeiro
+        período da tabela e o array com o índice acumulado
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    mtime = os.stat(HCPI_PATH).st_mtime_ns
+    sha256 = None
+    try:
+        with np.load(CACHE_PATH) as cache:
+            if cache["mtime"] == mtime:
+                _index = int(cache["min_date_id"]), cache["cum_inflation"]
+                return _index
+
+            # O mtime pode mudar sem que o conteúdo mude (ex.: git checkout)
+            sha256 = _file_sha256(HCPI_PATH)
+            if str(cache["sha256"]) == sha256:
+                _index = int(cache["min_date_id"]), cache["cum_inflation"]
+    except (OSError, KeyError, ValueError):
+        pass
+
+    if _index is None:
+        _index = _build_index(HCPI_PATH)
+
+    try:
+        np.savez(
+            CACHE_PATH,
+            min_date_id=_index[0],
+            cum_inflation=_index[1],
+            mtime=mtime,
+            sha256=sha256 or _file_sha256(HCPI_PATH)
+        )
+    except OSError:
+        # Sem permissão de escrita: o índice continua disponível em memória
+        pass
+
+    return _index
+
+
+def __getattr__(name: str):
+    # Mantém `MIN_DATE_ID` e `cum_inflation` acessíveis como atributos do
+    # módulo sem calculá-los na importação
+    if name == "MIN_DATE_ID":
+        return load_index()[0]
+    if name == "cum_inflation":
+        return load_index()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Limites de validade dos períodos, usados na versão vetorizada
+MIN_PERIOD = np.datetime64("1997-01-01")
+MAX_PERIOD = np.datetime64("2024-09-30")
+
+# Identificador (ano * 12 + mês) de janeiro de 1970, a época do datetime64
+EPOCH_DATE_ID = 1970 * 12 + 1
 
 
 def inflation_adj(value: float, period: datetime):
@@ -41,6 +128,46 @@ def inflation_adj(value: float, period: datetime):
     if period > datetime(2024, 9, 30):
         raise ValueError("O parâmetro 'period' deve representar uma data anterior a outubro de 2024")
 
+    min_date_id, cum_inflation = load_index()
     now = cum_inflation[-1]
-    then = cum_inflation[period.year * 12 + period.month - MIN_DATE_ID]
+    then = cum_inflation[period.year * 12 + period.month - min_date_id]
     return value * now / then
+
+
+def inflation_adj_many(values, periods) -> np.ndarray:
+    """ Versão vetorizada de `inflation_adj`, que ajusta de uma só vez vários
+        valores monetários para a inflação atual (setembro de 2024).
+
+        :param values: array do NumPy ou Series do pandas com os valores a
+        serem corrigidos
+        :param periods: array ou Series de datas (datetime64), de mesmo
+        tamanho que `values`, com o período em que cada valor foi considerado
+        :return: array com os valores corrigidos
+    """
+
+    values = np.asarray(values, dtype=float)
+    periods = np.asarray(periods, dtype="datetime64[ns]")
+
+    if values.shape != periods.shape:
+        raise ValueError("Os parâmetros 'values' e 'periods' devem ter o mesmo tamanho")
+
+    if (values < 0).any():
+        raise ValueError("O parâmetro 'values' não pode conter valores negativos")
+
+    if np.isnan(values).any():
+        raise ValueError("O parâmetro 'values' não pode conter NaN")
+
+    if np.isnat(periods).any():
+        raise ValueError("O parâmetro 'periods' não pode conter datas nulas")
+
+    if (periods < MIN_PERIOD).any():
+        raise ValueError("O parâmetro 'periods' deve conter apenas datas posteriores a 1996")
+
+    if (periods > MAX_PERIOD).any():
+        raise ValueError("O parâmetro 'periods' deve conter apenas datas anteriores a outubro de 2024")
+
+    # Meses desde janeiro de 1970, convertidos para índices de `cum_inflation`
+    min_date_id, cum_inflation = load_index()
+    months = periods.astype("datetime64[M]").astype(np.int64)
+    then = cum_inflation[months + EPOCH_DATE_ID - min_date_id]
+    return values * cum_inflation[-1] / then
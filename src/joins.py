@@ -0,0 +1,135 @@
+""" Módulo com junções entre tabelas que evitam materializar o produto
+    cartesiano das linhas de cada chave ou as linhas que seriam descartadas
+    pela junção """
+
+import numpy as np
+import pandas as pd
+
+
+# Fração máxima do trabalho da junção (linhas lidas das duas tabelas mais
+# linhas escritas no resultado) que pode restar após filtrar uma tabela para
+# que o filtro valha a pena; acima dela, a cópia custa mais do que economiza
+MAX_KEPT = 0.9
+
+
+def assign_windows(events: pd.DataFrame, windows: pd.DataFrame, by: str, on: str, start: str, end: str) -> pd.DataFrame:
+    """ Associa cada evento (ex.: uma participação em partida) à janela de
+        tempo (ex.: o período após uma transferência) em que ele ocorreu,
+        dentre as janelas de mesma chave `by`. Cada evento é associado a no
+        máximo uma janela, a última iniciada até a data dele, de modo que o
+        resultado nunca tem mais linhas que `events`.
+
+        :param events: DataFrame com as colunas `by` e `on`
+        :param windows: DataFrame com as colunas `by`, `start` e `end`
+        :param by: coluna que identifica a chave (ex.: `"player_id"`)
+        :param on: coluna com a data de cada evento, sem valores nulos
+        :param start: coluna com a data de início de cada janela
+        :param end: coluna com a data de fim de cada janela, inclusive
+        :return: DataFrame com as colunas de `events` e de `windows`, apenas
+        para os eventos que ocorreram dentro de alguma janela, ordenado por
+        `on`. Colunas repetidas recebem os sufixos `_x` e `_y`, como em
+        `pd.merge`
+    """
+    events = events.sort_values(on, kind="stable")
+    windows = windows.loc[windows[start].notna()].sort_values(start, kind="stable")
+
+    merged = pd.merge_asof(
+        events,
+        windows,
+        left_on=on,
+        right_on=start,
+        by=by,
+        direction="backward"
+    )
+    merged = merged.loc[merged[on] <= merged[end]]
+
+    # Eventos sem janela fazem o merge_asof converter as colunas inteiras de
+    # `windows` para float; após o filtro, os tipos originais são restaurados
+    dtypes = {c: t for c, t in windows.dtypes.items() if c in merged.columns and merged[c].dtype != t}
+    return merged.astype(dtypes)
+
+
+def encode_keys(left: pd.DataFrame, right: pd.DataFrame, on) -> tuple:
+    """ Codifica as chaves das duas tabelas como inteiros de 0 a `n - 1`,
+        iguais para chaves iguais. Chaves nulas também são codificadas, pois
+        o `pd.merge` as associa entre si.
+
+        :param left: DataFrame com as colunas `on`
+        :param right: DataFrame com as colunas `on`
+        :param on: coluna ou lista de colunas da chave
+        :return: tupla com os códigos das linhas de `left`, os das linhas de
+        `right` e a quantidade `n` de chaves distintas
+    """
+    on = [on] if isinstance(on, str) else list(on)
+
+    codes, size = np.zeros(len(left) + len(right), dtype=np.int64), 1
+    for column in on:
+        values = pd.concat([left[column], right[column]], ignore_index=True)
+        column_codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        codes = codes * len(uniques) + column_codes
+        if len(on) > 1:
+            # Recodifica a combinação, para que os códigos não cresçam a cada coluna
+            codes, uniques = pd.factorize(codes)
+        size = len(uniques)
+
+    return codes[:len(left)], codes[len(left):], size
+
+
+def estimate_rows(left_counts: np.ndarray, right_counts: np.ndarray) -> int:
+    """ Calcula a quantidade de linhas da junção interna de duas tabelas: a
+        soma, em cada chave, do produto das suas quantidades de linhas.
+
+        :param left_counts: quantidade de linhas de uma tabela por código de
+        chave (ex.: `np.bincount` dos códigos de `encode_keys`)
+        :param right_counts: quantidade de linhas da outra tabela por código
+        :return: quantidade de linhas
+    """
+    return int(np.dot(left_counts, right_counts))
+
+
+def semi_join(table: pd.DataFrame, other: pd.DataFrame, on) -> pd.DataFrame:
+    """ Mantém apenas as linhas de `table` cuja chave aparece em `other`,
+        sem juntar as colunas das duas tabelas.
+
+        :param table: DataFrame a ser filtrado
+        :param other: DataFrame com as chaves mantidas
+        :param on: coluna ou lista de colunas da chave
+        :return: DataFrame com as linhas mantidas, na ordem original
+    """
+    table_codes, other_codes, size = encode_keys(table, other, on)
+    return table.loc[np.bincount(other_codes, minlength=size)[table_codes] > 0]
+
+
+def merge(left: pd.DataFrame, right: pd.DataFrame, on, how: str = "inner", **kwargs) -> pd.DataFrame:
+    """ Junta duas tabelas como `pd.merge`, mas antes filtra cada tabela para
+        as chaves presentes na outra, quando o tipo de junção descartaria as
+        demais linhas. O resultado é igual ao de `pd.merge`, inclusive na
+        ordem das linhas e das colunas.
+
+        :param left: DataFrame da esquerda
+        :param right: DataFrame da direita
+        :param on: coluna ou lista de colunas da chave
+        :param how: tipo de junção (`"inner"`, `"left"`, `"right"` ou
+        `"outer"`)
+        :param kwargs: demais argumentos de `pd.merge`
+        :return: DataFrame com a junção
+    """
+    if how in ("inner", "left", "right"):
+        left_codes, right_codes, size = encode_keys(left, right, on)
+        left_counts = np.bincount(left_codes, minlength=size)
+        right_counts = np.bincount(right_codes, minlength=size)
+
+        # Cada tabela só é copiada se o filtro remover uma parte suficiente do
+        # trabalho da junção. Quando as chaves se repetem muito, o resultado
+        # domina esse trabalho e remover as linhas sem par economiza pouco
+        work = len(left) + len(right) + estimate_rows(left_counts, right_counts)
+        if how in ("inner", "right"):
+            keep = right_counts[left_codes] > 0
+            if len(left) - keep.sum() > (1 - MAX_KEPT) * work:
+                left = left.loc[keep]
+        if how in ("inner", "left"):
+            keep = left_counts[right_codes] > 0
+            if len(right) - keep.sum() > (1 - MAX_KEPT) * work:
+                right = right.loc[keep]
+
+    return pd.merge(left, right, how=how, on=on, **kwargs)
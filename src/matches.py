@@ -0,0 +1,44 @@
+""" Módulo com funções sobre os resultados das partidas """
+
+import pandas as pd
+import numpy as np
+
+
+# Resultados possíveis, em ordem crescente
+OUTCOMES = ["Derrota", "Empate", "Vitória"]
+
+
+def match_outcome(goals_for, goals_against) -> pd.Categorical:
+    """ Classifica o resultado de várias partidas de uma só vez, do ponto de
+        vista do time que marcou `goals_for` gols. Também serve para tabelas
+        com uma linha por time em cada partida, como `club_games.csv`
+        (`own_goals` e `opponent_goals`).
+
+        :param goals_for: array ou Series com os gols marcados pelo time
+        :param goals_against: array ou Series com os gols sofridos pelo time
+        :return: Categorical ordenado com os valores de `OUTCOMES`; partidas
+        sem placar resultam em valores nulos
+    """
+    diff = np.asarray(goals_for, dtype=float) - np.asarray(goals_against, dtype=float)
+
+    # O sinal da diferença de gols (-1, 0 ou 1) indica a posição em `OUTCOMES`
+    codes = np.sign(diff) + 1
+    codes[np.isnan(codes)] = -1
+    return pd.Categorical.from_codes(codes.astype(np.int8), categories=OUTCOMES, ordered=True)
+
+
+def game_outcomes(games: pd.DataFrame, perspective: str = "home") -> pd.Categorical:
+    """ Classifica o resultado das partidas de uma tabela como `games.csv`,
+        com uma linha por partida.
+
+        :param games: DataFrame com as colunas `home_club_goals` e
+        `away_club_goals`
+        :param perspective: `"home"` para o ponto de vista do time mandante
+        ou `"away"` para o do visitante
+        :return: Categorical ordenado com os valores de `OUTCOMES`
+    """
+    if perspective == "home":
+        return match_outcome(games["home_club_goals"], games["away_club_goals"])
+    if perspective == "away":
+        return match_outcome(games["away_club_goals"], games["home_club_goals"])
+    raise ValueError("O parâmetro 'perspective' deve ser 'home' ou 'away'")
@@ -0,0 +1,121 @@
+""" Módulo responsável por calcular o desempenho dos jogadores a partir das suas
+    estatísticas em cada partida (`appearances.csv`) """
+
+import pandas as pd
+import numpy as np
+
+
+# Pesos de cada estatística, segundo sites esportivos
+WEIGHTS = {
+    "yellow_cards": -1,
+    "red_cards": -3,
+    "goals": 8,
+    "assists": 5
+}
+
+
+def score(appearances: pd.DataFrame, weights: dict = WEIGHTS) -> np.ndarray:
+    """ Calcula a pontuação de cada participação de um jogador em uma partida,
+        dada pela soma ponderada das suas estatísticas.
+
+        :param appearances: DataFrame com uma coluna para cada estatística de
+        `weights`
+        :param weights: dicionário com o peso de cada estatística
+        :return: array com a pontuação de cada linha de `appearances`
+    """
+    total = np.zeros(len(appearances))
+    for column, weight in weights.items():
+        total += weight * appearances[column].to_numpy(dtype=float)
+    return total
+
+
+def score_sums(appearances: pd.DataFrame, by: list, weights: dict = WEIGHTS, first: list = None) -> pd.DataFrame:
+    """ Soma as pontuações das participações de cada grupo (ex.: de cada
+        jogador) e conta as partidas, em uma única agregação.
+
+        :param appearances: DataFrame com as colunas de `by` e uma coluna para
+        cada estatística de `weights`
+        :param by: colunas que identificam os grupos
+        :param weights: dicionário com o peso de cada estatística
+        :param first: colunas constantes dentro de cada grupo (ex.: atributos
+        de uma transferência), das quais é mantido o primeiro valor
+        :return: DataFrame indexado por `by`, com as colunas `score` (soma das
+        pontuações), `games` (quantidade de partidas) e as de `first`
+    """
+    first = [] if first is None else first
+    scores = appearances[by + first].assign(score=score(appearances, weights))
+    return scores.groupby(by, observed=True).agg(
+        score=("score", "sum"),
+        games=("score", "count"),
+        **{column: (column, "first") for column in first}
+    )
+
+
+def merge_score_sums(partials: list) -> pd.DataFrame:
+    """ Combina somas parciais calculadas por `score_sums` (ex.: uma por bloco
+        de linhas de `appearances.csv`) em um único resultado.
+
+        :param partials: lista de DataFrames retornados por `score_sums`, com
+        os mesmos grupos e colunas
+        :return: DataFrame no mesmo formato de `score_sums`
+    """
+    merged = pd.concat(partials)
+    aggs = {column: "sum" if column in ("score", "games") else "first" for column in merged.columns}
+    return merged.groupby(level=list(range(merged.index.nlevels))).agg(aggs)
+
+
+def score_sums_chunked(chunks, by: list, weights: dict = WEIGHTS, first: list = None, prepare=None) -> pd.DataFrame:
+    """ Versão de `score_sums` que processa `appearances` em blocos,
+        atualizando as somas de cada grupo a cada bloco. O uso de memória fica
+        limitado pelo tamanho dos blocos e pela quantidade de grupos, e não
+        pela quantidade de participações.
+
+        :param chunks: iterável de DataFrames (ex.: o retornado por
+        `pd.read_csv` com `chunksize`)
+        :param by: colunas que identificam os grupos
+        :param weights: dicionário com o peso de cada estatística
+        :param first: colunas constantes dentro de cada grupo, das quais é
+        mantido o primeiro valor
+        :param prepare: função opcional aplicada a cada bloco antes da
+        agregação (ex.: limpeza ou junção com outras tabelas)
+        :return: DataFrame no mesmo formato de `score_sums`
+    """
+    first = [] if first is None else first
+    total = None
+    for chunk in chunks:
+        if prepare is not None:
+            chunk = prepare(chunk)
+
+        partial = score_sums(chunk, by, weights, first)
+        total = partial if total is None else merge_score_sums([total, partial])
+
+    if total is None:
+        return score_sums(pd.DataFrame(columns=by + first + list(weights)), by, weights, first)
+    return total
+
+
+def performance_from_sums(sums: pd.DataFrame, scale: float = 100) -> pd.Series:
+    """ Calcula o desempenho de cada grupo a partir das somas calculadas por
+        `score_sums`.
+
+        :param sums: DataFrame com as colunas `score` e `games`
+        :param scale: fator multiplicado à pontuação média
+        :return: Series com o desempenho de cada grupo, arredondado para
+        quatro casas decimais
+    """
+    return (sums["score"] * scale / sums["games"]).round(4)
+
+
+def performance(appearances: pd.DataFrame, by: list, weights: dict = WEIGHTS, scale: float = 100) -> pd.Series:
+    """ Calcula o desempenho de cada grupo, dado pela soma das pontuações
+        multiplicada por `scale` e dividida pelo número de partidas.
+
+        :param appearances: DataFrame com as colunas de `by` e uma coluna para
+        cada estatística de `weights`
+        :param by: colunas que identificam os grupos
+        :param weights: dicionário com o peso de cada estatística
+        :param scale: fator multiplicado à pontuação média
+        :return: Series indexada por `by` com o desempenho de cada grupo,
+        arredondado para quatro casas decimais
+    """
+    return performance_from_sums(score_sums(appearances, by, weights), scale)
@@ -0,0 +1,44 @@
+""" Módulo com um índice dos atributos dos jogadores, indexado pelo ID """
+
+import pandas as pd
+import numpy as np
+
+
+def player_index(players: pd.DataFrame) -> pd.DataFrame:
+    """ Cria um índice dos jogadores a partir da tabela `players.csv`, com as
+        datas de nascimento convertidas uma única vez para datetime64. As
+        consultas por ID passam a usar a tabela hash do índice do pandas, ao
+        invés de percorrer a tabela inteira.
+
+        :param players: DataFrame com as colunas `player_id` e `date_of_birth`
+        :return: DataFrame indexado (e ordenado) por `player_id`; se um ID
+        aparecer mais de uma vez, apenas a primeira ocorrência é mantida
+    """
+    index = players.drop_duplicates("player_id").set_index("player_id").sort_index()
+    index["date_of_birth"] = pd.to_datetime(index["date_of_birth"], format="ISO8601", errors="coerce")
+    return index
+
+
+def ages_at(index: pd.DataFrame, player_ids, dates) -> np.ndarray:
+    """ Calcula, de forma vetorizada, a idade de cada jogador na data
+        correspondente.
+
+        :param index: índice criado por `player_index`
+        :param player_ids: array ou Series com os IDs dos jogadores
+        :param dates: array ou Series de datas (datetime64), de mesmo tamanho
+        que `player_ids`
+        :return: array com as idades, em anos; jogadores não encontrados ou
+        sem data de nascimento resultam em NaN
+    """
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    pos = index.index.get_indexer(np.asarray(player_ids))
+
+    found = pos >= 0
+    births = np.full(len(pos), np.datetime64("NaT"), dtype="datetime64[ns]")
+    births[found] = index["date_of_birth"].to_numpy(dtype="datetime64[ns]")[pos[found]]
+
+    # Considera apenas os dias, como em `datetime.date`
+    days = dates.astype("datetime64[D]") - births.astype("datetime64[D]")
+    ages = days.astype(np.int64) / 365
+    ages[np.isnat(days)] = np.nan
+    return ages
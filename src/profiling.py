@@ -0,0 +1,185 @@
+""" Módulo responsável por medir as etapas das análises (carregamento,
+    limpeza, junções, agregações e gráficos): tempo de execução, aumento do
+    pico de memória do processo e quantidade de linhas de entrada e de saída
+    de cada etapa.
+    Opcionalmente, as etapas também são perfiladas pelo `cProfile` e as
+    alocações de memória rastreadas pelo `tracemalloc` """
+
+import contextlib
+import cProfile
+import pstats
+import sys
+import time
+import tracemalloc
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Registros das etapas, na ordem em que começaram
+RECORDS = []
+
+# Profiler compartilhado pelas etapas, criado por `enable`
+_profiler = None
+
+# Quantidade de etapas em execução, umas dentro das outras
+_depth = 0
+
+# Pico da memória rastreada pelo `tracemalloc` em cada etapa em execução, da
+# mais externa para a mais interna. O pico do `tracemalloc` é zerado ao
+# iniciar cada etapa; antes disso, ele é incorporado ao da etapa externa
+_traced_peaks = []
+
+
+class Stage:
+    """ Registro de uma etapa. Os atributos `rows_in` e `rows_out` podem ser
+        preenchidos dentro do bloco `with` de `stage`. """
+
+    def __init__(self, name: str, rows_in: int = None, depth: int = 0):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.depth = depth
+        self.seconds = None
+        self.rss_growth_mb = None
+        self.peak_traced_mb = None
+
+
+def rows(data) -> int:
+    """ Conta as linhas de um resultado intermediário.
+
+        :param data: DataFrame, Series, array ou tupla (da qual é usado o
+        primeiro elemento)
+        :return: quantidade de linhas, ou `None` se `data` não tiver tamanho
+    """
+    if isinstance(data, tuple):
+        data = data[0] if data else None
+    return len(data) if hasattr(data, "__len__") else None
+
+
+def _peak_rss_mb() -> float:
+    """ Maior memória residente (RSS) usada pelo processo desde o seu início,
+        em megabytes, ou `None` nos sistemas sem o módulo `resource`. """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # O Linux informa o valor em kilobytes; o macOS, em bytes
+    return peak / 1024 ** (2 if sys.platform == "darwin" else 1)
+
+
+@contextlib.contextmanager
+def stage(name: str, rows_in: int = None):
+    """ Mede uma etapa de uma análise, registrando-a em `RECORDS`. Exemplo:
+
+        with stage("hyp_buybacks.merge", rows_in=len(transfers)) as s:
+            buybacks = pd.merge(sold, bought, on="player_id")
+            s.rows_out = len(buybacks)
+
+        :param name: nome da etapa, no formato `<módulo>.<etapa>`
+        :param rows_in: quantidade de linhas de entrada da etapa
+        :return: gerenciador de contexto que fornece o `Stage` da etapa
+    """
+    global _depth
+    record = Stage(name, rows_in, _depth)
+    RECORDS.append(record)
+
+    if _profiler is not None and _depth == 0:
+        _profiler.enable()
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        if _traced_peaks:
+            _traced_peaks[-1] = max(_traced_peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    _traced_peaks.append(0)
+
+    rss_start = _peak_rss_mb()
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+        _depth -= 1
+
+        peak = _traced_peaks.pop()
+        if tracing and tracemalloc.is_tracing():
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            record.peak_traced_mb = peak / 1024 ** 2
+            if _traced_peaks:
+                _traced_peaks[-1] = max(_traced_peaks[-1], peak)
+        if _profiler is not None and _depth == 0:
+            _profiler.disable()
+
+        # O `ru_maxrss` só aumenta; o quanto ele aumentou durante a etapa
+        # indica a memória que ela usou além do pico das etapas anteriores
+        if rss_start is not None:
+            record.rss_growth_mb = _peak_rss_mb() - rss_start
+
+
+def enable(profile: bool = False, trace_memory: bool = False):
+    """ Ativa as medições opcionais das etapas seguintes.
+
+        :param profile: se `True`, as etapas são perfiladas pelo `cProfile`
+        (ver `dump_profile`)
+        :param trace_memory: se `True`, o pico de memória alocada de cada
+        etapa é medido pelo `tracemalloc`, que deixa a execução mais lenta
+    """
+    global _profiler
+    if profile and _profiler is None:
+        _profiler = cProfile.Profile()
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def reset():
+    """ Descarta os registros das etapas e desativa as medições opcionais. """
+    global _profiler
+    RECORDS.clear()
+    _traced_peaks.clear()
+    _profiler = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def dump_profile(path: str):
+    """ Salva as estatísticas do `cProfile`, no formato lido por `pstats`.
+
+        :param path: caminho do arquivo
+    """
+    if _profiler is None:
+        raise ValueError("O cProfile não foi ativado; use enable(profile=True)")
+    pstats.Stats(_profiler).dump_stats(path)
+
+
+def summary(records: list = None) -> pd.DataFrame:
+    """ Monta uma tabela com as medições das etapas.
+
+        :param records: registros das etapas; por padrão, os de `RECORDS`
+        :return: DataFrame com uma linha por etapa e as colunas `stage`,
+        `seconds`, `rss_growth_mb` (aumento do pico de memória residente do
+        processo durante a etapa), `peak_traced_mb` (pico da memória
+        rastreada pelo `tracemalloc`), `rows_in` e `rows_out`. Etapas
+        internas a outras têm o nome indentado
+    """
+    records = RECORDS if records is None else records
+    return pd.DataFrame({
+        "stage": ["  " * r.depth + r.name for r in records],
+        "seconds": [r.seconds for r in records],
+        "rss_growth_mb": [r.rss_growth_mb for r in records],
+        "peak_traced_mb": [r.peak_traced_mb for r in records],
+        "rows_in": pd.array([r.rows_in for r in records], dtype="Int64"),
+        "rows_out": pd.array([r.rows_out for r in records], dtype="Int64")
+    }, columns=["stage", "seconds", "rss_growth_mb", "peak_traced_mb", "rows_in", "rows_out"])
+
+
+def print_summary(records: list = None):
+    """ Imprime a tabela de `summary`, omitindo as colunas sem medições.
+
+        :param records: registros das etapas; por padrão, os de `RECORDS`
+    """
+    table = summary(records).dropna(axis=1, how="all")
+    print(table.to_string(index=False, float_format=lambda x: f"{x:.3f}", na_rep=""))
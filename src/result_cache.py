@@ -0,0 +1,213 @@
+""" Módulo responsável por guardar em disco os resultados das análises, para
+    que execuções seguintes com os mesmos dados e o mesmo código não precisem
+    recalculá-los. Cada resultado é identificado por um hash dos arquivos de
+    entrada (tamanho e data de modificação), do código da função que o
+    calcula (e das funções e módulos locais que ela usa) e dos seus
+    parâmetros. O tamanho total do cache é limitado, e os resultados usados há
+    mais tempo são descartados primeiro """
+
+import hashlib
+import inspect
+import os
+import pickle
+import types
+import pandas as pd
+import data_loader
+
+
+# Tamanho máximo do cache, em bytes
+MAX_BYTES = 512 * 1024 ** 2
+
+# Diretório dos módulos do projeto, cujo código entra no hash dos resultados
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def cache_dir() -> str:
+    """ Diretório dos resultados, dentro do cache de `data_loader`. """
+    return os.path.join(data_loader.CACHE_DIR, "results")
+
+
+def _is_local(obj) -> bool:
+    """ Verifica se um módulo, função ou classe pertence ao projeto. """
+    module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+    path = getattr(module, "__file__", None)
+    return path is not None and os.path.dirname(os.path.abspath(path)) == SOURCE_DIR
+
+
+def _names(code: types.CodeType):
+    """ Nomes globais usados por um código, inclusive por funções internas
+        a ele (ex.: lambdas). """
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _names(const)
+
+
+def code_digest(function) -> str:
+    """ Calcula um hash do código de uma função e, recursivamente, das
+        funções, classes e constantes do projeto que ela referencia. Módulos
+        do projeto usados como `modulo.funcao` entram por inteiro. Assim,
+        alterações em outras funções do mesmo módulo (ex.: nos gráficos) não
+        alteram o hash.
+
+        :param function: função do projeto
+        :return: hash hexadecimal
+    """
+    digest = hashlib.sha256()
+    seen = set()
+    stack = [function]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        if inspect.ismodule(obj):
+            with open(obj.__file__, "rb") as file:
+                digest.update(file.read())
+            continue
+
+        digest.update(inspect.getsource(obj).encode())
+        if not inspect.isfunction(obj):
+            continue
+
+        # Valores padrão dos parâmetros (ex.: `weights=WEIGHTS`)
+        digest.update(repr((obj.__defaults__, obj.__kwdefaults__)).encode())
+
+        for name in sorted(set(_names(obj.__code__))):
+            value = obj.__globals__.get(name)
+            if inspect.ismodule(value) or inspect.isfunction(value) or inspect.isclass(value):
+                if _is_local(value):
+                    stack.append(value)
+            elif isinstance(value, (int, float, str, bytes, tuple, list, dict)):
+                digest.update(f"{name}={value!r}".encode())
+
+    return digest.hexdigest()
+
+
+def fingerprint(paths: list) -> list:
+    """ Identifica o conteúdo de arquivos pelo caminho, tamanho e data de
+        modificação, sem lê-los.
+
+        :param paths: caminhos dos arquivos
+        :return: lista de tuplas (caminho, tamanho, data de modificação em ns)
+    """
+    fingerprints = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprints.append((os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+    return fingerprints
+
+
+def cache_key(function, files: list = (), params=None) -> str:
+    """ Calcula a chave do resultado de uma função.
+
+        :param function: função que calcula o resultado
+        :param files: arquivos de entrada da função
+        :param params: parâmetros da função, comparados pela sua
+        representação (`repr`)
+        :return: chave hexadecimal
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{function.__module__}.{function.__qualname__}".encode())
+    digest.update(code_digest(function).encode())
+    digest.update(repr(fingerprint(files)).encode())
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
+def _path(key: str, value=None) -> str:
+    """ Caminho do arquivo de um resultado. DataFrames são salvos em Parquet,
+        quando o pyarrow está instalado; os demais resultados, com pickle.
+        Sem `value`, procura o arquivo já existente da chave. """
+    directory = cache_dir()
+    if value is None:
+        for extension in ("parquet", "pkl"):
+            path = os.path.join(directory, f"{key}.{extension}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    extension = "parquet" if isinstance(value, pd.DataFrame) and data_loader._has_pyarrow() else "pkl"
+    return os.path.join(directory, f"{key}.{extension}")
+
+
+def get(key: str) -> tuple:
+    """ Busca um resultado no cache.
+
+        :param key: chave calculada por `cache_key`
+        :return: tupla (`True`, resultado) se ele estiver no cache, ou
+        (`False`, `None`) caso contrário
+    """
+    path = _path(key)
+    if path is None:
+        return False, None
+
+    try:
+        if path.endswith(".parquet"):
+            value = pd.read_parquet(path)
+        else:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+    except Exception:
+        # Arquivos corrompidos ou de versões incompatíveis são recalculados
+        os.remove(path)
+        return False, None
+
+    # A data de modificação marca o último uso, usada no descarte
+    os.utime(path)
+    return True, value
+
+
+def put(key: str, value, max_bytes: int = MAX_BYTES):
+    """ Guarda um resultado no cache e descarta os resultados usados há mais
+        tempo, caso o cache passe do tamanho máximo.
+
+        :param key: chave calculada por `cache_key`
+        :param value: resultado (DataFrame ou qualquer objeto serializável com
+        pickle)
+        :param max_bytes: tamanho máximo do cache, em bytes
+    """
+    path = _path(key, value)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Escreve em um arquivo temporário e o renomeia, para que leituras
+    # simultâneas nunca encontrem um arquivo incompleto
+    temporary = f"{path}.{os.getpid()}.tmp"
+    if path.endswith(".parquet"):
+        value.to_parquet(temporary)
+    else:
+        with open(temporary, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+    evict(max_bytes)
+
+
+def evict(max_bytes: int = MAX_BYTES):
+    """ Descarta os resultados usados há mais tempo até que o cache tenha no
+        máximo `max_bytes` bytes.
+
+        :param max_bytes: tamanho máximo do cache, em bytes
+    """
+    directory = cache_dir()
+    if not os.path.isdir(directory):
+        return
+
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+def clear():
+    """ Descarta todos os resultados do cache. """
+    evict(0)
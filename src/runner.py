@@ -0,0 +1,256 @@
+""" Módulo responsável por executar as análises das hipóteses pela linha de
+    comando, em lote e, opcionalmente, sem gráficos. Exemplo:
+
+        PYTHONPATH=src python -m runner run hyp_buybacks hyp_performance --no-plot -j 2
+
+    Sem nomes de hipóteses, todas são executadas. Cada tabela é carregada uma
+    única vez, e as hipóteses podem ser calculadas em paralelo (`-j`).
+"""
+
+import argparse
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import data_loader
+import profiling
+import result_cache
+
+
+# Módulos das hipóteses, na ordem do README
+HYPOTHESES = [
+    "hyp_performance_abroad",
+    "hyp_cost_benefit",
+    "hyp_cards_position",
+    "hyp_buybacks",
+    "hyp_performance",
+    "hyp_birth_month"
+]
+
+
+# Tabelas carregadas uma única vez pelo processo principal. Os processos das
+# hipóteses, criados com fork, herdam essas tabelas sem cópia nem pickle
+_SHARED = {}
+
+
+def required_tables(names: list, chunksize: int = None) -> dict:
+    """ Reúne as tabelas e colunas usadas por um conjunto de hipóteses, para
+        que cada tabela seja carregada uma única vez.
+
+        :param names: nomes dos módulos das hipóteses
+        :param chunksize: se informado, as tabelas de
+        `data_loader.CHUNKED_TABLES` são omitidas, pois cada hipótese as lê em
+        blocos
+        :return: dicionário com o nome de cada tabela e a união das colunas
+        usadas (`None` se alguma hipótese usa todas)
+    """
+    required = {}
+    for name in names:
+        for table, columns in importlib.import_module(name).TABLES.items():
+            if chunksize and table in data_loader.CHUNKED_TABLES:
+                continue
+            if table not in required:
+                required[table] = None if columns is None else list(columns)
+            elif required[table] is not None:
+                required[table] = None if columns is None else \
+                    required[table] + [c for c in columns if c not in required[table]]
+    return required
+
+
+def _columns(df, columns: list = None):
+    """ Seleciona colunas de uma tabela sem copiar os dados: o DataFrame
+        retornado referencia as colunas de `df` (ao contrário de
+        `df[columns]`, que as copia), de modo que as hipóteses que usam a
+        mesma tabela compartilham a memória dela.
+
+        :param df: DataFrame compartilhado
+        :param columns: colunas selecionadas; por padrão, todas
+        :return: DataFrame com as colunas
+    """
+    if columns is None:
+        return df
+    return pd.DataFrame({c: df[c] for c in columns}, copy=False)
+
+
+def _tables(module, chunksize: int = None) -> dict:
+    """ Monta o dicionário de tabelas de uma hipótese, a partir das tabelas
+        compartilhadas ou, se não houver (processos criados sem fork), do
+        cache de `data_loader`.
+
+        :param module: módulo da hipótese
+        :param chunksize: quantidade de linhas dos blocos das tabelas grandes
+        :return: dicionário com as tabelas de `module.TABLES`
+    """
+    tables = {}
+    for table, columns in module.TABLES.items():
+        if chunksize and table in data_loader.CHUNKED_TABLES:
+            tables[table] = data_loader.read_csv(table, columns, chunksize=chunksize)
+        elif table in _SHARED:
+            tables[table] = _columns(_SHARED[table], columns)
+        else:
+            tables[table] = data_loader.load(table, columns)
+    return tables
+
+
+def _compute(name: str, chunksize: int = None, profile_path: str = None) -> tuple:
+    """ Calcula o resultado de uma hipótese, medindo as suas etapas.
+
+        :param name: nome do módulo da hipótese
+        :param chunksize: quantidade de linhas dos blocos das tabelas grandes
+        :param profile_path: se informado, as estatísticas do `cProfile` do
+        processo são salvas nesse arquivo
+        :return: tupla com o resultado de `compute` e os registros das etapas
+        medidas durante o cálculo
+    """
+    first = len(profiling.RECORDS)
+    module = importlib.import_module(name)
+    with profiling.stage(f"{name}.compute") as s:
+        result = module.compute(_tables(module, chunksize))
+        s.rows_out = profiling.rows(result)
+
+    if profile_path is not None:
+        profiling.dump_profile(profile_path)
+    return result, profiling.RECORDS[first:]
+
+
+def result_key(module) -> str:
+    """ Calcula a chave do resultado de uma hipótese no cache de resultados,
+        a partir dos CSVs das suas tabelas, dos demais arquivos lidos pela
+        hipótese (`INPUT_FILES`, opcional), do código de `compute` e das
+        colunas e tipos usados.
+
+        :param module: módulo da hipótese
+        :return: chave do `result_cache`
+    """
+    files = [data_loader.source_path(table) for table in module.TABLES]
+    files += getattr(module, "INPUT_FILES", [])
+    schemas = {table: data_loader.SCHEMAS[table] for table in module.TABLES}
+    return result_cache.cache_key(module.compute, files, {"tables": module.TABLES, "schemas": schemas})
+
+
+def _mp_context():
+    """ Escolhe como criar os processos: com fork, as tabelas compartilhadas
+        são herdadas pelos processos; nos sistemas sem fork, cada processo lê
+        do cache colunar apenas as colunas de que precisa.
+
+        :return: contexto do `multiprocessing`
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def run(names: list = None, plot: bool = True, chunksize: int = None, jobs: int = 1,
+        profile_path: str = None, trace_memory: bool = False, cache: bool = True) -> dict:
+    """ Executa as análises de algumas hipóteses: busca o resultado de cada
+        uma no cache de resultados; para as que não estão nele, carrega uma
+        única vez as tabelas usadas (`TABLES`) e calcula o resultado
+        (`compute`), possivelmente em paralelo. Por fim, exibe os resultados
+        (`present`), na ordem informada, e imprime a tabela de etapas de
+        `profiling`, com o tempo, a memória e as linhas de cada etapa.
+
+        :param names: nomes dos módulos das hipóteses; por padrão, todos os de
+        `HYPOTHESES`
+        :param plot: se `False`, os resultados são apenas impressos e salvos,
+        sem gráficos
+        :param chunksize: se informado, as tabelas grandes são processadas em
+        blocos com essa quantidade de linhas (ver `data_loader.load_tables`)
+        :param jobs: quantidade de processos usados para calcular as
+        hipóteses; com 1, tudo é calculado no processo atual
+        :param profile_path: se informado, as etapas são perfiladas pelo
+        `cProfile` e as estatísticas salvas nesse arquivo. Com mais de um
+        processo, cada hipótese salva as suas em `<profile_path>.<hipótese>`
+        :param trace_memory: se `True`, o pico de memória alocada em cada
+        etapa é medido pelo `tracemalloc`
+        :param cache: se `False`, todos os resultados são recalculados, sem
+        consultar nem atualizar o cache de resultados
+        :return: dicionário com o resultado de `compute` de cada hipótese
+    """
+    names = HYPOTHESES if not names else names
+    unknown = [name for name in names if name not in HYPOTHESES]
+    if unknown:
+        raise ValueError(f"Hipóteses desconhecidas: {unknown}")
+
+    profiling.reset()
+    profiling.enable(profile=profile_path is not None, trace_memory=trace_memory)
+
+    results = {}
+    keys = {}
+    if cache:
+        for name in names:
+            keys[name] = result_key(importlib.import_module(name))
+            with profiling.stage(f"{name}.cache") as s:
+                hit, value = result_cache.get(keys[name])
+                s.rows_out = profiling.rows(value) if hit else 0
+            if hit:
+                results[name] = value
+
+    missing = [name for name in names if name not in results]
+    if missing:
+        with profiling.stage("runner.load") as s:
+            _SHARED.update(data_loader.load_tables(required_tables(missing, chunksize)))
+            s.rows_out = sum(len(df) for df in _SHARED.values())
+
+        try:
+            if jobs > 1:
+                with ProcessPoolExecutor(min(jobs, len(missing)), mp_context=_mp_context()) as pool:
+                    futures = {
+                        name: pool.submit(_compute, name, chunksize, profile_path and f"{profile_path}.{name}")
+                        for name in missing
+                    }
+                    computed = {name: future.result() for name, future in futures.items()}
+
+                # As etapas medidas nos outros processos são trazidas para este
+                for name in missing:
+                    profiling.RECORDS.extend(computed[name][1])
+            else:
+                computed = {name: _compute(name, chunksize) for name in missing}
+        finally:
+            _SHARED.clear()
+
+        for name in missing:
+            results[name] = computed[name][0]
+            if cache:
+                result_cache.put(keys[name], results[name])
+
+    for name in names:
+        print(f"== {name} ==")
+        with profiling.stage(f"{name}.present"):
+            importlib.import_module(name).present(results[name], plot)
+
+    if profile_path is not None and jobs <= 1:
+        profiling.dump_profile(profile_path)
+
+    print("== Etapas ==")
+    profiling.print_summary()
+    return results
+
+
+def main(argv: list = None):
+    """ Ponto de entrada da linha de comando.
+
+        :param argv: argumentos da linha de comando; por padrão, os do processo
+    """
+    parser = argparse.ArgumentParser(prog="runner", description="Executa as análises das hipóteses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="executa as hipóteses informadas (por padrão, todas)")
+    run_parser.add_argument("names", nargs="*", metavar="hyp", help=f"módulo da hipótese ({', '.join(HYPOTHESES)})")
+    run_parser.add_argument("--no-plot", dest="plot", action="store_false", help="não exibe os gráficos")
+    run_parser.add_argument("--chunksize", type=int, default=None, help="processa as tabelas grandes em blocos de linhas")
+    run_parser.add_argument("-j", "--jobs", type=int, default=1, help="quantidade de processos usados para calcular as hipóteses")
+    run_parser.add_argument("--profile", metavar="PATH", default=None, help="salva as estatísticas do cProfile das etapas em PATH")
+    run_parser.add_argument("--trace-memory", action="store_true", help="mede a memória alocada em cada etapa com o tracemalloc")
+    run_parser.add_argument("--no-cache", dest="cache", action="store_false", help="recalcula todos os resultados, ignorando o cache")
+
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in HYPOTHESES]
+    if unknown:
+        parser.error(f"hipóteses desconhecidas: {unknown}")
+
+    if args.command == "run":
+        run(args.names, args.plot, args.chunksize, args.jobs, args.profile, args.trace_memory, args.cache)
+
+
+if __name__ == "__main__":
+    main()
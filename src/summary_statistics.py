@@ -3,57 +3,611 @@
 import pandas as pd
 import numpy as np
 import math
+from concurrent.futures import ProcessPoolExecutor
 
 
-def chi2(df: pd.DataFrame):
+# Quantidade de tabelas sorteadas de uma vez por `association_test`. Cada
+# lote tem a sua própria semente, de modo que o resultado não depende da
+# quantidade de processos
+RESAMPLE_BATCH = 1000
+
+
+def _sparse_counts(table):
+    """ Converte uma tabela de contingência para o formato esparso (COO),
+        mantendo apenas as células com frequência diferente de zero.
+
+        :param table: um DataFrame, um array 2-D do NumPy ou uma matriz
+        esparsa no formato COO (com os atributos `row`, `col`, `data` e
+        `shape`, como as do `scipy.sparse`), onde todos os dados representam
+        frequências absolutas das linhas com as colunas
+        :return: tupla com os arrays de linhas, colunas e frequências das
+        células não vazias e o formato da tabela
+    """
+    if all(hasattr(table, attr) for attr in ("row", "col", "data", "shape")):
+        shape = tuple(table.shape)
+        counts = np.asarray(table.data)
+        if not np.issubdtype(counts.dtype, np.number):
+            raise ValueError("Todos os dados devem ser numéricos (numpy.number)")
+
+        # Soma as entradas repetidas de uma mesma célula
+        cells, inverse = np.unique(
+            np.asarray(table.row, dtype=np.int64) * shape[1] + np.asarray(table.col),
+            return_inverse=True
+        )
+        counts = np.bincount(inverse, weights=counts, minlength=len(cells))
+        rows, cols = np.divmod(cells, shape[1])
+    else:
+        if isinstance(table, pd.DataFrame):
+            numeric = [pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in table.dtypes]
+            if not all(numeric):
+                raise ValueError("Todos os dados devem ser numéricos (numpy.number)")
+            table = table.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            table = np.asarray(table)
+            if not np.issubdtype(table.dtype, np.number):
+                raise ValueError("Todos os dados devem ser numéricos (numpy.number)")
+
+        if table.ndim != 2:
+            raise ValueError("A tabela deve ter duas dimensões")
+
+        shape = table.shape
+        # Células sem valor (NaN), como as geradas por `pivot_table`, são
+        # consideradas vazias
+        rows, cols = np.nonzero(np.nan_to_num(table))
+        counts = table[rows, cols]
+
+    if shape[0] < 2 or shape[1] < 2:
+        raise ValueError("O DataFrame deve ter pelo menos duas linhas e duas colunas")
+
+    return rows, cols, counts.astype(float), shape
+
+
+def _chi2_total(table):
+    """ Calcula o Qui^2 e a soma das frequências de uma tabela de
+        contingência, percorrendo apenas as células não vazias.
+
+        :param table: tabela de contingência, em qualquer formato aceito por
+        `_sparse_counts`
+        :return: tupla com o Qui^2, a soma das frequências e o formato da
+        tabela
+    """
+    rows, cols, counts, shape = _sparse_counts(table)
+
+    sum_y = np.bincount(rows, weights=counts, minlength=shape[0])
+    sum_x = np.bincount(cols, weights=counts, minlength=shape[1])
+    total = counts.sum()
+    exp = sum_y[rows] * sum_x[cols] / total
+    result = np.sum(np.square(counts - exp) / exp)
+
+    # Cada célula vazia contribui com `(0-e)^2 / e = e` e a soma dos valores
+    # esperados de todas as células é o total; logo, as células vazias
+    # contribuem juntas com o total menos os esperados das não vazias
+    if len(counts) < shape[0] * shape[1]:
+        result += max(total - exp.sum(), 0.)
+
+    return result, total, shape
+
+
+def chi2(df) -> float:
     """ Calcula a medida Qui^2 dos dados contidos no DataFrame. O Qui^2
         corresponde à soma da seguinte equação aplicada a cada dado no conjunto:
         `(o-e)^2 / e`, onde `o` é o valor observado e `e`, o esperado para
         a linha e a coluna consideradas.
         
         :param df: um DataFrame onde todos os dados representam frequências
-        absolutas das linhas com as colunas
+        absolutas das linhas com as colunas; também são aceitos arrays 2-D do
+        NumPy e matrizes esparsas no formato COO (ex.: `scipy.sparse`)
         :return: o Qui^2 do DataFrame
     """
-
-    if df.shape[0] < 2 or df.shape[1] < 2:
-        raise ValueError("O DataFrame deve ter pelo menos duas linhas e duas colunas")
-
-    if not df.dtypes.apply(lambda dtype: np.issubdtype(dtype, np.number)).all():
-        raise ValueError("Todos os dados devem ser numéricos (numpy.number)")
-    
-    sum_y = df.sum(axis=1)
-    sum_x = df.sum(axis=0)
-    total = sum_x.sum()
-    exp = (np.array(sum_y).reshape(-1, 1) @ np.array(sum_x).reshape(1, -1)) / total
-    return (np.square(df - exp) / exp).sum().sum()
+    return _chi2_total(df)[0]
 
 
-def cramer_v(df: pd.DataFrame):
+def cramer_v(df) -> float:
     """ Calcula o V de Cramer dos dados contidos no DataFrame,
         que indica o quão associadas estão as variáveis que representam as
         colunas e as linhas da tabela, retornando um valor entre 0 (nenhuma
         associação) e 1 (associação máxima).
         
         :param df: um DataFrame onde todos os dados representam frequências
-        absolutas das linhas com as colunas
+        absolutas das linhas com as colunas; também são aceitos arrays 2-D do
+        NumPy e matrizes esparsas no formato COO (ex.: `scipy.sparse`)
         :return: o V de Cramer das variáveis
     """
-    k = min(df.shape) - 1
-    df_chi2 = chi2(df)
-    total = df.sum().sum()
+    df_chi2, total, shape = _chi2_total(df)
+    k = min(shape) - 1
     return math.sqrt(df_chi2 / total / k)
 
 
-def contingency_coeff(df: pd.DataFrame):
+def contingency_coeff(df) -> float:
     """ Calcula o coeficiente de contingência dos dados contidos no DataFrame,
         que indica o quão associadas estão as variáveis que representam as
         colunas e as linhas da tabela.
 
         :param df: um DataFrame onde todos os dados representam frequências
-        absolutas das linhas com as colunas
+        absolutas das linhas com as colunas; também são aceitos arrays 2-D do
+        NumPy e matrizes esparsas no formato COO (ex.: `scipy.sparse`)
         :return: o coeficiente de contingência das variáveis
     """
-    df_chi2 = chi2(df)
-    total = df.sum().sum()
+    df_chi2, total, _ = _chi2_total(df)
     return math.sqrt(df_chi2 / (df_chi2 + total))
+
+
+def cramer_v_from_columns(a, b) -> float:
+    """ Calcula o V de Cramer entre duas variáveis categóricas diretamente a
+        partir dos dados brutos, sem montar tabelas intermediárias: os pares
+        de valores são contados com um único `np.bincount` sobre os códigos
+        das duas colunas. Pares com algum valor nulo são desconsiderados.
+
+        :param a: array ou Series com os valores da primeira variável
+        :param b: array ou Series com os valores da segunda variável, de mesmo
+        tamanho que `a`
+        :return: o V de Cramer das variáveis
+    """
+    if len(a) != len(b):
+        raise ValueError("Os parâmetros 'a' e 'b' devem ter o mesmo tamanho")
+
+    # Listas e outras sequências são convertidas, pois o `pd.factorize` só
+    # aceita Series, índices e arrays
+    codes_a, uniques_a = pd.factorize(pd.Series(a))
+    codes_b, uniques_b = pd.factorize(pd.Series(b))
+
+    valid = (codes_a >= 0) & (codes_b >= 0)
+    shape = (len(uniques_a), len(uniques_b))
+    counts = np.bincount(
+        codes_a[valid].astype(np.int64) * shape[1] + codes_b[valid],
+        minlength=shape[0] * shape[1]
+    )
+    return cramer_v(counts.reshape(shape))
+
+
+def _stacked_tables(tables) -> np.ndarray:
+    tables = np.asarray(tables)
+    if not np.issubdtype(tables.dtype, np.number):
+        raise ValueError("Todos os dados devem ser numéricos (numpy.number)")
+
+    if tables.ndim != 3:
+        raise ValueError("As tabelas devem estar empilhadas em um array de três dimensões")
+
+    if tables.shape[1] < 2 or tables.shape[2] < 2:
+        raise ValueError("As tabelas devem ter pelo menos duas linhas e duas colunas")
+
+    return np.nan_to_num(tables.astype(float))
+
+
+def chi2_many(tables) -> np.ndarray:
+    """ Calcula o Qui^2 de várias tabelas de contingência de mesmo formato
+        (ex.: uma por temporada) em uma única operação vetorizada.
+
+        :param tables: array 3-D, de formato `(k, m, n)`, ou uma sequência de
+        `k` tabelas `m x n` (arrays ou DataFrames), onde todos os dados
+        representam frequências absolutas
+        :return: array com o Qui^2 de cada uma das `k` tabelas
+    """
+    tables = _stacked_tables(tables)
+
+    sum_y = tables.sum(axis=2, keepdims=True)
+    sum_x = tables.sum(axis=1, keepdims=True)
+    total = tables.sum(axis=(1, 2), keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exp = sum_y * sum_x / total
+        # Linhas e colunas sem nenhuma frequência não contribuem para o Qui^2
+        terms = np.where(exp > 0, np.square(tables - exp) / exp, 0.)
+    return terms.sum(axis=(1, 2))
+
+
+def cramer_v_many(tables) -> np.ndarray:
+    """ Calcula o V de Cramer de várias tabelas de contingência de mesmo
+        formato em uma única operação vetorizada.
+
+        :param tables: array 3-D, de formato `(k, m, n)`, ou uma sequência de
+        `k` tabelas `m x n` (arrays ou DataFrames), onde todos os dados
+        representam frequências absolutas
+        :return: array com o V de Cramer de cada uma das `k` tabelas
+    """
+    tables = _stacked_tables(tables)
+    k = min(tables.shape[1:]) - 1
+    return np.sqrt(chi2_many(tables) / tables.sum(axis=(1, 2)) / k)
+
+
+def _dense_counts(table) -> np.ndarray:
+    """ Converte uma tabela de contingência para um array 2-D de inteiros,
+        sem as linhas e colunas vazias.
+
+        :param table: tabela de contingência, em qualquer formato aceito por
+        `chi2`, com frequências inteiras
+        :return: array 2-D com as frequências
+    """
+    rows, cols, counts, shape = _sparse_counts(table)
+    if np.any(counts != np.round(counts)) or np.any(counts < 0):
+        raise ValueError("As frequências devem ser inteiras e não negativas")
+
+    dense = np.zeros(shape, dtype=np.int64)
+    np.add.at(dense, (rows, cols), counts.astype(np.int64))
+    dense = dense[dense.sum(axis=1) > 0][:, dense.sum(axis=0) > 0]
+    if dense.shape[0] < 2 or dense.shape[1] < 2:
+        raise ValueError("A tabela deve ter pelo menos duas linhas e duas colunas não vazias")
+    return dense
+
+
+def permuted_tables(table: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """ Sorteia tabelas com as mesmas somas das linhas e das colunas de
+        `table`, como as obtidas embaralhando uma das variáveis em relação à
+        outra (hipótese de independência). Cada célula é sorteada de uma
+        distribuição hipergeométrica, para todas as tabelas de uma vez, sem
+        embaralhar as observações.
+
+        :param table: array 2-D de frequências inteiras
+        :param n: quantidade de tabelas
+        :param rng: gerador de números aleatórios
+        :return: array 3-D de formato `(n, m, k)`
+    """
+    m, k = table.shape
+    tables = np.zeros((n, m, k), dtype=np.int64)
+    remaining = np.tile(table.sum(axis=0), (n, 1))
+
+    for i in range(m - 1):
+        to_draw = np.full(n, table[i].sum())
+        pool = remaining.sum(axis=1)
+        for j in range(k - 1):
+            pool -= remaining[:, j]
+            drawn = rng.hypergeometric(remaining[:, j], pool, to_draw)
+            tables[:, i, j] = drawn
+            remaining[:, j] -= drawn
+            to_draw -= drawn
+        tables[:, i, k - 1] = to_draw
+        remaining[:, k - 1] -= to_draw
+
+    tables[:, m - 1] = remaining
+    return tables
+
+
+def multinomial_tables(probabilities: np.ndarray, total: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """ Sorteia tabelas com `total` observações, cada uma caindo em cada
+        célula com a probabilidade dada.
+
+        :param probabilities: array 2-D com a probabilidade de cada célula
+        :param total: quantidade de observações de cada tabela
+        :param n: quantidade de tabelas
+        :param rng: gerador de números aleatórios
+        :return: array 3-D de formato `(n, m, k)`
+    """
+    draws = rng.multinomial(total, probabilities.ravel() / probabilities.sum(), size=n)
+    return draws.reshape(n, *probabilities.shape)
+
+
+def _resample_batch(table: np.ndarray, n: int, null: str, seed: np.random.SeedSequence) -> tuple:
+    """ Sorteia um lote de tabelas sob a hipótese de independência e de
+        tabelas de bootstrap (reamostragem das observações).
+
+        :return: tupla com os Qui^2 das tabelas sob independência e os V de
+        Cramer das tabelas de bootstrap
+    """
+    rng = np.random.default_rng(seed)
+    total = int(table.sum())
+    if null == "permutation":
+        null_tables = permuted_tables(table, n, rng)
+    else:
+        expected = np.outer(table.sum(axis=1), table.sum(axis=0))
+        null_tables = multinomial_tables(expected, total, n, rng)
+
+    bootstrap = multinomial_tables(table, total, n, rng)
+    return chi2_many(null_tables), cramer_v_many(bootstrap)
+
+
+def association_test(table, n_resamples: int = 9999, confidence: float = 0.95, null: str = "permutation",
+                     seed=None, jobs: int = 1) -> pd.Series:
+    """ Testa a associação entre as variáveis de uma tabela de contingência
+        por reamostragem. O p-valor é a proporção das tabelas sorteadas sob
+        independência cujo Qui^2 é pelo menos o observado, e o intervalo de
+        confiança do V de Cramer é o dos percentis das tabelas de bootstrap
+        (como o V de Cramer é enviesado para cima, em associações fracas o
+        intervalo pode não conter o valor observado). As tabelas são
+        sorteadas em lotes, como arrays 3-D, e o Qui^2 de cada lote é
+        calculado de uma só vez por `chi2_many`.
+
+        :param table: tabela de contingência, em qualquer formato aceito por
+        `chi2`, com frequências inteiras; linhas e colunas vazias são
+        desconsideradas
+        :param n_resamples: quantidade de tabelas sorteadas
+        :param confidence: nível de confiança do intervalo, entre 0 e 1
+        :param null: `"permutation"`, para sortear tabelas com as mesmas
+        somas das linhas e das colunas, ou `"multinomial"`, para sortear
+        tabelas com o mesmo total e as probabilidades esperadas sob
+        independência
+        :param seed: semente dos sorteios, para resultados reprodutíveis
+        :param jobs: quantidade de processos entre os quais os lotes são
+        divididos
+        :return: Series com os índices `chi2`, `cramer_v`, `p_value`,
+        `ci_low` e `ci_high`
+    """
+    if null not in ("permutation", "multinomial"):
+        raise ValueError(f"Hipótese nula desconhecida: '{null}'")
+    if n_resamples < 1:
+        raise ValueError("A quantidade de reamostragens deve ser positiva")
+    if not 0 < confidence < 1:
+        raise ValueError("O nível de confiança deve estar entre 0 e 1")
+
+    table = _dense_counts(table)
+    observed = chi2_many(table[None])[0]
+
+    sizes = [RESAMPLE_BATCH] * (n_resamples // RESAMPLE_BATCH)
+    if n_resamples % RESAMPLE_BATCH:
+        sizes.append(n_resamples % RESAMPLE_BATCH)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = ([table] * len(sizes), sizes, [null] * len(sizes), seeds)
+
+    if jobs > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(min(jobs, len(sizes))) as pool:
+            batches = list(pool.map(_resample_batch, *args))
+    else:
+        batches = list(map(_resample_batch, *args))
+
+    null_chi2 = np.concatenate([b[0] for b in batches])
+    bootstrap_v = np.concatenate([b[1] for b in batches])
+    low, high = np.nanquantile(bootstrap_v, [(1 - confidence) / 2, (1 + confidence) / 2])
+
+    return pd.Series({
+        "chi2": observed,
+        "cramer_v": math.sqrt(observed / table.sum() / (min(table.shape) - 1)),
+        "p_value": (1 + np.count_nonzero(null_chi2 >= observed)) / (n_resamples + 1),
+        "ci_low": low,
+        "ci_high": high
+    })
+
+
+def _lerp(a, b, t):
+    """ Interpolação linear entre `a` e `b`, com os mesmos arredondamentos do
+        `np.quantile`. """
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def binned_quantiles(values, by, bins, q=(0.25, 0.5, 0.75)) -> pd.DataFrame:
+    """ Calcula quantis de uma variável em faixas de outra (ex.: quartis do
+        desempenho por faixa de preço) em uma única passagem: cada linha é
+        associada à sua faixa uma única vez, com `np.digitize`, e os valores
+        são ordenados uma única vez por faixa e valor. Os quantis usam
+        interpolação linear, como `pd.Series.quantile`.
+
+        :param values: array ou Series com os valores cujos quantis são
+        calculados; valores nulos são ignorados
+        :param by: array ou Series, de mesmo tamanho que `values`, com a
+        variável que define as faixas
+        :param bins: limites das faixas, em ordem crescente (cada faixa
+        inclui o limite inferior e exclui o superior), ou a quantidade de
+        faixas de mesma largura entre o mínimo e o máximo de `by` (nesse
+        caso, a última faixa inclui o máximo)
+        :param q: quantis a serem calculados, entre 0 e 1
+        :return: DataFrame com uma linha por faixa, inclusive as vazias, e as
+        colunas `left`, `right`, `center`, `count` e uma coluna por quantil
+        (nula nas faixas vazias)
+    """
+    values = np.asarray(values, dtype=float)
+    by = np.asarray(by, dtype=float)
+    if len(values) != len(by):
+        raise ValueError("Os parâmetros 'values' e 'by' devem ter o mesmo tamanho")
+
+    q = np.atleast_1d(np.asarray(q, dtype=float))
+    if np.any((q < 0) | (q > 1)):
+        raise ValueError("Os quantis devem estar entre 0 e 1")
+
+    if np.ndim(bins) == 0:
+        if bins < 1:
+            raise ValueError("A quantidade de faixas deve ser positiva")
+        valid = ~np.isnan(by)
+        low, high = (by[valid].min(), by[valid].max()) if valid.any() else (0., 1.)
+        edges = np.linspace(low, high, int(bins) + 1)
+    else:
+        edges = np.asarray(bins, dtype=float)
+        if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError("Os limites das faixas devem ser crescentes")
+    n_bins = len(edges) - 1
+
+    # Faixa de cada linha: 0 a `n_bins - 1`, ou fora de todas
+    band = np.digitize(by, edges) - 1
+    if np.ndim(bins) == 0:
+        band[by == edges[-1]] = n_bins - 1
+    keep = (band >= 0) & (band < n_bins) & ~np.isnan(values)
+    band, values = band[keep], values[keep]
+
+    # Ordena por faixa e, dentro de cada faixa, por valor
+    order = np.lexsort((values, band))
+    band, values = band[order], values[order]
+    counts = np.bincount(band, minlength=n_bins)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # Posição (fracionária) de cada quantil dentro de cada faixa
+    positions = (counts - 1)[:, None] * q[None, :]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, counts[:, None] - 1)
+    nonempty = counts > 0
+    quantiles = np.full((n_bins, len(q)), np.nan)
+    if nonempty.any():
+        a = values[(starts[:, None] + lower)[nonempty]]
+        b = values[(starts[:, None] + upper)[nonempty]]
+        quantiles[nonempty] = _lerp(a, b, (positions - lower)[nonempty])
+
+    result = pd.DataFrame({
+        "left": edges[:-1],
+        "right": edges[1:],
+        "center": (edges[:-1] + edges[1:]) / 2,
+        "count": counts
+    })
+    for i, quantile in enumerate(q):
+        result[quantile] = quantiles[:, i]
+    return result
+
+
+class QuantileSketch:
+    """ Resumo de uma variável numérica que estima os seus quantis com erro
+        relativo limitado (DDSketch), sem guardar nem ordenar os valores. Os
+        valores são contados em faixas de tamanho geométrico; cada quantil é
+        estimado pelo valor representativo da sua faixa, a no máximo
+        `relative_accuracy` do valor exato (em módulo). Resumos de partes
+        diferentes dos dados (ex.: blocos ou processos) podem ser combinados
+        com `merge`. Exemplo:
+
+        sketch = QuantileSketch()
+        for chunk in chunks:
+            sketch.update(chunk["market_value_in_eur"])
+        q1, q3 = sketch.quantile([0.25, 0.75])
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """ :param relative_accuracy: erro relativo máximo dos quantis, entre
+            0 e 1
+            :param max_bins: quantidade máxima de faixas de cada sinal; acima
+            dela, as faixas de menor módulo são unidas, e o erro deixa de ser
+            garantido apenas para os quantis de menor módulo
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("A precisão relativa deve estar entre 0 e 1")
+        if max_bins < 1:
+            raise ValueError("A quantidade máxima de faixas deve ser positiva")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        # Contagens das faixas de valores positivos e negativos (pelo módulo):
+        # a posição `i` corresponde à faixa de índice `offset + i`
+        self._positive = (np.zeros(0, dtype=np.int64), 0)
+        self._negative = (np.zeros(0, dtype=np.int64), 0)
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.
+        self.sum_squares = 0.
+        self.min = np.nan
+        self.max = np.nan
+
+    def _add(self, store: tuple, counts: np.ndarray, offset: int) -> tuple:
+        """ Soma contagens de faixas, a partir da faixa `offset`, a um dos
+            lados do resumo. """
+        if len(counts) == 0:
+            return store
+        current, current_offset = store
+        if len(current) == 0:
+            return self._collapse(counts.copy(), offset)
+
+        low = min(offset, current_offset)
+        high = max(offset + len(counts), current_offset + len(current))
+        merged = np.zeros(high - low, dtype=np.int64)
+        merged[current_offset - low:current_offset - low + len(current)] += current
+        merged[offset - low:offset - low + len(counts)] += counts
+        return self._collapse(merged, low)
+
+    def _add_values(self, store: tuple, values: np.ndarray) -> tuple:
+        """ Conta valores positivos nas faixas de um dos lados do resumo. """
+        if len(values) == 0:
+            return store
+        indexes = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+        low = indexes.min()
+        return self._add(store, np.bincount(indexes - low), low)
+
+    def _collapse(self, counts: np.ndarray, offset: int) -> tuple:
+        """ Une as faixas de menor módulo enquanto houver mais que
+            `max_bins` faixas. """
+        if len(counts) > self.max_bins:
+            extra = len(counts) - self.max_bins
+            counts[extra] += counts[:extra].sum()
+            counts, offset = counts[extra:], offset + extra
+        return counts, offset
+
+    def _values(self, indexes: np.ndarray) -> np.ndarray:
+        """ Valor representativo de cada faixa, equidistante (em erro
+            relativo) dos seus limites. """
+        return 2 * np.power(self._gamma, indexes.astype(float)) / (self._gamma + 1)
+
+    def update(self, values) -> "QuantileSketch":
+        """ Acrescenta valores ao resumo. Valores nulos são ignorados.
+
+            :param values: array, Series ou sequência de números
+            :return: o próprio resumo
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self._positive = self._add_values(self._positive, values[values > 0])
+        self._negative = self._add_values(self._negative, -values[values < 0])
+        self.zeros += int(np.count_nonzero(values == 0))
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.sum_squares += float(np.square(values).sum())
+        self.min = float(np.fmin(self.min, values.min()))
+        self.max = float(np.fmax(self.max, values.max()))
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """ Acrescenta ao resumo os valores de outro resumo, como se eles
+            tivessem sido passados a `update`.
+
+            :param other: resumo com a mesma precisão relativa
+            :return: o próprio resumo
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Apenas resumos com a mesma precisão relativa podem ser combinados")
+
+        self._positive = self._add(self._positive, *other._positive)
+        self._negative = self._add(self._negative, *other._negative)
+        self.zeros += other.zeros
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_squares += other.sum_squares
+        self.min = float(np.fmin(self.min, other.min))
+        self.max = float(np.fmax(self.max, other.max))
+        return self
+
+    def quantile(self, q):
+        """ Estima quantis dos valores do resumo.
+
+            :param q: quantil ou sequência de quantis, entre 0 e 1
+            :return: o quantil estimado (nulo se o resumo estiver vazio), ou
+            um array com os quantis
+        """
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("Os quantis devem estar entre 0 e 1")
+
+        if self.count == 0:
+            result = np.full(len(q), np.nan)
+            return result[0] if scalar else result
+
+        # Faixas em ordem crescente de valor: negativas (do maior para o
+        # menor módulo), zeros e positivas
+        negative, negative_offset = self._negative
+        positive, positive_offset = self._positive
+        counts = np.concatenate([negative[::-1], [self.zeros], positive])
+        values = np.concatenate([
+            -self._values(np.arange(negative_offset, negative_offset + len(negative))[::-1]),
+            [0.],
+            self._values(np.arange(positive_offset, positive_offset + len(positive)))
+        ])
+
+        ranks = q * (self.count - 1)
+        bins = np.searchsorted(np.cumsum(counts), ranks, side="right")
+        result = np.clip(values[bins], self.min, self.max)
+        return result[0] if scalar else result
+
+    def describe(self) -> pd.Series:
+        """ Resume os valores como `pd.Series.describe`, com os quartis
+            estimados pelo resumo e o mínimo, o máximo, a média e o desvio
+            padrão exatos (a menos de arredondamentos).
+
+            :return: Series com os índices `count`, `mean`, `std`, `min`,
+            `25%`, `50%`, `75%` e `max`
+        """
+        mean = self.sum / self.count if self.count else np.nan
+        if self.count > 1:
+            variance = (self.sum_squares - self.count * mean ** 2) / (self.count - 1)
+            std = math.sqrt(max(variance, 0.))
+        else:
+            std = np.nan
+        q1, q2, q3 = self.quantile([0.25, 0.5, 0.75])
+        return pd.Series(
+            [self.count, mean, std, self.min, q1, q2, q3, self.max],
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        )
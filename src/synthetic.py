@@ -0,0 +1,303 @@
+""" Módulo responsável por gerar tabelas sintéticas com o formato das tabelas
+    do dataset do Kaggle (Transfermarkt), usadas nos benchmarks e nos testes.
+    As quantidades de linhas de cada tabela seguem as proporções do dataset
+    real, em relação à quantidade de participações em partidas
+    (`appearances`) """
+
+import pandas as pd
+import numpy as np
+import os
+import data_loader
+
+
+# Quantidade de linhas de cada tabela por linha de `appearances`, segundo o
+# dataset real (cerca de 1,6 milhão de participações)
+RATIOS = {
+    "players": 0.02,
+    "transfers": 0.05,
+    "player_valuations": 0.3,
+    "games": 0.045,
+    "game_events": 0.6,
+    "game_lineups": 1.4
+}
+
+# Quantidade média de jogadores por clube
+PLAYERS_PER_CLUB = 25
+
+POSITIONS = {
+    "Attack": ["Centre-Forward", "Left Winger", "Right Winger"],
+    "Midfield": ["Central Midfield", "Defensive Midfield", "Attacking Midfield"],
+    "Defender": ["Centre-Back", "Left-Back", "Right-Back"],
+    "Goalkeeper": ["Goalkeeper"]
+}
+
+COUNTRIES = ["Brazil", "Spain", "France", "Germany", "England", "Italy", "Portugal", "Argentina"]
+COMPETITIONS = {"domestic_league": 0.75, "domestic_cup": 0.15, "international_cup": 0.1}
+CARDS = ["1. Yellow card  , Foul", "2. Yellow card  , Dissent", "Red card, Violent conduct", "Second yellow"]
+
+
+def _dates(rng: np.random.Generator, n: int, start: str, end: str) -> np.ndarray:
+    """ Sorteia `n` datas entre `start` e `end`, com precisão de dias. """
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    return start + rng.integers(0, (end - start).astype(int), n).astype("timedelta64[D]")
+
+
+def _prices(rng: np.random.Generator, n: int) -> np.ndarray:
+    """ Sorteia `n` valores de mercado, com distribuição log-normal e
+        múltiplos de 25 mil euros. """
+    return np.maximum(np.round(rng.lognormal(13.5, 1.5, n) / 25_000), 1) * 25_000
+
+
+def _typed(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """ Converte as colunas de `df` para os tipos declarados em
+        `data_loader.SCHEMAS`, na ordem do esquema. """
+    schema = data_loader.SCHEMAS[table]
+    return pd.DataFrame({column: df[column].astype(dtype) for column, dtype in schema.items()})
+
+
+def players(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    """ Gera a tabela de jogadores.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade de jogadores
+        :return: DataFrame com as colunas de `players.csv`
+    """
+    ids = np.arange(1, n + 1) * 7
+    position = rng.choice(list(POSITIONS), n, p=[0.25, 0.3, 0.33, 0.12])
+    sub_position = [POSITIONS[p][i % len(POSITIONS[p])] for p, i in zip(position, rng.integers(0, 3, n))]
+    birth = pd.Series(_dates(rng, n, "1975-01-01", "2006-12-31"))
+    birth[rng.random(n) < 0.01] = pd.NaT
+
+    return _typed(pd.DataFrame({
+        "player_id": ids,
+        "name": [f"Player {i}" for i in ids],
+        "country_of_citizenship": rng.choice(COUNTRIES, n),
+        "date_of_birth": birth,
+        "sub_position": sub_position,
+        "position": position,
+        "market_value_in_eur": _prices(rng, n)
+    }), "players")
+
+
+def transfers(rng: np.random.Generator, n: int, players: pd.DataFrame, n_clubs: int) -> pd.DataFrame:
+    """ Gera a tabela de transferências. Cada jogador troca de clube em
+        datas crescentes, sempre saindo do clube para o qual foi na
+        transferência anterior; cerca de 10% das transferências são retornos
+        ao clube anterior, gerando buybacks.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade de transferências
+        :param players: tabela de jogadores, gerada por `players`
+        :param n_clubs: quantidade de clubes
+        :return: DataFrame com as colunas de `transfers.csv`
+    """
+    player_id = rng.choice(players["player_id"].to_numpy(), n)
+    date = _dates(rng, n, "2000-01-01", "2024-09-30")
+    order = np.lexsort((date, player_id))
+    player_id, date = player_id[order], date[order]
+
+    # O clube de origem é o de destino da transferência anterior do jogador
+    first = np.ones(n, dtype=bool)
+    first[1:] = player_id[1:] != player_id[:-1]
+    to_club = rng.integers(1, n_clubs + 1, n)
+    back = np.zeros(n, dtype=bool)
+    back[2:] = (rng.random(n - 2) < 0.1) & ~first[2:] & ~first[1:-1]
+    to_club[2:][back[2:]] = to_club[:-2][back[2:]]
+    from_club = np.roll(to_club, 1)
+    from_club[first] = rng.integers(1, n_clubs + 1, first.sum())
+
+    fee = np.where(rng.random(n) < 0.55, 0, _prices(rng, n))
+    value = np.where(rng.random(n) < 0.05, np.nan, _prices(rng, n))
+    names = pd.Series(players["name"].to_numpy(), index=players["player_id"]).loc[player_id].to_numpy()
+
+    return _typed(pd.DataFrame({
+        "player_id": player_id,
+        "transfer_date": date,
+        "from_club_id": from_club,
+        "to_club_id": to_club,
+        "from_club_name": [f"Club {c}" for c in from_club],
+        "to_club_name": [f"Club {c}" for c in to_club],
+        "transfer_fee": fee,
+        "market_value_in_eur": value,
+        "player_name": names
+    }), "transfers")
+
+
+def player_valuations(rng: np.random.Generator, n: int, players: pd.DataFrame) -> pd.DataFrame:
+    """ Gera o histórico de valores de mercado dos jogadores.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade de avaliações
+        :param players: tabela de jogadores, gerada por `players`
+        :return: DataFrame com as colunas de `player_valuations.csv`
+    """
+    return _typed(pd.DataFrame({
+        "player_id": rng.choice(players["player_id"].to_numpy(), n),
+        "date": _dates(rng, n, "2004-01-01", "2024-09-30"),
+        "market_value_in_eur": _prices(rng, n)
+    }), "player_valuations")
+
+
+def games(rng: np.random.Generator, n: int, n_clubs: int) -> pd.DataFrame:
+    """ Gera a tabela de partidas.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade de partidas
+        :param n_clubs: quantidade de clubes
+        :return: DataFrame com as colunas de `games.csv`
+    """
+    date = _dates(rng, n, "2012-07-01", "2024-09-30")
+    home = rng.integers(1, n_clubs + 1, n)
+
+    return _typed(pd.DataFrame({
+        "game_id": np.arange(n),
+        "competition_id": rng.choice(["GB1", "ES1", "L1", "IT1", "FR1", "CL"], n),
+        "season": date.astype("datetime64[Y]").astype(int) + 1970,
+        "date": date,
+        "home_club_id": home,
+        "away_club_id": (home + rng.integers(1, n_clubs, n) - 1) % n_clubs + 1,
+        "home_club_goals": rng.poisson(1.5, n),
+        "away_club_goals": rng.poisson(1.2, n),
+        "competition_type": rng.choice(list(COMPETITIONS), n, p=list(COMPETITIONS.values()))
+    }), "games")
+
+
+def club_games(games: pd.DataFrame) -> pd.DataFrame:
+    """ Gera a tabela de partidas por clube, com uma linha para cada clube de
+        cada partida.
+
+        :param games: tabela de partidas, gerada por `games`
+        :return: DataFrame com as colunas de `club_games.csv`
+    """
+    home = pd.DataFrame({
+        "game_id": games["game_id"],
+        "club_id": games["home_club_id"],
+        "own_goals": games["home_club_goals"],
+        "opponent_goals": games["away_club_goals"],
+        "hosting": "Home"
+    })
+    away = pd.DataFrame({
+        "game_id": games["game_id"],
+        "club_id": games["away_club_id"],
+        "own_goals": games["away_club_goals"],
+        "opponent_goals": games["home_club_goals"],
+        "hosting": "Away"
+    })
+    df = pd.concat([home, away], ignore_index=True)
+    df["is_win"] = (df["own_goals"] > df["opponent_goals"]).astype(int)
+    return _typed(df, "club_games")
+
+
+def appearances(rng: np.random.Generator, n: int, players: pd.DataFrame, games: pd.DataFrame) -> pd.DataFrame:
+    """ Gera a tabela de participações dos jogadores nas partidas, sem pares
+        (partida, jogador) repetidos.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade máxima de participações
+        :param players: tabela de jogadores, gerada por `players`
+        :param games: tabela de partidas, gerada por `games`
+        :return: DataFrame com as colunas de `appearances.csv`
+    """
+    game = rng.integers(0, len(games), n)
+    player = rng.integers(0, len(players), n)
+    keep = ~pd.DataFrame({"game": game, "player": player}).duplicated().to_numpy()
+    game, player = game[keep], player[keep]
+    n = len(game)
+
+    return _typed(pd.DataFrame({
+        "game_id": games["game_id"].to_numpy()[game],
+        "player_id": players["player_id"].to_numpy()[player],
+        "date": games["date"].to_numpy()[game],
+        "player_name": players["name"].to_numpy()[player],
+        "competition_id": games["competition_id"].to_numpy()[game],
+        "yellow_cards": rng.binomial(2, 0.08, n),
+        "red_cards": rng.binomial(1, 0.005, n),
+        "goals": rng.binomial(3, 0.04, n),
+        "assists": rng.binomial(2, 0.04, n),
+        "minutes_played": rng.integers(1, 91, n)
+    }), "appearances")
+
+
+def game_lineups(rng: np.random.Generator, n: int, players: pd.DataFrame, appearances: pd.DataFrame) -> pd.DataFrame:
+    """ Gera as escalações das partidas: todos os jogadores que participaram
+        de cada partida, completados por reservas sorteados.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade de escalações
+        :param players: tabela de jogadores, gerada por `players`
+        :param appearances: tabela de participações, gerada por `appearances`
+        :return: DataFrame com as colunas de `game_lineups.csv`
+    """
+    extra = max(n - len(appearances), 0)
+    game_id = np.concatenate([appearances["game_id"].to_numpy(), rng.choice(appearances["game_id"].to_numpy(), extra)])
+    player_id = np.concatenate([appearances["player_id"].to_numpy(), rng.choice(players["player_id"].to_numpy(), extra)])
+    position = pd.Series(players["position"].to_numpy(), index=players["player_id"]).loc[player_id].to_numpy()
+
+    return _typed(pd.DataFrame({
+        "game_id": game_id,
+        "player_id": player_id,
+        "type": np.where(np.arange(len(game_id)) < len(appearances), "starting_lineup", "substitutes"),
+        "position": position
+    }), "game_lineups")
+
+
+def game_events(rng: np.random.Generator, n: int, appearances: pd.DataFrame) -> pd.DataFrame:
+    """ Gera os eventos das partidas (gols, cartões e substituições), cada um
+        associado a uma participação de jogador.
+
+        :param rng: gerador de números aleatórios
+        :param n: quantidade de eventos
+        :param appearances: tabela de participações, gerada por `appearances`
+        :return: DataFrame com as colunas de `game_events.csv`
+    """
+    rows = rng.integers(0, len(appearances), n)
+    kind = rng.choice(["Goals", "Cards", "Substitutions"], n, p=[0.25, 0.25, 0.5])
+    description = np.where(kind == "Cards", rng.choice(CARDS, n, p=[0.45, 0.45, 0.05, 0.05]),
+                           np.where(kind == "Goals", "Right-footed shot", "Tactical"))
+
+    return _typed(pd.DataFrame({
+        "game_id": appearances["game_id"].to_numpy()[rows],
+        "date": appearances["date"].to_numpy()[rows],
+        "type": kind,
+        "player_id": appearances["player_id"].to_numpy()[rows],
+        "description": description
+    }), "game_events")
+
+
+def generate(scale: int = 10_000, seed: int = 0) -> dict:
+    """ Gera todas as tabelas do dataset, com tipos iguais aos de
+        `data_loader.load`.
+
+        :param scale: quantidade de linhas de `appearances`; as demais tabelas
+        seguem as proporções de `RATIOS`
+        :param seed: semente do gerador de números aleatórios
+        :return: dicionário com o DataFrame de cada tabela de
+        `data_loader.SCHEMAS`
+    """
+    if scale < 100:
+        raise ValueError("A escala deve ser de ao menos 100 participações")
+
+    rng = np.random.default_rng(seed)
+    size = lambda table: max(int(scale * RATIOS[table]), 10)
+
+    tables = {"players": players(rng, size("players"))}
+    n_clubs = max(len(tables["players"]) // PLAYERS_PER_CLUB, 4)
+    tables["transfers"] = transfers(rng, size("transfers"), tables["players"], n_clubs)
+    tables["player_valuations"] = player_valuations(rng, size("player_valuations"), tables["players"])
+    tables["games"] = games(rng, size("games"), n_clubs)
+    tables["club_games"] = club_games(tables["games"])
+    tables["appearances"] = appearances(rng, scale, tables["players"], tables["games"])
+    tables["game_lineups"] = game_lineups(rng, size("game_lineups"), tables["players"], tables["appearances"])
+    tables["game_events"] = game_events(rng, size("game_events"), tables["appearances"])
+    return tables
+
+
+def write_csvs(tables: dict, directory: str):
+    """ Salva as tabelas como CSVs, no formato lido por `data_loader`.
+
+        :param tables: dicionário com o DataFrame de cada tabela
+        :param directory: diretório onde os arquivos `<tabela>.csv` são salvos
+    """
+    os.makedirs(directory, exist_ok=True)
+    for table, df in tables.items():
+        df.to_csv(os.path.join(directory, f"{table}.csv"), index=False)
@@ -0,0 +1,205 @@
+""" Módulo com um armazenamento compacto do histórico de cada jogador (ex.:
+    avaliações, transferências ou partidas), no formato CSR: as linhas são
+    ordenadas por jogador e por data, os IDs dos jogadores ficam em um array
+    ordenado e `offsets[i]:offsets[i + 1]` delimita as linhas do i-ésimo
+    jogador em cada coluna. Assim, o histórico de um jogador é uma fatia das
+    colunas, e reduções por jogador (somas, máximos, ...) são feitas com
+    `ufunc.reduceat`, sem reagrupar a tabela. O histórico pode ser salvo em
+    arquivos `.npy`, lidos mapeados em memória """
+
+import json
+import os
+import numpy as np
+import pandas as pd
+import data_loader
+
+
+class Timeline:
+    """ Histórico por jogador no formato CSR. As colunas são arrays do NumPy
+        acessados por `timeline[coluna]`, com as linhas na ordem dos
+        jogadores e, para cada jogador, na ordem da coluna de ordenação. """
+
+    def __init__(self, player_ids: np.ndarray, offsets: np.ndarray, columns: dict):
+        """ :param player_ids: IDs dos jogadores, em ordem crescente e sem
+            repetições
+            :param offsets: array com `len(player_ids) + 1` posições, onde as
+            linhas do i-ésimo jogador vão de `offsets[i]` a `offsets[i + 1]`
+            :param columns: dicionário com o nome e o array de cada coluna,
+            todos com `offsets[-1]` linhas
+        """
+        if len(offsets) != len(player_ids) + 1:
+            raise ValueError("O array 'offsets' deve ter uma posição a mais que 'player_ids'")
+        for name, values in columns.items():
+            if len(values) != offsets[-1]:
+                raise ValueError(f"A coluna '{name}' deve ter {offsets[-1]} linhas")
+
+        self.player_ids = player_ids
+        self.offsets = offsets
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, order: str = None, columns: list = None, key: str = "player_id") -> "Timeline":
+        """ Monta o histórico a partir de uma tabela, com uma única ordenação.
+
+            :param df: DataFrame com a coluna `key`, sem valores nulos
+            :param order: coluna pela qual as linhas de cada jogador são
+            ordenadas (ex.: `"date"`); por padrão, a ordem original é mantida
+            :param columns: colunas guardadas; por padrão, todas menos `key`
+            :param key: coluna com o ID do jogador
+            :return: o histórico
+        """
+        columns = [c for c in df.columns if c != key] if columns is None else columns
+        ids = _to_numpy(df[key])
+        if order is None:
+            sort = np.argsort(ids, kind="stable")
+        else:
+            sort = np.lexsort((df[order].to_numpy(), ids))
+
+        ids = ids[sort]
+        starts = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]])) if len(ids) else np.zeros(0, dtype=np.int64)
+        offsets = np.append(starts, len(ids)).astype(np.int64)
+        return cls(ids[starts], offsets, {c: _to_numpy(df[c])[sort] for c in columns})
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def counts(self) -> np.ndarray:
+        """ Quantidade de linhas de cada jogador. """
+        return np.diff(self.offsets)
+
+    def position(self, player_id) -> int:
+        """ Posição de um jogador em `player_ids`, por busca binária.
+
+            :param player_id: ID do jogador
+            :return: posição do jogador, ou -1 se ele não tiver histórico
+        """
+        i = np.searchsorted(self.player_ids, player_id)
+        return int(i) if i < len(self.player_ids) and self.player_ids[i] == player_id else -1
+
+    def get(self, player_id) -> pd.DataFrame:
+        """ Histórico completo de um jogador.
+
+            :param player_id: ID do jogador
+            :return: DataFrame com as colunas do histórico (vazio se o
+            jogador não tiver histórico)
+        """
+        i = self.position(player_id)
+        start, end = (self.offsets[i], self.offsets[i + 1]) if i >= 0 else (0, 0)
+        return pd.DataFrame({c: values[start:end] for c, values in self.columns.items()})
+
+    def reduce(self, values, ufunc: np.ufunc = np.add) -> pd.Series:
+        """ Reduz uma coluna (ou um array alinhado às linhas) por jogador.
+
+            :param values: nome de uma coluna ou array com uma posição por
+            linha do histórico
+            :param ufunc: operação da redução (ex.: `np.add`, `np.maximum`)
+            :return: Series indexada por `player_id` com a redução de cada
+            jogador
+        """
+        values = self.columns[values] if isinstance(values, str) else np.asarray(values)
+        reduced = ufunc.reduceat(values, self.offsets[:-1]) if len(self) else values[:0]
+        return pd.Series(reduced, index=pd.Index(self.player_ids, name="player_id"))
+
+    def first(self) -> np.ndarray:
+        """ Posição da primeira linha de cada jogador nas colunas. """
+        return self.offsets[:-1]
+
+    def last(self) -> np.ndarray:
+        """ Posição da última linha de cada jogador nas colunas. """
+        return self.offsets[1:] - 1
+
+    def save(self, directory: str):
+        """ Salva o histórico em um diretório, com um arquivo `.npy` por
+            array. Colunas de objetos (ex.: textos) são salvas com pickle e
+            não podem ser mapeadas em memória.
+
+            :param directory: diretório de destino, criado se não existir
+        """
+        index = os.path.join(directory, "columns.json")
+        if os.path.exists(index):
+            os.remove(index)
+
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "player_ids.npy"), self.player_ids)
+        np.save(os.path.join(directory, "offsets.npy"), self.offsets)
+        for i, (name, values) in enumerate(self.columns.items()):
+            np.save(os.path.join(directory, f"column_{i}.npy"), values, allow_pickle=values.dtype == object)
+
+        # O índice é escrito por último e marca o diretório como completo
+        with open(index, "w") as file:
+            json.dump(list(self.columns), file)
+
+    @classmethod
+    def read(cls, directory: str, mmap: bool = True) -> "Timeline":
+        """ Lê um histórico salvo por `save`.
+
+            :param directory: diretório do histórico
+            :param mmap: se `True`, os arrays numéricos são mapeados em memória
+            :return: o histórico
+        """
+        mode = "r" if mmap else None
+
+        def read(name):
+            path = os.path.join(directory, name)
+            try:
+                return np.load(path, mmap_mode=mode)
+            except ValueError:
+                # Arrays de objetos não podem ser mapeados em memória
+                return np.load(path, allow_pickle=True)
+
+        with open(os.path.join(directory, "columns.json")) as file:
+            names = json.load(file)
+        columns = {name: read(f"column_{i}.npy") for i, name in enumerate(names)}
+        return cls(read("player_ids.npy"), read("offsets.npy"), columns)
+
+
+def _to_numpy(column: pd.Series) -> np.ndarray:
+    """ Converte uma coluna para um array do NumPy. Inteiros que aceitam
+        nulos viram float64, com os nulos como NaN. """
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_numeric_dtype(column.dtype):
+        if column.hasnans:
+            return column.to_numpy(dtype="float64", na_value=np.nan)
+        return column.to_numpy(dtype=column.dtype.numpy_dtype)
+    return column.to_numpy()
+
+
+def timeline_dir(table: str, order: str, columns: list) -> str:
+    """ Diretório do histórico de uma tabela em `data_loader.CACHE_DIR`. O
+        nome inclui a ordenação e as colunas, que identificam o histórico. """
+    name = "-".join([table, order or "", *columns])
+    return os.path.join(data_loader.CACHE_DIR, "timelines", name)
+
+
+def load(table: str, order: str = None, columns: list = None) -> Timeline:
+    """ Carrega o histórico por jogador de uma tabela do dataset. Na primeira
+        leitura, o histórico é montado e salvo em `CACHE_DIR`; nas seguintes,
+        os arquivos são mapeados em memória, até que o CSV de origem seja
+        alterado.
+
+        :param table: nome da tabela, com a coluna `player_id` (ex.:
+        `"player_valuations"`)
+        :param order: coluna pela qual as linhas de cada jogador são
+        ordenadas (ex.: `"date"`)
+        :param columns: colunas guardadas; por padrão, todas as do esquema
+        menos `player_id`
+        :return: o histórico
+    """
+    schema = data_loader.SCHEMAS.get(table)
+    if schema is None or "player_id" not in schema:
+        raise ValueError(f"A tabela '{table}' não tem a coluna 'player_id'")
+
+    columns = [c for c in schema if c != "player_id"] if columns is None else list(columns)
+    directory = timeline_dir(table, order, columns)
+    index = os.path.join(directory, "columns.json")
+    if os.path.exists(index) and os.path.getmtime(index) >= os.path.getmtime(data_loader.source_path(table)):
+        return Timeline.read(directory)
+
+    needed = ["player_id", *columns] + ([order] if order is not None and order not in columns else [])
+    df = data_loader.load(table, needed)
+    df = df.loc[df["player_id"].notna()]
+    timeline = Timeline.from_frame(df, order, columns)
+    timeline.save(directory)
+    return Timeline.read(directory)
@@ -0,0 +1,106 @@
+""" Módulo com cálculos sobre o histórico de valores de mercado dos jogadores
+    (`player_valuations.csv`) """
+
+import pandas as pd
+import numpy as np
+import inflation
+from timeline import Timeline
+
+
+# Data de referência dos dados (último mês com inflação disponível)
+CUTOFF = np.datetime64("2024-09-30", "ns")
+
+
+def valuation_index(valuations: pd.DataFrame, adjust: bool = False) -> Timeline:
+    """ Cria um índice do histórico de valores de mercado, ordenado por
+        jogador e por data, para consultas com `value_at`. Avaliações sem
+        valor ou sem data são descartadas.
+
+        :param valuations: DataFrame com as colunas `player_id`, `date`
+        (datetime64) e `market_value_in_eur`
+        :param adjust: se `True`, os valores são corrigidos pela inflação
+        (ver `inflation.inflation_adj_many`)
+        :return: `Timeline` com as colunas `date` e `market_value_in_eur`
+    """
+    valuations = valuations.dropna(axis=0, subset=["player_id", "date", "market_value_in_eur"])
+    if adjust:
+        valuations = valuations.assign(
+            market_value_in_eur=inflation.inflation_adj_many(valuations["market_value_in_eur"], valuations["date"])
+        )
+    return Timeline.from_frame(valuations, order="date", columns=["date", "market_value_in_eur"])
+
+
+def value_at(index: Timeline, player_ids, dates) -> np.ndarray:
+    """ Consulta, de forma vetorizada, o valor de mercado de cada jogador na
+        data correspondente: o da última avaliação feita até essa data (no
+        mesmo dia, inclusive).
+
+        :param index: índice criado por `valuation_index`
+        :param player_ids: array ou Series com os IDs dos jogadores
+        :param dates: array ou Series de datas (datetime64), de mesmo tamanho
+        que `player_ids`
+        :return: array com os valores; jogadores sem avaliação até a data,
+        ou datas nulas, resultam em NaN
+    """
+    player_ids = np.asarray(player_ids)
+    dates = np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]")
+    if player_ids.shape != dates.shape:
+        raise ValueError("Os parâmetros 'player_ids' e 'dates' devem ter o mesmo tamanho")
+
+    values = np.full(len(player_ids), np.nan)
+    if len(index) == 0:
+        return values
+
+    # Chave combinada, crescente no índice: posição do jogador e dia
+    rows = np.repeat(np.arange(len(index)), index.counts())
+    days = index["date"].astype("datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+    first_day = days.min()
+    span = max(int(days.max() - first_day), 0) + 1
+    keys = rows * span + (days - first_day)
+
+    # Posição de cada jogador consultado no índice
+    rank = np.searchsorted(index.player_ids, player_ids)
+    found = rank < len(index)
+    found[found] = index.player_ids[rank[found]] == player_ids[found]
+    found &= ~np.isnat(dates)
+
+    # Datas fora do período das avaliações são limitadas a ele
+    query_days = np.clip(dates[found].astype(np.int64) - first_day, -1, span - 1)
+    pos = np.searchsorted(keys, rank[found] * span + query_days, side="right") - 1
+
+    # A avaliação encontrada precisa ser do mesmo jogador
+    valid = pos >= index.offsets[rank[found]]
+    result = np.full(len(pos), np.nan)
+    result[valid] = index["market_value_in_eur"][pos[valid]]
+    values[found] = result
+    return values
+
+
+def time_weighted_mean(valuations: pd.DataFrame, cutoff=CUTOFF, max_days: int = 365) -> pd.Series:
+    """ Calcula a média do valor de mercado de cada jogador, ponderada pelo
+        tempo (em dias) em que ele manteve cada valor. Cada avaliação vale
+        até a próxima avaliação do jogador; a última vale até `cutoff`,
+        limitada a `max_days` dias.
+
+        :param valuations: DataFrame com as colunas `player_id`, `date`
+        (datetime64) e `market_value_in_eur`
+        :param cutoff: data até a qual vale a última avaliação de cada jogador
+        :param max_days: duração máxima, em dias, da última avaliação
+        :return: Series indexada por `player_id` com a média ponderada de cada
+        jogador, arredondada para duas casas decimais
+    """
+    timeline = valuation_index(valuations)
+    dates = timeline["date"].astype("datetime64[ns]").astype("datetime64[D]")
+    values = timeline["market_value_in_eur"].astype(float)
+
+    # Diferença para a próxima avaliação do mesmo jogador, em dias
+    days = np.empty(len(dates), dtype=np.int64)
+    days[:-1] = (dates[1:] - dates[:-1]).astype(np.int64)
+
+    # A última avaliação de cada jogador vale até a data de referência
+    last = timeline.last()
+    until_cutoff = (np.datetime64(cutoff, "D") - dates[last]).astype(np.int64)
+    days[last] = np.minimum(until_cutoff, max_days)
+
+    weighted = timeline.reduce(values * days)
+    return (weighted / timeline.reduce(days)).round(2)
@@ -0,0 +1,83 @@
+import unittest
+import pandas as pd
+import tempfile
+import os
+import data_loader
+
+
+class TestLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dirs = data_loader.DATA_DIRS
+        self.cache_dir = data_loader.CACHE_DIR
+        data_loader.DATA_DIRS = [self.tmp.name]
+        data_loader.CACHE_DIR = os.path.join(self.tmp.name, "cache")
+
+        self.source = os.path.join(self.tmp.name, "player_valuations.csv")
+        self.write_source([10, 20, 30])
+
+    def tearDown(self):
+        data_loader.DATA_DIRS = self.dirs
+        data_loader.CACHE_DIR = self.cache_dir
+        self.tmp.cleanup()
+
+    def write_source(self, player_ids: list):
+        pd.DataFrame({
+            "player_id": player_ids,
+            "last_season": 2024,
+            "date": "2020-01-31",
+            "market_value_in_eur": 1_000_000
+        }).to_csv(self.source, index=False)
+
+    def test_should_use_declared_dtypes(self):
+        df = data_loader.load("player_valuations")
+        self.assertEqual(list(df.columns), ["player_id", "date", "market_value_in_eur"])
+        self.assertEqual(df["player_id"].dtype, "int32")
+        self.assertEqual(df["date"].dtype, "datetime64[ns]")
+        self.assertEqual(df["date"][0], pd.Timestamp(2020, 1, 31))
+
+    def test_should_project_columns(self):
+        df = data_loader.load("player_valuations", ["player_id"])
+        self.assertEqual(list(df.columns), ["player_id"])
+
+        df = data_loader.load("player_valuations", ["player_id"], cache=False)
+        self.assertEqual(list(df.columns), ["player_id"])
+
+    def test_should_write_and_reuse_cache(self):
+        data_loader.load("player_valuations")
+        path = data_loader.cache_path("player_valuations")
+        self.assertTrue(os.path.exists(path))
+
+        mtime = os.path.getmtime(path)
+        df = data_loader.load("player_valuations")
+        self.assertEqual(os.path.getmtime(path), mtime)
+        self.assertEqual(list(df["player_id"]), [10, 20, 30])
+
+    def test_cache_should_be_written_without_temporary_files(self):
+        data_loader.load("player_valuations")
+        self.assertEqual(os.listdir(data_loader.CACHE_DIR), [os.path.basename(data_loader.cache_path("player_valuations"))])
+
+    def test_newer_source_should_invalidate_cache(self):
+        data_loader.load("player_valuations")
+        path = data_loader.cache_path("player_valuations")
+        os.utime(path, (0, 0))
+
+        self.write_source([40])
+        df = data_loader.load("player_valuations")
+        self.assertEqual(list(df["player_id"]), [40])
+
+    def test_unknown_table_or_column_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            data_loader.load("clubs")
+
+        with self.assertRaises(ValueError):
+            data_loader.load("player_valuations", ["last_season"])
+
+    def test_missing_source_should_raise_FileNotFoundError(self):
+        with self.assertRaises(FileNotFoundError):
+            data_loader.load("players")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import pandas as pd
+import numpy as np
+from hyp_birth_month import cohort, compute, month_counts
+
+
+def any_players(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp(1970, 1, 1) + pd.to_timedelta(rng.integers(0, 365 * 35, n), unit="D")
+    dates = pd.Series(dates).mask(rng.random(n) < 0.05)
+    return pd.DataFrame({
+        "player_id": np.arange(n),
+        "date_of_birth": dates,
+        "position": rng.choice(["Attack", "Defender", "Goalkeeper", "Midfield"], n)
+    })
+
+
+class TestMonthCounts(unittest.TestCase):
+
+    def test_should_equal_groupby_of_months(self):
+        players = any_players(5000)
+        expected = players["date_of_birth"].map(lambda d: d.month).value_counts().sort_index()
+        result = month_counts(players["date_of_birth"])
+        self.assertEqual(list(result.index), list(range(1, 13)))
+        np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+    def test_should_include_months_without_dates(self):
+        result = month_counts(pd.Series(pd.to_datetime(["2000-03-01", "2001-03-15", None])))
+        self.assertEqual(result[3], 2)
+        self.assertEqual(result.sum(), 2)
+        self.assertEqual(len(result), 12)
+
+    def test_should_parse_iso_strings(self):
+        result = month_counts(pd.Series(["2000-12-16 00:00:00", "1999-01-02 00:00:00"]))
+        self.assertEqual(result[12], 1)
+        self.assertEqual(result[1], 1)
+
+    def test_groups_should_equal_separate_counts(self):
+        players = any_players(5000)
+        result = month_counts(players["date_of_birth"], by=players["position"])
+        self.assertEqual(list(result.index), ["Attack", "Defender", "Goalkeeper", "Midfield"])
+        for position, counts in result.iterrows():
+            expected = month_counts(players.loc[players["position"] == position, "date_of_birth"])
+            np.testing.assert_array_equal(counts.to_numpy(), expected.to_numpy())
+
+    def test_cohorts_should_group_by_decade(self):
+        players = any_players(5000)
+        result = month_counts(players["date_of_birth"], by=cohort(players["date_of_birth"]))
+        self.assertEqual(list(result.index), [1970, 1980, 1990, 2000])
+        self.assertEqual(result.to_numpy().sum(), players["date_of_birth"].notna().sum())
+
+
+class TestCompute(unittest.TestCase):
+
+    def test_frequencies_should_sum_to_100(self):
+        result = compute({"players": any_players(1000)})
+        self.assertAlmostEqual(result["frequency"].sum(), 100)
+        self.assertEqual(list(result["month_of_birth"]), list(range(1, 13)))
+
+
+if __name__ == "__main__":
+    unittest.main()
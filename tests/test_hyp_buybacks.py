@@ -0,0 +1,114 @@
+import unittest
+import pandas as pd
+import numpy as np
+from player_index import player_index
+from hyp_buybacks import find_age, find_buybacks
+
+
+# Implementação original da detecção de buybacks, com um laço sobre as
+# transferências. Cada buyback é copiado ao ser adicionado, para que uma venda
+# seguida de mais de uma compra gere um buyback por compra
+def find_buybacks_loop(transfers: pd.DataFrame, players: pd.DataFrame) -> pd.DataFrame:
+    transfers = transfers.loc[transfers["transfer_fee"] > 0]
+    transfers = transfers.sort_values(["player_id", "transfer_date"])
+
+    buybacks_list = []
+    current_player_id = -1
+    possible_buybacks = []
+    for _, row in transfers.iterrows():
+        id = row["player_id"]
+
+        if (current_player_id != id):
+            possible_buybacks = []
+        current_player_id = id
+
+        age = find_age(row["transfer_date"], id, players)
+        for bb in possible_buybacks:
+            if bb["club_id"] != row["to_club_id"]: continue
+            buybacks_list.append({**bb, "fee_bought": row["transfer_fee"], "age_bought": age})
+
+        possible_buybacks.append({
+            "player_id": id,
+            "club_id": row["from_club_id"],
+            "fee_sold": row["transfer_fee"],
+            "age_sold": age
+        })
+
+    buybacks = pd.DataFrame(buybacks_list)
+    buybacks["balance"] = buybacks["fee_sold"] - buybacks["fee_bought"]
+    buybacks["interval"] = buybacks["age_bought"] - buybacks["age_sold"]
+    return buybacks
+
+
+def any_tables(n_players: int, n_transfers: int, n_clubs: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    births = pd.Timestamp(1980, 1, 1) + pd.to_timedelta(rng.integers(0, 7000, n_players), unit="D")
+    players = pd.DataFrame({
+        "player_id": np.arange(n_players),
+        "date_of_birth": births.strftime("%Y-%m-%d %H:%M:%S")
+    })
+    # Um jogador sem data de nascimento
+    players.loc[0, "date_of_birth"] = None
+
+    transfers = pd.DataFrame({
+        "player_id": rng.integers(0, n_players, n_transfers),
+        "transfer_date": pd.Timestamp(2000, 1, 1) + pd.to_timedelta(rng.integers(0, 8000, n_transfers), unit="D"),
+        "from_club_id": rng.integers(0, n_clubs, n_transfers),
+        "to_club_id": rng.integers(0, n_clubs, n_transfers),
+        "transfer_fee": rng.choice([0, 1e5, 5e5, 2e6, 1e7], n_transfers)
+    })
+    return player_index(players), transfers
+
+
+class TestFindBuybacks(unittest.TestCase):
+
+    def test_should_match_loop_implementation(self):
+        for seed in range(5):
+            players, transfers = any_tables(50, 600, 6, seed)
+            expected = find_buybacks_loop(transfers, players)
+            result = find_buybacks(transfers, players)
+
+            self.assertGreater(len(result), 0)
+            pd.testing.assert_frame_equal(result, expected[result.columns], check_dtype=False)
+
+    def test_sale_followed_by_purchase_should_be_found(self):
+        players, _ = any_tables(2, 0, 1)
+        transfers = pd.DataFrame({
+            "player_id": [1, 1, 1],
+            "transfer_date": pd.to_datetime(["2010-01-01", "2012-01-01", "2014-01-01"]),
+            "from_club_id": [10, 20, 30],
+            "to_club_id": [20, 30, 10],
+            "transfer_fee": [5e6, 1e6, 2e6]
+        })
+        result = find_buybacks(transfers, players)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result["club_id"][0], 10)
+        self.assertEqual(result["balance"][0], 3e6)
+        self.assertAlmostEqual(result["interval"][0], 4, delta=.01)
+
+    def test_purchase_before_sale_should_be_ignored(self):
+        players, _ = any_tables(2, 0, 1)
+        transfers = pd.DataFrame({
+            "player_id": [1, 1],
+            "transfer_date": pd.to_datetime(["2010-01-01", "2012-01-01"]),
+            "from_club_id": [20, 10],
+            "to_club_id": [10, 30],
+            "transfer_fee": [5e6, 1e6]
+        })
+        self.assertEqual(len(find_buybacks(transfers, players)), 0)
+
+    def test_transfers_without_fee_should_be_ignored(self):
+        players, _ = any_tables(2, 0, 1)
+        transfers = pd.DataFrame({
+            "player_id": [1, 1],
+            "transfer_date": pd.to_datetime(["2010-01-01", "2012-01-01"]),
+            "from_club_id": [10, 20],
+            "to_club_id": [20, 10],
+            "transfer_fee": [5e6, 0]
+        })
+        self.assertEqual(len(find_buybacks(transfers, players)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
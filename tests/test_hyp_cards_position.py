@@ -0,0 +1,90 @@
+import unittest
+import pandas as pd
+import numpy as np
+from hyp_cards_position import classify_cards, compute
+
+
+# Implementação original da contagem de cartões, com `map` e `apply` linha a
+# linha (o total de cada linha percorre a tabela inteira)
+def compute_apply(game_events: pd.DataFrame, game_lineups: pd.DataFrame) -> pd.DataFrame:
+    game_events = game_events.loc[game_events["type"] == "Cards"].copy()
+    game_events["card_type"] = game_events["description"] \
+        .map(lambda e: "yellow" if "yellow" in e.lower() else "red")
+
+    merged = pd.merge(game_events, game_lineups, how="inner", on=["game_id", "player_id"])
+    merged = merged.groupby(["card_type", "position"], observed=True).size().reset_index(name="count")
+
+    calc_total = lambda r: ((merged["position"] == r["position"]) * merged["count"]).sum()
+    merged["total_count"] = merged.apply(calc_total, axis=1)
+    merged["rel_count"] = merged.apply(lambda r: r["count"] / r["total_count"], axis=1)
+    return merged.loc[merged["total_count"] > 150]
+
+
+def random_tables(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    game_events = pd.DataFrame({
+        "game_id": rng.integers(0, 50, n),
+        "type": rng.choice(["Cards", "Goals", "Substitutions"], n),
+        "player_id": rng.integers(0, 40, n),
+        "description": rng.choice(["1. Yellow card", "Second yellow", "Red card", "Foul"], n)
+    })
+    game_lineups = pd.DataFrame({
+        "game_id": np.repeat(np.arange(50), 30),
+        "player_id": np.tile(np.arange(30), 50),
+        "position": rng.choice(["Attack", "Defender", "Goalkeeper", "Midfield"], 1500)
+    })
+    return {"game_events": game_events, "game_lineups": game_lineups}
+
+
+class TestClassifyCards(unittest.TestCase):
+
+    def test_should_ignore_case(self):
+        description = pd.Series(["1. Yellow card", "Red card", "second YELLOW", "Foul"])
+        result = classify_cards(description)
+        self.assertEqual(list(result), ["yellow", "red", "yellow", "red"])
+
+    def test_categorical_should_equal_strings(self):
+        description = pd.Series(["Red card", "1. Yellow card", "Red card", None])
+        categorical = classify_cards(description.astype("category"))
+        pd.testing.assert_series_equal(categorical, classify_cards(description))
+        self.assertEqual(list(categorical.cat.categories), ["red", "yellow"])
+        self.assertEqual(list(categorical[:3]), ["red", "yellow", "red"])
+        self.assertTrue(pd.isna(categorical[3]))
+
+
+class TestCompute(unittest.TestCase):
+
+    def test_should_equal_apply_implementation(self):
+        tables = random_tables(5000)
+        expected = compute_apply(tables["game_events"], tables["game_lineups"])
+        result = compute(tables)
+        result = result.assign(card_type=result["card_type"].astype(object))
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+    def test_categorical_tables_should_equal_apply_implementation(self):
+        tables = random_tables(5000, seed=1)
+        expected = compute_apply(tables["game_events"], tables["game_lineups"])
+        for column in ["type", "description"]:
+            tables["game_events"][column] = tables["game_events"][column].astype("category")
+        tables["game_lineups"]["position"] = tables["game_lineups"]["position"].astype("category")
+
+        result = compute(tables)
+        self.assertEqual(list(result["count"]), list(expected["count"]))
+        np.testing.assert_allclose(result["rel_count"], expected["rel_count"])
+
+    def test_cards_without_description_should_not_be_counted(self):
+        tables = random_tables(5000, seed=2)
+        events = tables["game_events"]
+        expected = compute(tables)
+
+        missing = events.loc[events["type"] == "Cards"].assign(description=None)
+        tables["game_events"] = pd.concat([events, missing], ignore_index=True)
+        pd.testing.assert_frame_equal(compute(tables).reset_index(drop=True), expected.reset_index(drop=True))
+
+    def test_positions_with_few_cards_should_be_dropped(self):
+        tables = random_tables(500)
+        self.assertTrue(compute(tables).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
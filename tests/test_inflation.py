@@ -1,7 +1,12 @@
 import unittest
-from inflation import inflation_adj
+import inflation
+from inflation import inflation_adj, inflation_adj_many
 from datetime import datetime
+import numpy as np
+import pandas as pd
+import tempfile
 import math
+import os
 
 
 # Só para facilitar a criação dos `datetime`s
@@ -69,8 +74,84 @@ class TestInflationAdj(unittest.TestCase):
 
         today = inflation_adj(1000, dt(2024, 9))
         self.assertEqual(today, 1000)
+
+
+class TestInflationAdjMany(unittest.TestCase):
+
+    def test_should_match_scalar_version(self):
+        dates = [dt(1997, 1), dt(2000, 7), dt(2015, 7), dt(2020, 1), datetime(2024, 9, 30)]
+        values = [1, 10, 200, 100, 1000]
+        expected = [inflation_adj(v, d) for v, d in zip(values, dates)]
+
+        today = inflation_adj_many(pd.Series(values), pd.Series(pd.to_datetime(dates)))
+        np.testing.assert_allclose(today, expected)
+
+    def test_should_accept_numpy_arrays(self):
+        dates = np.array(["2000-07-10", "2020-01-10"], dtype="datetime64[ns]")
+        today = inflation_adj_many(np.array([10, 100]), dates)
+        self.assertIsInstance(today, np.ndarray)
+        np.testing.assert_allclose(today, [17, 120], atol=1)
+
+    def test_empty_input_should_yield_empty_array(self):
+        today = inflation_adj_many([], np.array([], dtype="datetime64[ns]"))
+        self.assertEqual(len(today), 0)
+
+    def test_invalid_values_should_raise_ValueError(self):
+        dates = pd.Series(pd.to_datetime([any_dt, any_dt]))
+
+        with self.assertRaises(ValueError):
+            inflation_adj_many([any_value, -1], dates)
+
+        with self.assertRaises(ValueError):
+            inflation_adj_many([any_value, float("nan")], dates)
+
+    def test_invalid_dates_should_raise_ValueError(self):
+        for invalid in [dt(1996, 12), dt(2024, 10), None]:
+            dates = pd.Series(pd.to_datetime([any_dt, invalid]))
+            with self.assertRaises(ValueError):
+                inflation_adj_many([any_value, any_value], dates)
+
+    def test_different_lengths_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            inflation_adj_many([any_value], pd.Series(pd.to_datetime([any_dt, any_dt])))
         
 
+class TestLoadIndex(unittest.TestCase):
+
+    def setUp(self):
+        # Força o recarregamento do índice a cada teste
+        inflation._index = None
+
+    def tearDown(self):
+        inflation._index = None
+
+    def test_should_match_csv(self):
+        min_date_id, cum_inflation = inflation.load_index()
+        df = pd.read_csv(inflation.HCPI_PATH)
+        self.assertEqual(len(cum_inflation), len(df))
+        self.assertEqual(min_date_id, 1997 * 12 + 1)
+        self.assertAlmostEqual(cum_inflation[0], 100 * (1 + df["inflation"][0] / 1200))
+
+    def test_cached_index_should_match_built_index(self):
+        inflation.load_index()
+        self.assertTrue(os.path.exists(inflation.CACHE_PATH))
+
+        inflation._index = None
+        cached = inflation.load_index()
+        built = inflation._build_index(inflation.HCPI_PATH)
+        self.assertEqual(cached[0], built[0])
+        np.testing.assert_array_equal(cached[1], built[1])
+
+    def test_should_work_from_other_directories(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                os.chdir(tmp)
+                self.assertEqual(inflation_adj(1000, dt(2024, 9)), 1000)
+            finally:
+                os.chdir(cwd)
+
+
 if __name__ == "__main__":
     unittest.main()
 
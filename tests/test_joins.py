@@ -0,0 +1,142 @@
+import unittest
+import pandas as pd
+import numpy as np
+from joins import assign_windows, encode_keys, estimate_rows, merge, semi_join
+
+
+def any_tables(n_events: int, n_keys: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+
+    # Janelas consecutivas por chave, como os períodos entre transferências
+    starts = np.sort(rng.integers(0, 5000, (n_keys, 4)), axis=1)
+    windows = pd.DataFrame({
+        "key": np.repeat(np.arange(n_keys), 4),
+        "start": pd.Timestamp(2000, 1, 1) + pd.to_timedelta(starts.ravel(), unit="D")
+    }).drop_duplicates()
+    windows["end"] = windows.groupby("key")["start"].shift(-1) - pd.Timedelta(days=1)
+    windows["window_id"] = np.arange(len(windows))
+
+    events = pd.DataFrame({
+        "key": rng.integers(0, n_keys, n_events),
+        "date": pd.Timestamp(2000, 1, 1) + pd.to_timedelta(rng.integers(0, 5000, n_events), unit="D")
+    })
+    return events, windows
+
+
+class TestAssignWindows(unittest.TestCase):
+
+    def test_should_match_cartesian_merge(self):
+        events, windows = any_tables(2000, 30)
+        expected = pd.merge(events, windows, on="key")
+        expected = expected.loc[(expected["date"] >= expected["start"]) & (expected["date"] <= expected["end"])]
+
+        result = assign_windows(events, windows, by="key", on="date", start="start", end="end")
+        self.assertGreater(len(result), 0)
+
+        columns = ["key", "date", "window_id"]
+        pd.testing.assert_frame_equal(
+            result[columns].sort_values(columns).reset_index(drop=True),
+            expected[columns].sort_values(columns).reset_index(drop=True)
+        )
+
+    def test_event_should_be_assigned_to_at_most_one_window(self):
+        events = pd.DataFrame({"key": [1, 1], "date": pd.to_datetime(["2010-01-01", "2011-01-01"])})
+        windows = pd.DataFrame({
+            "key": [1, 1],
+            "start": pd.to_datetime(["2009-01-01", "2010-01-01"]),
+            "end": pd.to_datetime(["2010-01-01", "2012-01-01"]),
+            "window_id": [0, 1]
+        })
+        result = assign_windows(events, windows, by="key", on="date", start="start", end="end")
+        self.assertEqual(list(result["window_id"]), [1, 1])
+
+    def test_events_outside_windows_should_be_dropped(self):
+        events = pd.DataFrame({"key": [1, 1, 2], "date": pd.to_datetime(["2008-01-01", "2013-01-01", "2010-01-01"])})
+        windows = pd.DataFrame({
+            "key": [1],
+            "start": pd.to_datetime(["2009-01-01"]),
+            "end": pd.to_datetime(["2012-01-01"])
+        })
+        result = assign_windows(events, windows, by="key", on="date", start="start", end="end")
+        self.assertEqual(len(result), 0)
+
+
+def keyed_tables(n_left: int, n_right: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    left = pd.DataFrame({
+        "game_id": rng.integers(0, 100, n_left),
+        "player_id": rng.integers(0, 20, n_left),
+        "a": rng.random(n_left)
+    })
+    right = pd.DataFrame({
+        "game_id": rng.integers(50, 150, n_right),
+        "player_id": rng.integers(0, 20, n_right),
+        "b": rng.random(n_right)
+    })
+    return left, right
+
+
+class TestEncodeKeys(unittest.TestCase):
+
+    def test_equal_keys_should_have_equal_codes(self):
+        left, right = keyed_tables(500, 300)
+        left_codes, right_codes, size = encode_keys(left, right, ["game_id", "player_id"])
+
+        keys = pd.concat([left, right])[["game_id", "player_id"]].drop_duplicates()
+        self.assertEqual(size, len(keys))
+        codes = np.concatenate([left_codes, right_codes])
+        pairs = pd.DataFrame({"code": codes, "game_id": np.concatenate([left["game_id"], right["game_id"]]),
+                              "player_id": np.concatenate([left["player_id"], right["player_id"]])})
+        self.assertEqual(len(pairs.drop_duplicates()), size)
+
+    def test_null_keys_should_be_encoded(self):
+        left = pd.DataFrame({"key": ["a", None, "b"]})
+        right = pd.DataFrame({"key": [None, "b"]})
+        left_codes, right_codes, size = encode_keys(left, right, "key")
+        self.assertEqual(size, 3)
+        self.assertEqual(left_codes[1], right_codes[0])
+
+
+class TestEstimateRows(unittest.TestCase):
+
+    def test_should_equal_merge_size(self):
+        left, right = keyed_tables(500, 300)
+        on = ["game_id", "player_id"]
+        left_codes, right_codes, size = encode_keys(left, right, on)
+        left_counts = np.bincount(left_codes, minlength=size)
+        right_counts = np.bincount(right_codes, minlength=size)
+        self.assertEqual(estimate_rows(left_counts, right_counts), len(pd.merge(left, right, on=on)))
+
+
+class TestSemiJoin(unittest.TestCase):
+
+    def test_should_keep_rows_with_keys_in_other(self):
+        left, right = keyed_tables(500, 300)
+        result = semi_join(left, right, "game_id")
+        pd.testing.assert_frame_equal(result, left.loc[left["game_id"].isin(right["game_id"])])
+
+
+class TestMerge(unittest.TestCase):
+
+    def test_should_equal_pandas_merge(self):
+        left, right = keyed_tables(2000, 300)
+        for how in ["inner", "left", "right", "outer"]:
+            for on in ["game_id", ["game_id", "player_id"]]:
+                with self.subTest(how=how, on=on):
+                    pd.testing.assert_frame_equal(merge(left, right, on=on, how=how), pd.merge(left, right, on=on, how=how))
+
+    def test_repeated_keys_should_equal_pandas_merge(self):
+        left, right = keyed_tables(2000, 2000)
+        left["game_id"] %= 60
+        for how in ["inner", "left", "right"]:
+            with self.subTest(how=how):
+                pd.testing.assert_frame_equal(merge(left, right, on="game_id", how=how), pd.merge(left, right, on="game_id", how=how))
+
+    def test_categorical_keys_should_equal_pandas_merge(self):
+        left = pd.DataFrame({"key": pd.Categorical(["a", "b", "c", "a"]), "a": range(4)})
+        right = pd.DataFrame({"key": pd.Categorical(["c", "a", "d"]), "b": range(3)})
+        pd.testing.assert_frame_equal(merge(left, right, on="key"), pd.merge(left, right, on="key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import pandas as pd
+import numpy as np
+from matches import match_outcome, game_outcomes
+
+
+def any_games() -> pd.DataFrame:
+    return pd.DataFrame({
+        "home_club_goals": [2, 1, 0, np.nan],
+        "away_club_goals": [0, 1, 3, np.nan]
+    })
+
+
+class TestMatchOutcome(unittest.TestCase):
+
+    def test_correct_inputs_should_match_expected(self):
+        result = match_outcome([3, 1, 0], [1, 1, 2])
+        self.assertEqual(list(result), ["Vitória", "Empate", "Derrota"])
+
+    def test_missing_goals_should_yield_null(self):
+        result = match_outcome(pd.Series([1, np.nan]), pd.Series([np.nan, 0]))
+        self.assertTrue(pd.isna(result).all())
+
+    def test_club_games_rows_should_work(self):
+        club_games = pd.DataFrame({"own_goals": [2, 0], "opponent_goals": [0, 2]})
+        result = match_outcome(club_games["own_goals"], club_games["opponent_goals"])
+        self.assertEqual(list(result), ["Vitória", "Derrota"])
+
+    def test_outcomes_should_be_ordered(self):
+        result = match_outcome([0, 1], [1, 1])
+        self.assertTrue(result[0] < result[1])
+
+
+class TestGameOutcomes(unittest.TestCase):
+
+    def test_home_and_away_perspectives_should_be_opposite(self):
+        home = game_outcomes(any_games(), perspective="home")
+        away = game_outcomes(any_games(), perspective="away")
+        self.assertEqual(list(home[:3]), ["Vitória", "Empate", "Derrota"])
+        self.assertEqual(list(away[:3]), ["Derrota", "Empate", "Vitória"])
+        self.assertTrue(pd.isna(home[3]) and pd.isna(away[3]))
+
+    def test_invalid_perspective_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            game_outcomes(any_games(), perspective="neutral")
+
+
+if __name__ == "__main__":
+    unittest.main()
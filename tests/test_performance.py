@@ -0,0 +1,97 @@
+import unittest
+import pandas as pd
+import numpy as np
+from performance import score, score_sums, merge_score_sums, score_sums_chunked, performance_from_sums, performance
+
+
+def any_appearances(n: int, n_players: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "player_id": rng.integers(0, n_players, n),
+        "yellow_cards": rng.binomial(2, .1, n),
+        "red_cards": rng.binomial(1, .02, n),
+        "goals": rng.binomial(3, .1, n),
+        "assists": rng.binomial(2, .1, n)
+    })
+
+
+# Cálculo original do desempenho, aplicado a cada grupo
+def calc_performance(group: pd.DataFrame) -> float:
+    return round(sum((-1)*group["yellow_cards"] + (-3)*group["red_cards"] + (8)*group["goals"] + (5)*group["assists"]) * 100 / group.shape[0], 4)
+
+
+class TestScore(unittest.TestCase):
+
+    def test_correct_inputs_should_match_expected(self):
+        df = pd.DataFrame({"yellow_cards": [1, 0], "red_cards": [1, 0], "goals": [2, 0], "assists": [1, 1]})
+        np.testing.assert_array_equal(score(df), [-1 - 3 + 16 + 5, 5])
+
+    def test_custom_weights_should_be_used(self):
+        df = pd.DataFrame({"goals": [2, 1], "minutes_played": [90, 45]})
+        np.testing.assert_array_equal(score(df, {"goals": 1, "minutes_played": .1}), [11, 5.5])
+
+
+class TestScoreSums(unittest.TestCase):
+
+    def test_should_sum_scores_and_count_games(self):
+        df = pd.DataFrame({
+            "player_id": [1, 2, 1],
+            "yellow_cards": [1, 0, 0],
+            "red_cards": [0, 0, 0],
+            "goals": [1, 0, 1],
+            "assists": [0, 1, 0]
+        })
+        sums = score_sums(df, ["player_id"])
+        self.assertEqual(list(sums.index), [1, 2])
+        self.assertEqual(list(sums["score"]), [15, 5])
+        self.assertEqual(list(sums["games"]), [2, 1])
+
+    def test_first_columns_should_be_kept(self):
+        df = any_appearances(10, 3).assign(price=lambda d: d["player_id"] * 10)
+        sums = score_sums(df, ["player_id"], first=["price"])
+        self.assertEqual(list(sums["price"]), list(sums.index * 10))
+
+
+class TestScoreSumsChunked(unittest.TestCase):
+
+    def test_merged_partials_should_match_single_aggregation(self):
+        df = any_appearances(1000, 50)
+        partials = [score_sums(df.iloc[i:i + 300], ["player_id"]) for i in range(0, len(df), 300)]
+        pd.testing.assert_frame_equal(merge_score_sums(partials), score_sums(df, ["player_id"]), check_dtype=False)
+
+    def test_chunks_should_match_single_aggregation(self):
+        df = any_appearances(1000, 50).assign(price=lambda d: d["player_id"] * 10)
+        chunks = (df.iloc[i:i + 128] for i in range(0, len(df), 128))
+        result = score_sums_chunked(chunks, ["player_id"], first=["price"])
+        expected = score_sums(df, ["player_id"], first=["price"])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        pd.testing.assert_series_equal(performance_from_sums(result), performance(df, ["player_id"]))
+
+    def test_prepare_should_be_applied_to_each_chunk(self):
+        df = any_appearances(100, 5)
+        chunks = (df.iloc[i:i + 10] for i in range(0, len(df), 10))
+        result = score_sums_chunked(chunks, ["player_id"], prepare=lambda chunk: chunk[chunk["player_id"] != 0])
+        self.assertNotIn(0, result.index)
+        self.assertEqual(result["games"].sum(), (df["player_id"] != 0).sum())
+
+    def test_no_chunks_should_return_empty(self):
+        result = score_sums_chunked(iter([]), ["player_id"])
+        self.assertTrue(result.empty)
+        self.assertEqual(list(result.columns), ["score", "games"])
+
+
+class TestPerformance(unittest.TestCase):
+
+    def test_should_match_groupby_apply(self):
+        df = any_appearances(5000, 300)
+        expected = df.groupby("player_id").apply(calc_performance, include_groups=False)
+        result = performance(df, ["player_id"])
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+
+    def test_scale_should_be_used(self):
+        df = any_appearances(100, 5)
+        np.testing.assert_allclose(performance(df, ["player_id"], scale=1) * 100, performance(df, ["player_id"]), atol=1e-2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from player_index import player_index, ages_at
+
+
+def any_players() -> pd.DataFrame:
+    return pd.DataFrame({
+        "player_id": [30, 10, 20, 10],
+        "name": ["C", "A", "B", "A (duplicado)"],
+        "date_of_birth": ["2000-03-01 00:00:00", "1990-01-15 00:00:00", None, "1980-01-01 00:00:00"]
+    })
+
+
+class TestPlayerIndex(unittest.TestCase):
+
+    def test_should_be_indexed_and_sorted_by_id(self):
+        index = player_index(any_players())
+        self.assertEqual(list(index.index), [10, 20, 30])
+
+    def test_duplicated_ids_should_keep_first_occurrence(self):
+        index = player_index(any_players())
+        self.assertEqual(index.loc[10, "name"], "A")
+
+    def test_birth_dates_should_be_parsed(self):
+        index = player_index(any_players())
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(index["date_of_birth"]))
+        self.assertEqual(index.loc[30, "date_of_birth"], pd.Timestamp(2000, 3, 1))
+        self.assertTrue(pd.isna(index.loc[20, "date_of_birth"]))
+
+
+class TestAgesAt(unittest.TestCase):
+
+    def test_correct_inputs_should_match_expected(self):
+        index = player_index(any_players())
+        dates = pd.Series(pd.to_datetime(["2010-01-15 00:00", "2020-03-01 18:00"]))
+        ages = ages_at(index, [10, 30], dates)
+
+        expected = [
+            (datetime(2010, 1, 15).date() - datetime(1990, 1, 15).date()).days / 365,
+            (datetime(2020, 3, 1).date() - datetime(2000, 3, 1).date()).days / 365
+        ]
+        np.testing.assert_allclose(ages, expected)
+
+    def test_unknown_player_or_birth_date_should_yield_nan(self):
+        index = player_index(any_players())
+        dates = pd.Series(pd.to_datetime(["2010-01-01", "2010-01-01", "2010-01-01"]))
+        ages = ages_at(index, [20, 99, 10], dates)
+
+        self.assertTrue(np.isnan(ages[0]))
+        self.assertTrue(np.isnan(ages[1]))
+        self.assertFalse(np.isnan(ages[2]))
+
+    def test_empty_input_should_yield_empty_array(self):
+        index = player_index(any_players())
+        ages = ages_at(index, [], np.array([], dtype="datetime64[ns]"))
+        self.assertEqual(len(ages), 0)
+
+    def test_empty_index_should_yield_nan(self):
+        index = player_index(any_players().iloc[:0])
+        dates = pd.Series(pd.to_datetime(["2010-01-01", "2010-01-01"]))
+        ages = ages_at(index, [10, 20], dates)
+        self.assertTrue(np.isnan(ages).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
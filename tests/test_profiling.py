@@ -0,0 +1,116 @@
+import unittest
+import pandas as pd
+import numpy as np
+import tempfile
+import pstats
+import os
+import profiling
+
+
+class TestStage(unittest.TestCase):
+
+    def setUp(self):
+        profiling.reset()
+
+    def tearDown(self):
+        profiling.reset()
+
+    def test_should_record_time_and_rows(self):
+        with profiling.stage("test.stage", rows_in=10) as s:
+            s.rows_out = 3
+
+        record, = profiling.RECORDS
+        self.assertEqual(record.name, "test.stage")
+        self.assertEqual((record.rows_in, record.rows_out), (10, 3))
+        self.assertGreaterEqual(record.seconds, 0)
+        self.assertIsNone(record.peak_traced_mb)
+
+    def test_nested_stages_should_be_recorded_in_start_order(self):
+        with profiling.stage("outer"):
+            with profiling.stage("inner"):
+                pass
+
+        self.assertEqual([r.name for r in profiling.RECORDS], ["outer", "inner"])
+        self.assertEqual([r.depth for r in profiling.RECORDS], [0, 1])
+        self.assertEqual(list(profiling.summary()["stage"]), ["outer", "  inner"])
+
+    def test_failed_stage_should_be_recorded(self):
+        with self.assertRaises(KeyError):
+            with profiling.stage("failed"):
+                raise KeyError("x")
+
+        self.assertIsNotNone(profiling.RECORDS[0].seconds)
+        with profiling.stage("next"):
+            pass
+        self.assertEqual(profiling.RECORDS[1].depth, 0)
+
+    def test_trace_memory_should_measure_allocations(self):
+        profiling.enable(trace_memory=True)
+        with profiling.stage("allocate"):
+            data = np.ones(4 * 1024 ** 2 // 8)
+
+        self.assertGreaterEqual(profiling.RECORDS[0].peak_traced_mb, 4)
+        del data
+
+    def test_nested_stage_should_not_reset_outer_peak(self):
+        profiling.enable(trace_memory=True)
+        with profiling.stage("outer"):
+            data = np.ones(8 * 1024 ** 2 // 8)
+            del data
+            with profiling.stage("inner"):
+                small = np.ones(1024)
+
+        outer, inner = profiling.RECORDS
+        self.assertGreaterEqual(outer.peak_traced_mb, 8)
+        self.assertLess(inner.peak_traced_mb, 8)
+
+    def test_inner_peak_should_be_folded_into_outer(self):
+        profiling.enable(trace_memory=True)
+        with profiling.stage("outer"):
+            with profiling.stage("inner"):
+                data = np.ones(8 * 1024 ** 2 // 8)
+                del data
+
+        outer, inner = profiling.RECORDS
+        self.assertGreaterEqual(inner.peak_traced_mb, 8)
+        self.assertGreaterEqual(outer.peak_traced_mb, inner.peak_traced_mb)
+
+    def test_rss_growth_should_be_per_stage(self):
+        with profiling.stage("allocate"):
+            data = np.ones(64 * 1024 ** 2 // 8)
+            data[:] = 2
+        del data
+        with profiling.stage("small"):
+            pass
+
+        allocate, small = profiling.RECORDS
+        if allocate.rss_growth_mb is None:
+            self.skipTest("Sistema sem o módulo resource")
+        self.assertGreaterEqual(small.rss_growth_mb, 0)
+        self.assertLess(small.rss_growth_mb, 1)
+
+    def test_profile_should_be_dumped(self):
+        with self.assertRaises(ValueError):
+            profiling.dump_profile("unused")
+
+        profiling.enable(profile=True)
+        with profiling.stage("profiled"):
+            sorted(range(1000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats")
+            profiling.dump_profile(path)
+            functions = [f[2] for f in pstats.Stats(path).stats]
+        self.assertIn("<built-in method builtins.sorted>", functions)
+
+
+class TestRows(unittest.TestCase):
+
+    def test_should_count_rows(self):
+        self.assertEqual(profiling.rows(pd.DataFrame({"a": [1, 2]})), 2)
+        self.assertEqual(profiling.rows((np.zeros(3), 0.5)), 3)
+        self.assertIsNone(profiling.rows(0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+import importlib
+import sys
+import pandas as pd
+import numpy as np
+import tempfile
+import contextlib
+import io
+import os
+import data_loader
+import inflation
+import profiling
+import result_cache
+import runner
+import synthetic
+import hyp_buybacks
+
+
+def local_function(x):
+    return hyp_buybacks.find_age(x, 1, None)
+
+
+class TestCacheKey(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "input.csv")
+        with open(self.path, "w") as file:
+            file.write("a\n1\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_inputs_should_give_same_key(self):
+        self.assertEqual(
+            result_cache.cache_key(local_function, [self.path], {"a": 1}),
+            result_cache.cache_key(local_function, [self.path], {"a": 1})
+        )
+
+    def test_params_and_functions_should_change_key(self):
+        key = result_cache.cache_key(local_function, [self.path], {"a": 1})
+        self.assertNotEqual(key, result_cache.cache_key(local_function, [self.path], {"a": 2}))
+        self.assertNotEqual(key, result_cache.cache_key(hyp_buybacks.compute, [self.path], {"a": 1}))
+
+    def test_modified_file_should_change_key(self):
+        key = result_cache.cache_key(local_function, [self.path])
+        with open(self.path, "a") as file:
+            file.write("2\n")
+        self.assertNotEqual(key, result_cache.cache_key(local_function, [self.path]))
+
+    def write_module(self, helper_body: str):
+        with open(os.path.join(self.tmp.name, "cached_module.py"), "w") as file:
+            file.write(f"WEIGHT = 2\n\ndef helper(x):\n    return {helper_body}\n\n"
+                       "def plot(x):\n    return x\n\ndef compute(x):\n    return helper(x) * WEIGHT\n")
+        sys.modules.pop("cached_module", None)
+        return importlib.import_module("cached_module")
+
+    def test_digest_should_include_referenced_local_code(self):
+        source_dir = result_cache.SOURCE_DIR
+        result_cache.SOURCE_DIR = self.tmp.name
+        sys.path.insert(0, self.tmp.name)
+        try:
+            module = self.write_module("x + 1")
+            digest = result_cache.code_digest(module.compute)
+
+            # Alterações em funções não usadas não mudam o hash
+            module.plot = lambda x: x * 2
+            self.assertEqual(digest, result_cache.code_digest(module.compute))
+
+            module = self.write_module("x + 2")
+            self.assertNotEqual(digest, result_cache.code_digest(module.compute))
+        finally:
+            result_cache.SOURCE_DIR = source_dir
+            sys.path.remove(self.tmp.name)
+            sys.modules.pop("cached_module", None)
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = data_loader.CACHE_DIR
+        data_loader.CACHE_DIR = self.tmp.name
+
+    def tearDown(self):
+        data_loader.CACHE_DIR = self.cache_dir
+        self.tmp.cleanup()
+
+    def test_missing_key_should_not_hit(self):
+        self.assertEqual(result_cache.get("missing"), (False, None))
+
+    def test_values_should_round_trip(self):
+        df = pd.DataFrame({"a": [1, 2], "b": pd.Categorical(["x", "y"])})
+        result_cache.put("frame", df)
+        result_cache.put("tuple", (df, 0.5))
+
+        hit, value = result_cache.get("frame")
+        self.assertTrue(hit)
+        pd.testing.assert_frame_equal(value, df)
+
+        hit, (value, v) = result_cache.get("tuple")
+        pd.testing.assert_frame_equal(value, df)
+        self.assertEqual(v, 0.5)
+
+    def test_least_recently_used_should_be_evicted(self):
+        payload = np.zeros(1000)
+        for i, key in enumerate(["a", "b", "c"]):
+            result_cache.put(key, payload)
+            path = result_cache._path(key)
+            os.utime(path, ns=(i * 10 ** 9, i * 10 ** 9))
+
+        # Usar "a" o torna o mais recente; "b" passa a ser o mais antigo
+        result_cache.get("a")
+        size = os.path.getsize(result_cache._path("a"))
+        result_cache.evict(2 * size)
+
+        self.assertTrue(result_cache.get("a")[0])
+        self.assertFalse(result_cache.get("b")[0])
+        self.assertTrue(result_cache.get("c")[0])
+
+        result_cache.clear()
+        self.assertFalse(result_cache.get("a")[0])
+
+
+class TestRunnerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dirs = data_loader.DATA_DIRS
+        self.cache_dir = data_loader.CACHE_DIR
+        data_loader.DATA_DIRS = [self.tmp.name]
+        data_loader.CACHE_DIR = os.path.join(self.tmp.name, "cache")
+        synthetic.write_csvs(synthetic.generate(1000), self.tmp.name)
+
+        # `present` salva alguns resultados no diretório atual
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        data_loader.DATA_DIRS = self.dirs
+        data_loader.CACHE_DIR = self.cache_dir
+        self.tmp.cleanup()
+
+    def run_quietly(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = runner.run(["hyp_cost_benefit", "hyp_performance"], plot=False, **kwargs)
+        return results, [r.name for r in profiling.RECORDS]
+
+    def test_second_run_should_be_served_from_cache(self):
+        first, stages = self.run_quietly()
+        self.assertIn("hyp_cost_benefit.compute", stages)
+
+        second, stages = self.run_quietly()
+        self.assertNotIn("hyp_cost_benefit.compute", stages)
+        self.assertNotIn("runner.load", stages)
+        pd.testing.assert_frame_equal(second["hyp_cost_benefit"], first["hyp_cost_benefit"])
+        pd.testing.assert_frame_equal(second["hyp_performance"][1], first["hyp_performance"][1])
+
+        _, stages = self.run_quietly(cache=False)
+        self.assertIn("hyp_cost_benefit.compute", stages)
+
+    def test_modified_source_should_be_recomputed(self):
+        self.run_quietly()
+        path = data_loader.source_path("transfers")
+        os.utime(path, ns=(0, 0))
+
+        _, stages = self.run_quietly()
+        self.assertIn("hyp_cost_benefit.compute", stages)
+        self.assertNotIn("hyp_performance.compute", stages)
+
+    def test_modified_inflation_index_should_be_recomputed(self):
+        self.run_quietly()
+        stat = os.stat(inflation.HCPI_PATH)
+        try:
+            os.utime(inflation.HCPI_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            _, stages = self.run_quietly()
+        finally:
+            os.utime(inflation.HCPI_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertIn("hyp_cost_benefit.compute", stages)
+        self.assertIn("hyp_performance.compute", stages)
+
+
+if __name__ == "__main__":
+    unittest.main()
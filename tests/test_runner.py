@@ -0,0 +1,109 @@
+import unittest
+import pandas as pd
+import numpy as np
+import tempfile
+import contextlib
+import io
+import os
+import data_loader
+import runner
+
+
+class TestRun(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dirs = data_loader.DATA_DIRS
+        self.cache_dir = data_loader.CACHE_DIR
+        data_loader.DATA_DIRS = [self.tmp.name]
+        data_loader.CACHE_DIR = os.path.join(self.tmp.name, "cache")
+
+        pd.DataFrame({
+            "player_id": [1, 2, 3, 4],
+            "name": ["A", "B", "C", "D"],
+            "country_of_citizenship": "Brazil",
+            "date_of_birth": ["2000-01-05", "1999-01-20", "2001-03-02", None],
+            "sub_position": "Centre-Forward",
+            "position": "Attack",
+            "market_value_in_eur": 1_000_000
+        }).to_csv(os.path.join(self.tmp.name, "players.csv"), index=False)
+
+        pd.DataFrame({
+            "game_id": [1, 2, 3, 4],
+            "competition_id": "BRA1",
+            "season": 2024,
+            "date": "2024-05-01",
+            "home_club_id": [10, 11, 12, 13],
+            "away_club_id": [20, 21, 22, 23],
+            "home_club_goals": [1, 0, 2, 1],
+            "away_club_goals": [0, 0, 3, 2],
+            "competition_type": ["domestic_league", "domestic_league", "international_cup", "international_cup"]
+        }).to_csv(os.path.join(self.tmp.name, "games.csv"), index=False)
+
+    def tearDown(self):
+        data_loader.DATA_DIRS = self.dirs
+        data_loader.CACHE_DIR = self.cache_dir
+        self.tmp.cleanup()
+
+    def run_quietly(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return runner.run(*args, **kwargs)
+
+    def test_should_return_compute_results(self):
+        results = self.run_quietly(["hyp_birth_month", "hyp_performance_abroad"], plot=False)
+        self.assertEqual(list(results), ["hyp_birth_month", "hyp_performance_abroad"])
+
+        month_frequency = results["hyp_birth_month"]
+        self.assertEqual(list(month_frequency["month_of_birth"]), list(range(1, 13)))
+        self.assertEqual(list(month_frequency["count"]), [2, 0, 1] + [0] * 9)
+
+        games_freq, v = results["hyp_performance_abroad"]
+        self.assertEqual(games_freq["count"].sum(), 4)
+        self.assertAlmostEqual(v, 1)
+
+    def test_parallel_run_should_match_serial_run(self):
+        names = ["hyp_birth_month", "hyp_performance_abroad"]
+        serial = self.run_quietly(names, plot=False)
+        parallel = self.run_quietly(names, plot=False, jobs=2)
+        pd.testing.assert_frame_equal(parallel["hyp_birth_month"], serial["hyp_birth_month"])
+        pd.testing.assert_frame_equal(parallel["hyp_performance_abroad"][0], serial["hyp_performance_abroad"][0])
+        self.assertEqual(parallel["hyp_performance_abroad"][1], serial["hyp_performance_abroad"][1])
+
+    def test_unknown_hypothesis_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            runner.run(["hyp_unknown"], plot=False)
+
+    def test_cli_should_run_hypotheses(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            runner.main(["run", "hyp_birth_month", "--no-plot"])
+        self.assertIn("hyp_birth_month.aggregate", out.getvalue())
+
+    def test_cli_should_reject_unknown_hypothesis(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            runner.main(["run", "hyp_unknown"])
+
+
+class TestRequiredTables(unittest.TestCase):
+
+    def test_should_merge_columns_of_each_table(self):
+        required = runner.required_tables(["hyp_performance", "hyp_buybacks", "hyp_cost_benefit"])
+        self.assertEqual(required["appearances"],
+                         ["player_id", "player_name", "yellow_cards", "red_cards", "goals", "assists", "date"])
+        self.assertIsNone(required["transfers"])
+        self.assertIsNone(required["player_valuations"])
+        self.assertEqual(required["players"], ["player_id", "date_of_birth"])
+
+    def test_shared_columns_should_not_be_copied(self):
+        df = pd.DataFrame({"a": np.arange(10), "b": np.arange(10.), "c": np.arange(10)})
+        subset = runner._columns(df, ["c", "a"])
+        self.assertEqual(list(subset.columns), ["c", "a"])
+        for column in ["a", "c"]:
+            self.assertTrue(np.shares_memory(subset[column].to_numpy(), df[column].to_numpy()))
+
+    def test_chunked_tables_should_be_skipped(self):
+        required = runner.required_tables(["hyp_performance"], chunksize=1000)
+        self.assertEqual(list(required), ["player_valuations"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
 import pandas as pd
 import numpy as np
-from summary_statistics import chi2, contingency_coeff, cramer_v
+from types import SimpleNamespace
+from summary_statistics import QuantileSketch, association_test, binned_quantiles, permuted_tables, chi2, chi2_many, contingency_coeff, cramer_v, cramer_v_from_columns, cramer_v_many
 
 
 # https://stackoverflow.com/a/32752318
@@ -198,5 +199,273 @@ class TestCramerV(unittest.TestCase):
         self.assertAlmostEqual(cramer_v(df), 0.2, delta=.1)
 
 
+# Matriz esparsa no formato COO, com a mesma interface das do `scipy.sparse`
+def to_coo(table: np.ndarray) -> SimpleNamespace:
+    row, col = np.nonzero(table)
+    return SimpleNamespace(row=row, col=col, data=table[row, col], shape=table.shape)
+
+
+class TestSparseInputs(unittest.TestCase):
+
+    def test_numpy_array_should_match_DataFrame(self):
+        for i in range(10):
+            df = any_df(any_m, any_n)
+            self.assertAlmostEqual(chi2(df.to_numpy()), chi2(df))
+            self.assertAlmostEqual(cramer_v(df.to_numpy()), cramer_v(df))
+            self.assertAlmostEqual(contingency_coeff(df.to_numpy()), contingency_coeff(df))
+
+    def test_coo_matrix_should_match_dense_table(self):
+        for i in range(10):
+            table = any_df(any_m, any_n).to_numpy()
+            self.assertAlmostEqual(chi2(to_coo(table)), chi2(table))
+            self.assertAlmostEqual(cramer_v(to_coo(table)), cramer_v(table))
+
+    def test_repeated_coo_entries_should_be_summed(self):
+        coo = SimpleNamespace(row=[0, 0, 1, 1, 0], col=[0, 1, 0, 1, 0], data=[5, 2, 1, 8, 5], shape=(2, 2))
+        self.assertAlmostEqual(chi2(coo), chi2(np.array([[10, 2], [1, 8]])))
+
+    def test_empty_cells_should_match_dense_computation(self):
+        table = np.array([[0, 5, 0, 1], [3, 0, 0, 7], [0, 0, 0, 2]])
+        exp = table.sum(axis=1).reshape(-1, 1) @ table.sum(axis=0).reshape(1, -1) / table.sum()
+        mask = exp > 0
+        expected = (np.square(table - exp)[mask] / exp[mask]).sum()
+
+        self.assertAlmostEqual(chi2(table), expected)
+        self.assertAlmostEqual(chi2(to_coo(table)), expected)
+
+    def test_less_than_two_rows_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            chi2(np.ones((1, 3)))
+
+        with self.assertRaises(ValueError):
+            chi2(SimpleNamespace(row=[0], col=[0], data=[1], shape=(1, 3)))
+
+    def test_not_numeric_data_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            chi2(np.array([["A", "B"], ["C", "D"]]))
+
+        with self.assertRaises(ValueError):
+            chi2(np.array([[True, False], [False, True]]))
+
+
+class TestChi2Many(unittest.TestCase):
+
+    def test_should_match_chi2_of_each_table(self):
+        tables = [any_df(any_m, any_n) for i in range(20)]
+        expected = [chi2(df) for df in tables]
+        np.testing.assert_allclose(chi2_many(tables), expected)
+
+    def test_cramer_v_should_match_each_table(self):
+        tables = np.stack([any_df(any_m, 4).to_numpy() for i in range(20)])
+        expected = [cramer_v(table) for table in tables]
+        np.testing.assert_allclose(cramer_v_many(tables), expected)
+
+    def test_no_association_should_yield_zero(self):
+        table = np.array([[0, 0, 0], [1, 3, 0], [2, 6, 0], [3, 9, 0]])
+        np.testing.assert_array_equal(chi2_many([table, 2 * table]), [0, 0])
+
+    def test_invalid_shapes_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            chi2_many(np.ones((3, 3)))
+
+        with self.assertRaises(ValueError):
+            chi2_many(np.ones((3, 1, 3)))
+
+
+class TestCramerVFromColumns(unittest.TestCase):
+
+    def test_should_match_pivot_table(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            "result": rng.choice(["Vitória", "Empate", "Derrota"], 1000),
+            "is_international": rng.random(1000) < .3
+        })
+        pivot = df.groupby(["result", "is_international"]).size().reset_index(name="count") \
+            .pivot_table(index="result", columns="is_international", values="count")
+
+        self.assertAlmostEqual(cramer_v_from_columns(df["result"], df["is_international"]), cramer_v(pivot))
+
+    def test_categorical_and_numpy_inputs_should_work(self):
+        a = pd.Series(["x", "y", "x", "y", "x"], dtype="category")
+        b = np.array([1, 2, 1, 2, 2])
+        self.assertAlmostEqual(cramer_v_from_columns(a, b), cramer_v(np.array([[2, 1], [0, 2]])))
+
+    def test_missing_values_should_be_ignored(self):
+        a = pd.Series(["x", "y", None, "x", "y"])
+        b = pd.Series([1, 2, 1, np.nan, 1])
+        self.assertAlmostEqual(cramer_v_from_columns(a, b), cramer_v(np.array([[1, 0], [1, 1]])))
+
+    def test_different_lengths_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            cramer_v_from_columns([1, 2, 3], [1, 2])
+
+    def test_single_category_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            cramer_v_from_columns(["x", "x", "x"], [1, 2, 3])
+
+
+# Implementação com uma máscara e três chamadas de `quantile` por faixa, como
+# no laço original de `hyp_performance.calc_bands`
+def binned_quantiles_loop(values: pd.Series, by: pd.Series, edges) -> pd.DataFrame:
+    rows = []
+    for inf, sup in zip(edges[:-1], edges[1:]):
+        band = values[(by >= inf) & (by < sup)]
+        rows.append([band.quantile(0.25), band.quantile(0.5), band.quantile(0.75)])
+    return pd.DataFrame(rows, columns=[0.25, 0.5, 0.75])
+
+
+class TestBinnedQuantiles(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.by = pd.Series(rng.normal(15, 2, 3000))
+        self.values = pd.Series(rng.gamma(2, 100, 3000))
+
+    def test_should_equal_quantile_per_band(self):
+        edges = 15 + np.arange(-6, 5)
+        expected = binned_quantiles_loop(self.values, self.by, edges)
+        result = binned_quantiles(self.values, self.by, edges)
+        pd.testing.assert_frame_equal(result[[0.25, 0.5, 0.75]], expected, check_column_type=False)
+
+    def test_fine_bins_should_equal_quantile_per_band(self):
+        edges = np.linspace(8, 22, 200)
+        expected = binned_quantiles_loop(self.values, self.by, edges)
+        result = binned_quantiles(self.values, self.by, edges)
+        pd.testing.assert_frame_equal(result[[0.25, 0.5, 0.75]], expected, check_column_type=False)
+
+    def test_should_return_empty_bands(self):
+        result = binned_quantiles([1., 2., 3.], [0.5, 0.5, 2.5], [0, 1, 2, 3], q=[0.5])
+        self.assertEqual(list(result["count"]), [2, 0, 1])
+        self.assertEqual(result.loc[0, 0.5], 1.5)
+        self.assertTrue(np.isnan(result.loc[1, 0.5]))
+        self.assertEqual(list(result["center"]), [0.5, 1.5, 2.5])
+
+    def test_bin_count_should_include_maximum(self):
+        result = binned_quantiles(self.values, self.by, 7)
+        self.assertEqual(len(result), 7)
+        self.assertEqual(result["count"].sum(), len(self.values))
+
+    def test_nulls_should_be_ignored(self):
+        result = binned_quantiles([1., np.nan, 3.], [0.5, 0.5, np.nan], [0, 1], q=[0.5])
+        self.assertEqual(list(result["count"]), [1])
+        self.assertEqual(result.loc[0, 0.5], 1.)
+
+    def test_invalid_edges_should_raise(self):
+        with self.assertRaises(ValueError):
+            binned_quantiles([1.], [1.], [2, 1])
+        with self.assertRaises(ValueError):
+            binned_quantiles([1.], [1.], [0, 1], q=[1.5])
+        with self.assertRaises(ValueError):
+            binned_quantiles([1., 2.], [1.], [0, 1])
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.values = np.concatenate([rng.lognormal(12, 2, 20000), -rng.lognormal(3, 1, 2000), np.zeros(50)])
+        rng.shuffle(self.values)
+        self.q = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1]
+
+    def test_quantiles_should_have_bounded_relative_error(self):
+        sketch = QuantileSketch(relative_accuracy=0.01).update(self.values)
+        expected = np.quantile(self.values, self.q, method="lower")
+        error = np.abs(sketch.quantile(self.q) - expected) / np.abs(expected)
+        self.assertLessEqual(error.max(), 0.01 + 1e-9)
+
+    def test_merged_partitions_should_equal_single_sketch(self):
+        single = QuantileSketch().update(self.values)
+        merged = QuantileSketch()
+        for chunk in np.array_split(self.values, 5):
+            merged.merge(QuantileSketch().update(chunk))
+        np.testing.assert_array_equal(merged.quantile(self.q), single.quantile(self.q))
+        self.assertEqual(merged.count, len(self.values))
+
+    def test_describe_should_match_pandas(self):
+        sketch = QuantileSketch().update(pd.Series(self.values))
+        result = sketch.describe()
+        expected = pd.Series(self.values).describe()
+        for stat in ["count", "mean", "std", "min", "max"]:
+            self.assertAlmostEqual(result[stat] / expected[stat], 1, places=6)
+        for stat in ["25%", "50%", "75%"]:
+            self.assertAlmostEqual(result[stat] / expected[stat], 1, delta=0.02)
+
+    def test_max_bins_should_bound_memory(self):
+        sketch = QuantileSketch(max_bins=500).update(self.values)
+        self.assertLessEqual(len(sketch._positive[0]), 500)
+
+        # Apenas as faixas de menor módulo são unidas
+        expected = np.quantile(self.values, [0.75, 0.99], method="lower")
+        np.testing.assert_allclose(sketch.quantile([0.75, 0.99]), expected, rtol=0.01)
+
+    def test_empty_sketch_should_return_null(self):
+        sketch = QuantileSketch().update([np.nan])
+        self.assertTrue(np.isnan(sketch.quantile(0.5)))
+        self.assertEqual(sketch.count, 0)
+
+    def test_invalid_arguments_should_raise(self):
+        with self.assertRaises(ValueError):
+            QuantileSketch(relative_accuracy=1.5)
+        with self.assertRaises(ValueError):
+            QuantileSketch().quantile(2)
+        with self.assertRaises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+class TestPermutedTables(unittest.TestCase):
+
+    def test_should_keep_margins(self):
+        table = np.array([[30, 10, 5], [10, 30, 20], [0, 4, 9]])
+        tables = permuted_tables(table, 500, np.random.default_rng(0))
+        self.assertEqual(tables.shape, (500, 3, 3))
+        np.testing.assert_array_equal(tables.sum(axis=2), np.tile(table.sum(axis=1), (500, 1)))
+        np.testing.assert_array_equal(tables.sum(axis=1), np.tile(table.sum(axis=0), (500, 1)))
+        self.assertTrue((tables >= 0).all())
+
+    def test_mean_should_equal_expected_frequencies(self):
+        table = np.array([[30, 10], [10, 30]])
+        tables = permuted_tables(table, 20000, np.random.default_rng(0))
+        np.testing.assert_allclose(tables.mean(axis=0), [[20, 20], [20, 20]], rtol=0.02)
+
+
+class TestAssociationTest(unittest.TestCase):
+
+    def test_strong_association_should_be_significant(self):
+        result = association_test(np.array([[30, 10, 5], [10, 30, 20]]), n_resamples=2000, seed=0)
+        self.assertAlmostEqual(result["chi2"], chi2(np.array([[30, 10, 5], [10, 30, 20]])))
+        self.assertLess(result["p_value"], 0.01)
+        self.assertLess(result["ci_low"], result["cramer_v"])
+        self.assertGreater(result["ci_high"], result["cramer_v"])
+
+    def test_independent_variables_should_not_be_significant(self):
+        rng = np.random.default_rng(0)
+        a, b = rng.integers(0, 3, 2000), rng.integers(0, 2, 2000)
+        table = pd.crosstab(a, b)
+        for null in ["permutation", "multinomial"]:
+            with self.subTest(null=null):
+                result = association_test(table, n_resamples=2000, null=null, seed=0)
+                self.assertGreater(result["p_value"], 0.05)
+                self.assertAlmostEqual(result["cramer_v"], cramer_v(table))
+
+    def test_result_should_not_depend_on_jobs(self):
+        table = np.array([[12, 8], [7, 13], [5, 5]])
+        serial = association_test(table, n_resamples=2500, seed=1)
+        parallel = association_test(table, n_resamples=2500, seed=1, jobs=2)
+        pd.testing.assert_series_equal(serial, parallel)
+
+    def test_empty_rows_should_be_ignored(self):
+        table = np.array([[12, 8], [0, 0], [7, 13]])
+        result = association_test(table, n_resamples=100, seed=0)
+        self.assertAlmostEqual(result["cramer_v"], cramer_v(np.array([[12, 8], [7, 13]])))
+
+    def test_invalid_inputs_should_raise(self):
+        with self.assertRaises(ValueError):
+            association_test(np.array([[1.5, 2], [3, 4]]))
+        with self.assertRaises(ValueError):
+            association_test(np.array([[1, 2], [3, 4]]), null="bootstrap")
+        with self.assertRaises(ValueError):
+            association_test(np.array([[1, 0], [3, 0]]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import pandas as pd
+import tempfile
+import importlib
+import os
+import data_loader
+import runner
+import synthetic
+
+
+class TestGenerate(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = synthetic.generate(2000, seed=1)
+
+    def test_should_match_declared_schemas(self):
+        self.assertEqual(set(self.tables), set(data_loader.SCHEMAS))
+        for table, df in self.tables.items():
+            schema = data_loader.SCHEMAS[table]
+            self.assertEqual(list(df.columns), list(schema), table)
+            for column, dtype in schema.items():
+                self.assertEqual(df[column].dtype, dtype, f"{table}.{column}")
+
+    def test_sizes_should_follow_ratios(self):
+        self.assertLessEqual(len(self.tables["appearances"]), 2000)
+        self.assertEqual(len(self.tables["players"]), 2000 * synthetic.RATIOS["players"])
+        self.assertEqual(len(self.tables["club_games"]), 2 * len(self.tables["games"]))
+
+    def test_same_seed_should_generate_same_tables(self):
+        other = synthetic.generate(2000, seed=1)
+        for table, df in self.tables.items():
+            pd.testing.assert_frame_equal(df, other[table])
+
+    def test_appearances_should_not_repeat_pairs(self):
+        self.assertFalse(self.tables["appearances"].duplicated(["game_id", "player_id"]).any())
+
+    def test_transfers_should_chain_clubs(self):
+        transfers = self.tables["transfers"]
+        same = transfers["player_id"].shift(-1) == transfers["player_id"]
+        self.assertTrue((transfers["to_club_id"][same].to_numpy() == transfers["from_club_id"].shift(-1)[same].to_numpy()).all())
+
+    def test_every_hypothesis_should_compute(self):
+        for name in runner.HYPOTHESES:
+            module = importlib.import_module(name)
+            inputs = {t: self.tables[t] if c is None else self.tables[t][c] for t, c in module.TABLES.items()}
+            self.assertIsNotNone(module.compute(inputs), name)
+
+    def test_small_scale_should_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            synthetic.generate(10)
+
+
+class TestWriteCsvs(unittest.TestCase):
+
+    def test_should_be_readable_by_data_loader(self):
+        tables = synthetic.generate(1000)
+        with tempfile.TemporaryDirectory() as tmp:
+            synthetic.write_csvs(tables, tmp)
+            dirs = data_loader.DATA_DIRS
+            data_loader.DATA_DIRS = [tmp]
+            try:
+                for table, df in tables.items():
+                    pd.testing.assert_frame_equal(data_loader.load(table, cache=False), df, check_categorical=False)
+            finally:
+                data_loader.DATA_DIRS = dirs
+
+
+if __name__ == "__main__":
+    unittest.main()
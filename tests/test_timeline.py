@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import numpy as np
+import data_loader
+import timeline
+from timeline import Timeline
+
+
+def any_valuations(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "player_id": rng.integers(0, 200, n).astype("int32"),
+        "date": pd.Timestamp(2010, 1, 1) + pd.to_timedelta(rng.integers(0, 5000, n), unit="D"),
+        "market_value_in_eur": rng.integers(1, 1000, n) * 10_000.
+    })
+
+
+class TestTimeline(unittest.TestCase):
+
+    def setUp(self):
+        self.valuations = any_valuations(3000)
+        self.timeline = Timeline.from_frame(self.valuations, order="date")
+
+    def test_get_should_return_player_history_in_order(self):
+        for player_id in [0, 57, 199]:
+            expected = self.valuations.loc[self.valuations["player_id"] == player_id].sort_values("date", kind="stable")
+            result = self.timeline.get(player_id)
+            np.testing.assert_array_equal(result["date"], expected["date"])
+            np.testing.assert_array_equal(result["market_value_in_eur"], expected["market_value_in_eur"])
+
+    def test_unknown_player_should_have_empty_history(self):
+        self.assertEqual(self.timeline.position(1000), -1)
+        self.assertTrue(self.timeline.get(1000).empty)
+
+    def test_reduce_should_equal_groupby(self):
+        grouped = self.valuations.groupby("player_id")["market_value_in_eur"]
+        pd.testing.assert_series_equal(self.timeline.reduce("market_value_in_eur"), grouped.sum(), check_names=False)
+        pd.testing.assert_series_equal(self.timeline.reduce("market_value_in_eur", np.maximum), grouped.max(), check_names=False)
+        np.testing.assert_array_equal(self.timeline.counts(), grouped.size())
+
+    def test_last_should_point_to_latest_row(self):
+        latest = self.valuations.groupby("player_id")["date"].max()
+        np.testing.assert_array_equal(self.timeline["date"][self.timeline.last()], latest)
+
+    def test_saved_timeline_should_be_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.timeline.save(tmp)
+            read = Timeline.read(tmp)
+            self.assertIsInstance(read["market_value_in_eur"], np.memmap)
+            np.testing.assert_array_equal(read.player_ids, self.timeline.player_ids)
+            pd.testing.assert_series_equal(read.reduce("market_value_in_eur"), self.timeline.reduce("market_value_in_eur"))
+
+    def test_object_columns_should_be_saved(self):
+        valuations = self.valuations.assign(name=self.valuations["player_id"].map(lambda i: f"P{i}"))
+        with tempfile.TemporaryDirectory() as tmp:
+            Timeline.from_frame(valuations, order="date", columns=["name"]).save(tmp)
+            read = Timeline.read(tmp)
+            self.assertEqual(list(read.get(57)["name"].unique()), ["P57"])
+
+    def test_invalid_offsets_should_raise(self):
+        with self.assertRaises(ValueError):
+            Timeline(np.array([1, 2]), np.array([0, 2]), {})
+        with self.assertRaises(ValueError):
+            Timeline(np.array([1]), np.array([0, 2]), {"a": np.zeros(3)})
+
+
+class TestLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dirs = data_loader.DATA_DIRS
+        self.cache_dir = data_loader.CACHE_DIR
+        data_loader.DATA_DIRS = [self.tmp.name]
+        data_loader.CACHE_DIR = os.path.join(self.tmp.name, "cache")
+
+        self.valuations = any_valuations(500)
+        self.valuations.to_csv(os.path.join(self.tmp.name, "player_valuations.csv"), index=False)
+
+    def tearDown(self):
+        data_loader.DATA_DIRS = self.dirs
+        data_loader.CACHE_DIR = self.cache_dir
+        self.tmp.cleanup()
+
+    def test_should_build_once_and_read_from_cache(self):
+        first = timeline.load("player_valuations", order="date")
+        second = timeline.load("player_valuations", order="date")
+        self.assertIsInstance(second["date"], np.memmap)
+        np.testing.assert_array_equal(first["market_value_in_eur"], second["market_value_in_eur"])
+        self.assertEqual(len(first), self.valuations["player_id"].nunique())
+
+    def test_table_without_players_should_raise(self):
+        with self.assertRaises(ValueError):
+            timeline.load("games")
+
+
+if __name__ == "__main__":
+    unittest.main()
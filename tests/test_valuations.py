@@ -0,0 +1,117 @@
+import unittest
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import inflation
+from valuations import time_weighted_mean, valuation_index, value_at
+
+
+def any_valuations(n: int, n_players: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "player_id": rng.integers(0, n_players, n),
+        "date": pd.Timestamp(2005, 1, 1) + pd.to_timedelta(rng.integers(0, 7000, n), unit="D"),
+        "market_value_in_eur": rng.integers(1, 100, n) * 100_000.
+    })
+
+
+# Cálculo original da média ponderada, com `apply` por linha e por grupo
+def time_weighted_mean_apply(valuations: pd.DataFrame) -> pd.Series:
+    def correct_data_diff(row):
+        if not row["same_player"]:
+            return min((datetime.strptime("30/09/2024", "%d/%m/%Y").date() - row["date"].date()).days, 365)
+        return row["date_diff"].days
+
+    def calc_mean_price(group):
+        return round(sum(group["market_value_in_eur"] * group["date_diff"]) / sum(group["date_diff"]), 2)
+
+    valuations = valuations.sort_values(["player_id", "date"])
+    valuations["same_player"] = -valuations["player_id"].diff(-1) == 0
+    valuations["date_diff"] = -valuations["date"].diff(-1)
+    valuations["date_diff"] = valuations.apply(correct_data_diff, axis=1)
+    return valuations.groupby("player_id").apply(calc_mean_price, include_groups=False)
+
+
+class TestTimeWeightedMean(unittest.TestCase):
+
+    def test_should_match_apply_implementation(self):
+        valuations = any_valuations(3000, 200)
+        expected = time_weighted_mean_apply(valuations)
+        result = time_weighted_mean(valuations)
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+
+    def test_correct_inputs_should_match_expected(self):
+        valuations = pd.DataFrame({
+            "player_id": [1, 1, 2],
+            "date": pd.to_datetime(["2020-01-01", "2020-01-11", "2024-09-20"]),
+            "market_value_in_eur": [100., 200., 50.]
+        })
+        result = time_weighted_mean(valuations)
+
+        # Jogador 1: 10 dias valendo 100 e 365 dias (limite) valendo 200
+        self.assertAlmostEqual(result[1], round((100 * 10 + 200 * 365) / 375, 2))
+        self.assertEqual(result[2], 50)
+
+    def test_cutoff_and_max_days_should_be_used(self):
+        valuations = pd.DataFrame({
+            "player_id": [1, 1],
+            "date": pd.to_datetime(["2020-01-01", "2020-01-11"]),
+            "market_value_in_eur": [100., 200.]
+        })
+        result = time_weighted_mean(valuations, cutoff=np.datetime64("2020-01-21"))
+        self.assertEqual(result[1], 150)
+
+        result = time_weighted_mean(valuations, max_days=30)
+        self.assertEqual(result[1], round((100 * 10 + 200 * 30) / 40, 2))
+
+    def test_unsorted_input_should_work(self):
+        valuations = any_valuations(500, 20, seed=1)
+        shuffled = valuations.sample(frac=1, random_state=0)
+        pd.testing.assert_series_equal(time_weighted_mean(shuffled), time_weighted_mean(valuations))
+
+
+class TestValueAt(unittest.TestCase):
+
+    def test_should_match_merge_asof(self):
+        valuations = any_valuations(3000, 200)
+        rng = np.random.default_rng(1)
+        queries = pd.DataFrame({
+            "player_id": rng.integers(-5, 210, 5000),
+            "date": pd.Timestamp(2004, 1, 1) + pd.to_timedelta(rng.integers(0, 8000, 5000), unit="D")
+        })
+
+        # Avaliações de um mesmo dia: vale a última, como na ordenação estável
+        expected = pd.merge_asof(
+            queries.reset_index().sort_values("date"),
+            valuations.sort_values(["player_id", "date"], kind="stable").sort_values("date", kind="stable"),
+            on="date", by="player_id", direction="backward"
+        ).set_index("index").sort_index()["market_value_in_eur"]
+
+        result = value_at(valuation_index(valuations), queries["player_id"], queries["date"])
+        np.testing.assert_array_equal(result, expected.to_numpy())
+
+    def test_same_day_valuation_should_be_used(self):
+        valuations = pd.DataFrame({
+            "player_id": [1, 1, 2],
+            "date": pd.to_datetime(["2020-01-01", "2020-06-01", "2020-01-01"]),
+            "market_value_in_eur": [100., 200., 50.]
+        })
+        index = valuation_index(valuations)
+        dates = pd.to_datetime(["2019-12-31", "2020-01-01", "2020-05-31", "2020-06-01", "2030-01-01", "2020-01-01", None])
+        result = value_at(index, [1, 1, 1, 1, 1, 3, 2], dates)
+        np.testing.assert_array_equal(result, [np.nan, 100, 100, 200, 200, np.nan, np.nan])
+
+    def test_adjusted_index_should_correct_inflation(self):
+        valuations = any_valuations(100, 10)
+        index = valuation_index(valuations, adjust=True)
+        adjusted = inflation.inflation_adj_many(valuations["market_value_in_eur"], valuations["date"])
+        np.testing.assert_allclose(np.sort(index["market_value_in_eur"]), np.sort(adjusted))
+
+    def test_different_sizes_should_raise(self):
+        index = valuation_index(any_valuations(10, 2))
+        with self.assertRaises(ValueError):
+            value_at(index, [1, 2], pd.to_datetime(["2020-01-01"]))
+
+
+if __name__ == "__main__":
+    unittest.main()